@@ -5,31 +5,64 @@ Identifies 1-2 syllable English words and checks domain availability
 for word+AI domains (.ai and .com) under $100.
 """
 
+from __future__ import annotations
+
 import re
 import json
 import time
+import heapq
+import itertools
 import argparse
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator, NamedTuple
+from collections import defaultdict
 from datetime import datetime
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 try:
-    import syllables
+    from .lazy_imports import lazy_import
+    from .domain_pricing import PricingEngine
 except ImportError:
-    syllables = None
+    # Run as a script from data_science/
+    from lazy_imports import lazy_import
+    from domain_pricing import PricingEngine
 
-try:
-    import whois
-except ImportError:
-    whois = None
+# Backends are resolved on first use, so `--help` and runs that never
+# touch them start without importing them. Optional ones are None when
+# not installed.
+np = lazy_import('numpy')
+requests = lazy_import('requests')
+syllables = lazy_import('syllables')
+nltk = lazy_import('nltk')
+wordfreq = lazy_import('wordfreq')
+whois = lazy_import('whois')
 
-try:
-    from nltk.corpus import words as nltk_words
-    import nltk
-except ImportError:
-    nltk = None
-    nltk_words = None
+
+def _load_whois():
+    """python-whois, imported on first use; None when missing or broken."""
+    global whois
+    if whois is not None:
+        try:
+            whois.whois  # runs the deferred import
+        except ImportError:
+            # An installed but broken python-whois counts as not installed
+            whois = None
+    return whois
+
+
+# WHOIS servers per TLD. Candidates are batched per server so each backend
+# receives a homogeneous stream of queries.
+WHOIS_SERVERS = {
+    'com': 'whois.verisign-grs.com',
+    'net': 'whois.verisign-grs.com',
+    'org': 'whois.publicinterestregistry.org',
+    'io': 'whois.nic.io',
+    'ai': 'whois.nic.ai',
+}
+
+# Example affix patterns for the candidate planner
+AFFIX_PATTERNS = ['{word}ai', 'ai{word}', 'get{word}', '{word}hq']
+
+DOMAIN_LABEL_RE = re.compile(r'^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$')
 
 
 class SyllableCounter:
@@ -81,19 +114,29 @@ class SyllableCounter:
 class DomainChecker:
     """Check domain availability and pricing."""
     
-    def __init__(self, max_price: float = 100.0):
+    def __init__(self, max_price: float = 100.0,
+                 pricing: Optional[PricingEngine] = None):
         self.max_price = max_price
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        # Typical retail prices unless registrar tables are supplied
+        self.pricing = pricing or PricingEngine(registrars=['typical_registrar'])
+        self._session = None
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session, created (and `requests` imported) on first use."""
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            })
+        return self._session
     
     def check_availability_whois(self, domain: str) -> Tuple[bool, Optional[str]]:
         """
         Check domain availability using WHOIS.
         Returns (is_available, error_message)
         """
-        if not whois:
+        if not _load_whois():
             return None, "python-whois not installed"
         
         try:
@@ -129,28 +172,18 @@ class DomainChecker:
     
     def check_domain_price(self, domain: str) -> Tuple[Optional[float], Optional[str]]:
         """
-        Estimate domain price based on TLD.
+        Estimate domain price based on TLD, at the cheapest configured registrar.
         Note: Actual prices vary by registrar and may change.
         Returns (price, error_message)
         """
-        tld = domain.split('.')[-1]
-        
-        # Typical retail prices for common TLDs (approximate)
-        typical_prices = {
-            'com': 12.99,
-            'ai': 89.99,  # .ai domains are typically expensive
-            'net': 12.99,
-            'org': 12.99,
-            'io': 39.99,
-        }
-        
-        price = typical_prices.get(tld, 50.0)  # Default estimate
-        
-        # Check if under max price
+        price, _ = self.pricing.price(domain)
+        return price, self._budget_error(price)
+    
+    def _budget_error(self, price: float) -> Optional[str]:
+        """Error message when a price exceeds the per-domain maximum."""
         if price <= self.max_price:
-            return price, None
-        else:
-            return price, f"Price ${price:.2f} exceeds ${self.max_price:.2f}"
+            return None
+        return f"Price ${price:.2f} exceeds ${self.max_price:.2f}"
     
     def check_domain(self, domain: str) -> Dict:
         """
@@ -174,9 +207,11 @@ class DomainChecker:
         result['available'] = available
         
         if available:
-            # Check price
-            price, price_error = self.check_domain_price(domain)
+            # Check price (one lookup gives both price and registrar)
+            price, registrar = self.pricing.price(domain)
+            price_error = self._budget_error(price)
             result['price'] = price
+            result['registrar'] = registrar
             
             if price and price <= self.max_price:
                 result['within_budget'] = True
@@ -189,23 +224,335 @@ class DomainChecker:
         return result
 
 
+class DomainRanker:
+    """
+    Keep the best K available domain pairs while results stream in.
+    
+    Uses a bounded min-heap keyed on score, so each push is O(log K) and
+    memory stays at K entries no matter how many pairs are checked.
+    """
+    
+    MIN_WORD_LENGTH = 3
+    MAX_WORD_LENGTH = 10
+    
+    def __init__(self, k: int = 10, max_price: float = 100.0,
+                 weights: Tuple[float, float, float] = (0.4, 0.3, 0.3),
+                 word_frequency: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            k: Number of pairs to keep
+            max_price: Maximum price per domain, used to normalise pair prices
+            weights: (price, length, frequency) weights for the score
+            word_frequency: Optional word -> Zipf frequency mapping; falls back
+                to the `wordfreq` library when installed
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.k = k
+        self.max_price = max_price
+        self.weights = weights
+        self.word_frequency = word_frequency
+        self.seen = 0
+        self._heap = []
+        self._counter = itertools.count()
+    
+    def get_frequency(self, word: str) -> float:
+        """Zipf frequency of a word (0 = unknown, ~8 = most common)."""
+        if self.word_frequency is not None:
+            return self.word_frequency.get(word, 0.0)
+        if wordfreq:
+            try:
+                return wordfreq.zipf_frequency(word, 'en')
+            except Exception:
+                pass
+        return 0.0
+    
+    def word_value(self, word: str) -> float:
+        """Price-independent part of the score: shorter, more common words are worth more."""
+        _, w_length, w_freq = self.weights
+        
+        span = self.MAX_WORD_LENGTH - self.MIN_WORD_LENGTH
+        length_score = min(max((self.MAX_WORD_LENGTH - len(word)) / span, 0.0), 1.0)
+        
+        freq_score = min(self.get_frequency(word) / 8.0, 1.0)
+        
+        return w_length * length_score + w_freq * freq_score
+    
+    def score(self, result: Dict) -> float:
+        """
+        Score a domain pair in [0, 1]; higher is better.
+        Cheaper pairs, shorter words and more common words score higher.
+        """
+        w_price = self.weights[0]
+        
+        # Pairs carry a total over two domains; planner results a single price
+        n_domains = 2 if 'total_price' in result else 1
+        max_total = n_domains * self.max_price
+        total_price = result.get('total_price', result.get('price')) or max_total
+        price_score = max(0.0, 1.0 - total_price / max_total)
+        
+        return w_price * price_score + self.word_value(result['word'])
+    
+    def push(self, result: Dict) -> bool:
+        """
+        Offer a result to the ranking.
+        Returns True if it entered the current top K.
+        """
+        self.seen += 1
+        score = self.score(result)
+        entry = (score, next(self._counter), result)
+        
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return False
+        
+        result['score'] = round(score, 4)
+        return True
+    
+    def top(self) -> List[Dict]:
+        """Current top K results, best first."""
+        return [result for _, _, result in heapq.nlargest(self.k, self._heap)]
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class BudgetOptimizer:
+    """
+    Pick the value-maximising set of available domains under a total budget.
+    
+    Solves the 0/1 knapsack exactly with a NumPy dynamic program over whole
+    budget units when the table fits in `max_cells`, otherwise falls back to
+    greedy-by-density with the best-single-item bound (at least half of the
+    optimum). Costs are rounded up to units, so the budget is never exceeded.
+    """
+    
+    def __init__(self, budget: float, pricing: Optional[PricingEngine] = None,
+                 ranker: Optional[DomainRanker] = None, resolution: float = 1.0,
+                 max_cells: int = 50_000_000):
+        """
+        Args:
+            budget: Total spend allowed in USD
+            pricing: Pricing engine for upfront costs (default: typical registrar)
+            ranker: Supplies the word value score (default: DomainRanker())
+            resolution: Budget unit in USD for the dynamic program
+            max_cells: Largest items × budget-units table to solve exactly
+        """
+        if budget <= 0:
+            raise ValueError(f"budget must be positive, got {budget}")
+        self.budget = budget
+        self.pricing = pricing or PricingEngine(registrars=['typical_registrar'])
+        self.ranker = ranker or DomainRanker()
+        self.resolution = resolution
+        self.max_cells = max_cells
+        self.method = None
+        self.upper_bound = None
+    
+    @staticmethod
+    def result_domains(result: Dict) -> List[str]:
+        """Domains that must be bought for a result (a pair or a single domain)."""
+        if 'ai_domain' in result:
+            return [result['ai_domain']['domain'], result['com_domain']['domain']]
+        return [result['domain']]
+    
+    def costs(self, results: List[Dict]) -> np.ndarray:
+        """Upfront cost of each result (minimum registration term, all domains)."""
+        domains = [self.result_domains(r) for r in results]
+        owners = np.repeat(np.arange(len(results)), [len(d) for d in domains])
+        priced = self.pricing.price_batch([d for ds in domains for d in ds])
+        return np.bincount(owners, weights=priced['upfront_price'].to_numpy(),
+                           minlength=len(results))
+    
+    def values(self, results: List[Dict]) -> np.ndarray:
+        """Word-feature value of each result."""
+        return np.array([self.ranker.word_value(r['word']) for r in results], dtype=float)
+    
+    def _solve_dp(self, units: np.ndarray, values: np.ndarray, capacity: int) -> np.ndarray:
+        """Exact 0/1 knapsack; returns selected item indices."""
+        best = np.zeros(capacity + 1)
+        take = np.zeros((len(units), capacity + 1), dtype=bool)
+        
+        for i, (cost, value) in enumerate(zip(units, values, strict=True)):
+            if cost > capacity:
+                continue
+            candidate = best[:capacity + 1 - cost] + value
+            improved = candidate > best[cost:]
+            take[i, cost:] = improved
+            best[cost:] = np.where(improved, candidate, best[cost:])
+        
+        selected = []
+        remaining = capacity
+        for i in range(len(units) - 1, -1, -1):
+            if take[i, remaining]:
+                selected.append(i)
+                remaining -= units[i]
+        return np.array(selected[::-1], dtype=np.int64)
+    
+    def _solve_greedy(self, costs: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Greedy by value density, compared against the best single item."""
+        order = np.argsort(-values / costs, kind='stable')
+        
+        # Items that fit on their own, in density order
+        within = order[costs[order] <= self.budget]
+        cumulative = np.cumsum(costs[within])
+        
+        # Take the dense prefix, then fill gaps with later items that still fit
+        prefix = int(np.searchsorted(cumulative, self.budget, side='right'))
+        selected = list(within[:prefix])
+        spent = cumulative[prefix - 1] if prefix else 0.0
+        for i in within[prefix:]:
+            if spent + costs[i] <= self.budget:
+                selected.append(i)
+                spent += costs[i]
+        
+        if len(within) and values[within].max() > values[selected].sum():
+            selected = [within[np.argmax(values[within])]]
+        return np.array(sorted(selected), dtype=np.int64)
+    
+    def _fractional_bound(self, costs: np.ndarray, values: np.ndarray) -> float:
+        """LP-relaxation upper bound on the optimal value."""
+        order = np.argsort(-values / costs, kind='stable')
+        cumulative = np.cumsum(costs[order])
+        full = int(np.searchsorted(cumulative, self.budget, side='right'))
+        bound = values[order[:full]].sum()
+        if full < len(order):
+            spent = cumulative[full - 1] if full else 0.0
+            bound += values[order[full]] * (self.budget - spent) / costs[order[full]]
+        return float(bound)
+    
+    def optimize(self, results: List[Dict]) -> List[Dict]:
+        """
+        Select the portfolio from available results.
+        Each selected result gets 'cost' and 'value' keys; best value first.
+        """
+        if not results:
+            self.method, self.upper_bound = None, 0.0
+            return []
+        
+        costs = self.costs(results)
+        # Keep zero-value items selectable and avoid zero-cost division
+        values = self.values(results) + 1e-9
+        costs = np.maximum(costs, 1e-9)
+        
+        units = np.ceil(costs / self.resolution - 1e-9).astype(np.int64)
+        capacity = int(self.budget // self.resolution)
+        
+        if len(results) * (capacity + 1) <= self.max_cells:
+            self.method = 'dp'
+            selected = self._solve_dp(units, values, capacity)
+        else:
+            self.method = 'greedy'
+            selected = self._solve_greedy(costs, values)
+        self.upper_bound = self._fractional_bound(costs, values)
+        
+        portfolio = []
+        for i in selected:
+            result = results[i]
+            result['cost'] = round(float(costs[i]), 2)
+            result['value'] = round(float(values[i]), 4)
+            portfolio.append(result)
+        portfolio.sort(key=lambda r: r['value'], reverse=True)
+        return portfolio
+
+
+class Candidate(NamedTuple):
+    """A single domain candidate produced by the planner."""
+    word: str
+    pattern: str
+    domain: str
+    tld: str
+
+
+class CandidatePlanner:
+    """
+    Expand word × affix pattern × TLD into domain candidates.
+    
+    Candidates are generated lazily and deduplicated across patterns
+    (e.g. two patterns producing the same label), then grouped into
+    batches per WHOIS server.
+    """
+    
+    def __init__(self, patterns: Optional[List[str]] = None,
+                 tlds: Optional[List[str]] = None, batch_size: int = 25,
+                 whois_servers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            patterns: Affix patterns containing '{word}' (default: ['{word}ai'])
+            tlds: TLDs without the leading dot (default: ['ai', 'com'])
+            batch_size: Maximum candidates per WHOIS server batch
+            whois_servers: TLD -> WHOIS server overrides
+        """
+        self.patterns = patterns or ['{word}ai']
+        self.tlds = [tld.lower().lstrip('.') for tld in (tlds or ['ai', 'com'])]
+        self.batch_size = batch_size
+        self.whois_servers = {**WHOIS_SERVERS, **(whois_servers or {})}
+        
+        for pattern in self.patterns:
+            if '{word}' not in pattern:
+                raise ValueError(f"Pattern '{pattern}' must contain '{{word}}'")
+    
+    def server_for(self, tld: str) -> str:
+        """WHOIS server responsible for a TLD."""
+        return self.whois_servers.get(tld, f"whois.nic.{tld}")
+    
+    def max_candidates(self, n_words: int) -> int:
+        """Upper bound on candidates for n_words (before dedupe)."""
+        return n_words * len(self.patterns) * len(self.tlds)
+    
+    def iter_candidates(self, words) -> Iterator[Candidate]:
+        """Yield unique, well-formed candidates for each word in turn."""
+        seen = set()
+        for word in words:
+            for pattern in self.patterns:
+                label = pattern.format(word=word).lower()
+                if not DOMAIN_LABEL_RE.match(label):
+                    continue
+                for tld in self.tlds:
+                    domain = f"{label}.{tld}"
+                    if domain in seen:
+                        continue
+                    seen.add(domain)
+                    yield Candidate(word, pattern, domain, tld)
+    
+    def iter_batches(self, words) -> Iterator[Tuple[str, List[Candidate]]]:
+        """
+        Yield (whois_server, candidates) batches.
+        A batch is emitted as soon as its server buffer fills, so batches
+        stream out while later words are still being expanded.
+        """
+        buffers = defaultdict(list)
+        for candidate in self.iter_candidates(words):
+            server = self.server_for(candidate.tld)
+            buffers[server].append(candidate)
+            if len(buffers[server]) >= self.batch_size:
+                yield server, buffers.pop(server)
+        
+        for server, batch in buffers.items():
+            if batch:
+                yield server, batch
+
+
 class AIWordDomainFinder:
     """Main class to find available AI domains from English words."""
     
     def __init__(self, max_syllables: int = 2, max_price: float = 100.0, 
-                 max_workers: int = 10):
+                 max_workers: int = 10, pricing: Optional[PricingEngine] = None):
         self.max_syllables = max_syllables
         self.max_price = max_price
         self.max_workers = max_workers
         self.syllable_counter = SyllableCounter()
-        self.domain_checker = DomainChecker(max_price)
+        self.domain_checker = DomainChecker(max_price, pricing)
     
     def get_english_words(self) -> List[str]:
         """Get list of English words from various sources."""
         words_list = []
         
         # Try NLTK first
-        if nltk and nltk_words:
+        if nltk:
+            from nltk.corpus import words as nltk_words
             try:
                 words_list = list(nltk_words.words())
             except LookupError:
@@ -285,8 +632,8 @@ class AIWordDomainFinder:
             ) if result_ai.get('price') and result_com.get('price') else None
         }
     
-    def find_domains(self, limit: Optional[int] = None) -> List[Dict]:
-        """Main method to find available domains."""
+    def load_words(self, limit: Optional[int] = None) -> List[str]:
+        """Load English words and filter them by syllable count."""
         print("=" * 60)
         print("AI Domain Finder")
         print("=" * 60)
@@ -304,17 +651,23 @@ class AIWordDomainFinder:
             filtered_words = filtered_words[:limit]
             print(f"   Limited to first {limit} words for testing")
         
+        return filtered_words
+    
+    def iter_checked_pairs(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Yield checked domain pairs as soon as each check completes."""
+        filtered_words = self.load_words(limit)
+        
         # Generate domain combinations
-        print(f"\n3. Generating domain combinations...")
+        print("\n3. Generating domain combinations...")
         domain_combos = self.generate_ai_domains(filtered_words)
         print(f"   Generated {len(domain_combos)} domain pairs to check")
         
         # Check domains
-        print(f"\n4. Checking domain availability and pricing...")
+        print("\n4. Checking domain availability and pricing...")
         print(f"   (Max price: ${self.max_price} per domain)")
         print(f"   (Using {self.max_workers} workers)")
         
-        results = []
+        checked = 0
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
                 executor.submit(
@@ -331,22 +684,158 @@ class AIWordDomainFinder:
                 
                 try:
                     result = future.result()
-                    results.append(result)
                 except Exception as e:
                     word, domain_ai, domain_com = futures[future]
                     print(f"   Error checking {word}: {e}")
+                    continue
+                
+                checked += 1
+                yield result
+        
+        print(f"\n   Completed: {checked} domain pairs checked")
+    
+    def find_domains(self, limit: Optional[int] = None,
+                     ranker: Optional[DomainRanker] = None,
+                     collect: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Main method to find available domains.
         
-        print(f"\n   Completed: {len(results)} domain pairs checked")
+        With a ranker, only the best K available pairs are kept (best first)
+        and each new entry into the top K is reported as it arrives.
+        Every available pair is also appended to `collect` when given, so
+        callers such as the budget optimizer see more than the top K.
+        """
+        checked = 0
+        available_results = []
+        for result in self.iter_checked_pairs(limit):
+            checked += 1
+            if not result['both_available']:
+                continue
+            
+            if collect is not None:
+                collect.append(result)
+            if ranker is None:
+                available_results.append(result)
+            elif ranker.push(result):
+                print(f"   ↑ Top {ranker.k}: {result['word']} (score {result['score']:.3f})")
         
-        # Filter results
-        available_results = [
-            r for r in results 
-            if r['both_available']
-        ]
+        if ranker is not None:
+            available_results = ranker.top()
         
-        print(f"\n5. Results Summary:")
-        print(f"   Total words checked: {len(results)}")
-        print(f"   Available domain pairs: {len(available_results)}")
+        print("\n5. Results Summary:")
+        print(f"   Total words checked: {checked}")
+        print(f"   Available domain pairs: {ranker.seen if ranker else len(available_results)}")
+        
+        return available_results
+    
+    def check_batch(self, batch: List[Candidate]) -> List[Dict]:
+        """Check a batch of candidates that share a WHOIS server."""
+        results = []
+        for candidate in batch:
+            result = self.domain_checker.check_domain(candidate.domain)
+            result.update({
+                'word': candidate.word,
+                'pattern': candidate.pattern,
+                'tld': candidate.tld,
+            })
+            results.append(result)
+            time.sleep(0.1)  # Be respectful with requests
+        return results
+    
+    def iter_checked_candidates(self, planner: CandidatePlanner,
+                                limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield checked planner candidates as each batch completes.
+        Only a few batches per worker are in flight at once, so the full
+        word × pattern × TLD product is never materialised.
+        """
+        filtered_words = self.load_words(limit)
+        
+        print("\n3. Planning candidates...")
+        print(f"   Patterns: {', '.join(planner.patterns)}")
+        print(f"   TLDs: {', '.join('.' + tld for tld in planner.tlds)}")
+        print(f"   Up to {planner.max_candidates(len(filtered_words))} candidates")
+        
+        print("\n4. Checking domain availability and pricing...")
+        print(f"   (Max price: ${self.max_price} per domain)")
+        print(f"   (Using {self.max_workers} workers)")
+        
+        batches = planner.iter_batches(filtered_words)
+        pricing = self.domain_checker.pricing
+        max_in_flight = self.max_workers * 2
+        checked = 0
+        over_budget = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        server, batch = next(batches)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    
+                    # Drop over-budget candidates before any network lookups
+                    priced = pricing.price_batch(
+                        [c.domain for c in batch], max_price=self.max_price,
+                        tlds=[c.tld for c in batch]
+                    )
+                    affordable = [c for c, ok in zip(batch, priced['within_budget'], strict=True) if ok]
+                    over_budget += len(batch) - len(affordable)
+                    if affordable:
+                        pending[executor.submit(self.check_batch, affordable)] = server
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    server = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        print(f"   Error checking batch for {server}: {e}")
+                        continue
+                    
+                    for result in results:
+                        checked += 1
+                        if checked % 10 == 0:
+                            print(f"   Progress: {checked} candidates checked")
+                        yield result
+        
+        print(f"\n   Completed: {checked} candidates checked")
+        if over_budget:
+            print(f"   Skipped {over_budget} candidates over ${self.max_price} before checking")
+    
+    def find_candidates(self, planner: CandidatePlanner, limit: Optional[int] = None,
+                        ranker: Optional[DomainRanker] = None,
+                        collect: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Find available domains across the planner's patterns and TLDs.
+        Returns per-domain results (available and within budget); `ranker`
+        and `collect` work as in `find_domains`.
+        """
+        checked = 0
+        available_results = []
+        for result in self.iter_checked_candidates(planner, limit):
+            checked += 1
+            if not (result['available'] and result['within_budget']):
+                continue
+            
+            if collect is not None:
+                collect.append(result)
+            if ranker is None:
+                available_results.append(result)
+            elif ranker.push(result):
+                print(f"   ↑ Top {ranker.k}: {result['domain']} (score {result['score']:.3f})")
+        
+        if ranker is not None:
+            available_results = ranker.top()
+        
+        print("\n5. Results Summary:")
+        print(f"   Total candidates checked: {checked}")
+        print(f"   Available domains: {ranker.seen if ranker else len(available_results)}")
         
         return available_results
     
@@ -379,9 +868,12 @@ class AIWordDomainFinder:
             
             for r in results:
                 f.write(f"Word: {r['word']}\n")
-                f.write(f"  {r['ai_domain']['domain']}: ${r['ai_domain']['price']:.2f}\n")
-                f.write(f"  {r['com_domain']['domain']}: ${r['com_domain']['price']:.2f}\n")
-                f.write(f"  Total: ${r['total_price']:.2f}\n")
+                if 'ai_domain' in r:
+                    f.write(f"  {r['ai_domain']['domain']}: ${r['ai_domain']['price']:.2f}\n")
+                    f.write(f"  {r['com_domain']['domain']}: ${r['com_domain']['price']:.2f}\n")
+                    f.write(f"  Total: ${r['total_price']:.2f}\n")
+                else:
+                    f.write(f"  {r['domain']}: ${r['price']:.2f}\n")
                 f.write("\n")
         
         print(f"Text report saved to: {txt_filename}")
@@ -420,33 +912,104 @@ def main():
         default='ai_domains_results.json',
         help='Output filename (default: ai_domains_results.json)'
     )
+    parser.add_argument(
+        '--patterns',
+        nargs='+',
+        help="Affix patterns to plan, e.g. '{word}ai' 'get{word}' '{word}hq' 'ai{word}'"
+    )
+    parser.add_argument(
+        '--tlds',
+        nargs='+',
+        help='TLDs to plan, e.g. ai com io net org'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=25,
+        help='Candidates per WHOIS server batch in planner mode (default: 25)'
+    )
+    parser.add_argument(
+        '--registrars',
+        nargs='+',
+        help='Registrar price tables to compare; each domain is priced at the '
+             'cheapest (default: typical_registrar)'
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        help='Total USD budget; picks the value-maximising set of available domains'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        help='Keep only the best K available pairs, ranked as results stream in'
+    )
     
     args = parser.parse_args()
     
     # Create finder
+    pricing = PricingEngine(registrars=args.registrars) if args.registrars else None
     finder = AIWordDomainFinder(
         max_syllables=args.max_syllables,
         max_price=args.max_price,
-        max_workers=args.workers
+        max_workers=args.workers,
+        pricing=pricing
     )
     
     # Find domains
-    results = finder.find_domains(limit=args.limit)
+    ranker = DomainRanker(k=args.top, max_price=args.max_price) if args.top else None
+    # The optimizer chooses from every qualifying result, not just the top K
+    candidates = [] if args.budget else None
+    if args.patterns or args.tlds:
+        planner = CandidatePlanner(
+            patterns=args.patterns,
+            tlds=args.tlds,
+            batch_size=args.batch_size
+        )
+        results = finder.find_candidates(planner, limit=args.limit, ranker=ranker,
+                                         collect=candidates)
+    else:
+        results = finder.find_domains(limit=args.limit, ranker=ranker, collect=candidates)
     
     # Save results
     if results:
         finder.save_results(results, args.output)
         
+        if ranker is None:
+            ranker = DomainRanker(k=10, max_price=args.max_price)
+            for r in results:
+                ranker.push(r)
+        
         print("\n" + "=" * 60)
-        print("Top 10 Available Domains:")
+        print(f"Top {ranker.k} Available Domains:")
         print("=" * 60)
-        for r in results[:10]:
+        for r in ranker.top():
             print(f"\n{r['word']}:")
-            print(f"  • {r['ai_domain']['domain']} - ${r['ai_domain']['price']:.2f}")
-            print(f"  • {r['com_domain']['domain']} - ${r['com_domain']['price']:.2f}")
-            print(f"  → Total: ${r['total_price']:.2f}")
+            if 'ai_domain' in r:
+                print(f"  • {r['ai_domain']['domain']} - ${r['ai_domain']['price']:.2f}")
+                print(f"  • {r['com_domain']['domain']} - ${r['com_domain']['price']:.2f}")
+                print(f"  → Total: ${r['total_price']:.2f}")
+            else:
+                print(f"  • {r['domain']} - ${r['price']:.2f}")
     else:
         print("\nNo available domain pairs found matching criteria.")
+    
+    if args.budget and candidates:
+        optimizer = BudgetOptimizer(args.budget, pricing=finder.domain_checker.pricing)
+        portfolio = optimizer.optimize(candidates)
+        total_cost = sum(r['cost'] for r in portfolio)
+        
+        print("\n" + "=" * 60)
+        print(f"Portfolio within ${args.budget:.2f} from {len(candidates)} available "
+              f"({optimizer.method}):")
+        print("=" * 60)
+        for r in portfolio:
+            domains = ', '.join(BudgetOptimizer.result_domains(r))
+            print(f"  • {domains} - ${r['cost']:.2f} (value {r['value']:.3f})")
+        print(f"  → {len(portfolio)} selected, total ${total_cost:.2f}")
+        
+        if portfolio:
+            finder.save_results(portfolio, args.output.replace('.json', '_portfolio.json'))
 
 
 if __name__ == "__main__":
@@ -5,12 +5,27 @@ This module handles dataset downloads and ensures reproducibility
 across local and Colab environments.
 """
 
-import kagglehub
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
 import shutil
+import tempfile
+import threading
+import time
 
 
 # Dataset registry - centralized source of truth
+# Each entry lists a Kaggle archive and the files used from it. Files may
+# declare an optional schema under "schemas" (see `infer_schema`):
+#   "datetime": columns parsed as datetime64
+#   "categorical": columns stored as pandas categories
+#   "dtypes": {column: dtype} for the remaining columns, e.g. "float32"
+#   "index": column set as the DataFrame index by `load_dataset`
 DATASETS = {
     # Complete time series dataset collection
     "tsdata": {
@@ -103,7 +118,17 @@ DATASETS = {
             "DUQ_hourly.csv",
             "AEP_hourly.csv",
             "COMED_hourly.csv",
-        ]
+        ],
+        # One "Datetime" column plus "<REGION>_MW" load per file
+        "schemas": {
+            f"{region}_hourly.csv": {
+                "datetime": ["Datetime"],
+                "dtypes": {f"{region}_MW": "float32"},
+                "index": "Datetime",
+            }
+            for region in ("PJMW", "PJM_Load", "DAYTON", "NI", "PJME", "FE",
+                           "DOM", "EKPC", "DEOK", "DUQ", "AEP", "COMED")
+        }
     },
     
     # Convenience alias for pjm_hourly_est.csv
@@ -129,13 +154,395 @@ def get_data_folder():
         return Path.cwd() / 'data_science' / 'datasets' / 'raw'
 
 
-def ensure_dataset(dataset_key, force_download=False):
+def get_processed_folder():
+    """Get the processed data folder path (sibling of the raw folder)"""
+    return get_data_folder().parent / 'processed'
+
+
+# Ways to place a cached file into the data folder, cheapest first.
+# Hardlinks and reflinks share the cached bytes; symlinks point at them.
+LINK_METHODS = ("hardlink", "reflink", "symlink", "copy")
+
+# Linux FICLONE ioctl request code (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+
+def _reflink(src, dest):
+    """Copy-on-write clone of src at dest (Btrfs/XFS on Linux, APFS on macOS)."""
+    if sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dest), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    elif sys.platform.startswith("linux"):
+        import fcntl
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            try:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            except OSError:
+                d.close()
+                os.unlink(dest)
+                raise
+    else:
+        raise OSError(f"Reflinks not supported on {sys.platform}")
+
+
+def _temp_path(path):
+    """
+    Unique, not yet existing path beside `path` for an atomic write.
+    
+    Prefetch threads can write the same target as a foreground load, so
+    each writer needs its own temp file; a shared `.name.tmp` would let
+    one clobber the other's half-written output before `os.replace`.
+    """
+    path = Path(path)
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    os.unlink(name)  # links and some writers need the name free
+    return Path(name)
+
+
+def materialize_file(src, dest, methods=LINK_METHODS):
+    """
+    Place a cached file at dest using the cheapest method that works.
+    
+    Tries hardlink, then reflink, then symlink, and only copies when
+    none of those are possible (e.g. symlinks not permitted across
+    filesystems). An existing dest is replaced atomically.
+    
+    Args:
+        src (Path): Source file (e.g. in the kagglehub cache)
+        dest (Path): Destination path
+        methods (tuple): Methods to try, in order
+        
+    Returns:
+        str: The method used
+    """
+    src, dest = Path(src).resolve(), Path(dest)
+    tmp = _temp_path(dest)
+    
+    for method in methods:
+        if tmp.exists() or tmp.is_symlink():
+            tmp.unlink()
+        try:
+            if method == "hardlink":
+                os.link(src, tmp)
+            elif method == "reflink":
+                _reflink(src, tmp)
+            elif method == "symlink":
+                tmp.symlink_to(src)
+            elif method == "copy":
+                shutil.copy2(src, tmp)
+            else:
+                raise ValueError(f"Unknown method '{method}'. Available: {list(LINK_METHODS)}")
+        except OSError:
+            continue
+        os.replace(tmp, dest)
+        return method
+    
+    raise OSError(f"Could not materialize {src} at {dest} with any of {list(methods)}")
+
+
+def _same_file(a, b):
+    """True when both paths exist and resolve to the same file."""
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _find_cached_file(cache_path, name):
+    """Locate a registry file in the kagglehub cache (top level first)."""
+    candidate = cache_path / name
+    if candidate.is_file():
+        return candidate
+    return next((p for p in cache_path.rglob(name) if p.is_file()), None)
+
+
+# Per-folder manifest of materialized files
+MANIFEST_NAME = ".manifest.json"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Fast content hash (BLAKE2b, 128-bit) of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Size, mtime and content hash of each file materialized in a folder.
+    
+    A file is fresh when its size and mtime match the manifest (one stat,
+    no reads). Only when they differ is the content re-hashed and compared,
+    so touched-but-identical files stay fresh and truncated or edited
+    files are caught. Entries are written as each file is placed, so an
+    interrupted sync leaves the unplaced files marked stale.
+    
+    Syncs running in parallel threads (one per archive during a prefetch)
+    must share one instance per folder, via `Manifest.shared`: separate
+    instances would each rewrite the file from their own entries and drop
+    the others' updates.
+    """
+    
+    _shared = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, folder):
+        self.path = Path(folder) / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._load()
+    
+    @classmethod
+    def shared(cls, folder):
+        """The process-wide manifest of a folder, reloaded if another process rewrote it."""
+        key = Path(folder).resolve()
+        with cls._shared_lock:
+            manifest = cls._shared.get(key)
+            if manifest is None:
+                manifest = cls._shared[key] = cls(folder)
+            elif manifest._disk_mtime() != manifest._mtime_ns:
+                with manifest._lock:
+                    manifest._load()
+            return manifest
+    
+    def _disk_mtime(self):
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def _load(self):
+        self._mtime_ns = self._disk_mtime()
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def is_fresh(self, name):
+        """True when the file exists and matches its recorded content."""
+        entry = self.entries.get(name)
+        file_path = self.path.parent / name
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        if entry is None:
+            return False
+        
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        if stat.st_size != entry["size"] or file_digest(file_path) != entry["hash"]:
+            return False
+        
+        # Same content, new mtime: refresh the stat fields
+        self.record(name, digest=entry["hash"])
+        return True
+    
+    def forget(self, name):
+        """Drop a file's entry (e.g. after it was replaced by another form)."""
+        with self._lock:
+            if self.entries.pop(name, None) is not None:
+                self._save()
+    
+    def record(self, name, digest=None, method=None):
+        """
+        Record the current state of a file and persist the manifest.
+        
+        `method` is how the file was placed (see LINK_METHODS); without
+        one, the method already recorded for the file is kept.
+        """
+        file_path = self.path.parent / name
+        stat = file_path.stat()
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": digest or file_digest(file_path),
+        }
+        with self._lock:
+            method = method or self.entries.get(name, {}).get("method")
+            if method:
+                entry["method"] = method
+            self.entries[name] = entry
+            self._save()
+    
+    def _save(self):
+        # Unique temp name, so concurrent writers never share a temp file
+        with tempfile.NamedTemporaryFile("w", dir=self.path.parent, prefix=f".{self.path.name}.",
+                                         suffix=".tmp", delete=False) as tmp:
+            tmp.write(json.dumps(self.entries, indent=2, sort_keys=True))
+        os.replace(tmp.name, self.path)
+        self._mtime_ns = self._disk_mtime()
+
+
+def kaggle_download(kaggle_id, force_download=False):
+    """Download (or reuse the cached copy of) a Kaggle dataset; returns the cache path."""
+    import kagglehub
+    return kagglehub.dataset_download(kaggle_id, force_download=force_download)
+
+
+# Raw files stored compressed get this suffix after their registry name
+ZSTD_SUFFIX = ".zst"
+
+# Default zstd level for raw storage (None keeps files uncompressed);
+# set DATA_ZSTD_LEVEL=19 to compress every sync by default
+RAW_ZSTD_LEVEL = int(os.environ["DATA_ZSTD_LEVEL"]) if os.environ.get("DATA_ZSTD_LEVEL") else None
+
+
+def compress_file(src, dest, level=3, chunk_size=1 << 20):
+    """Stream a file into a zstd-compressed copy, written atomically."""
+    import zstandard
+    
+    dest = Path(dest)
+    tmp = _temp_path(dest)
+    compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+    with open(src, "rb") as fin, open(tmp, "wb") as fout:
+        compressor.copy_stream(fin, fout, read_size=chunk_size, write_size=chunk_size)
+    os.replace(tmp, dest)
+
+
+def _stored_name(manifest, name, zstd_level=None):
+    """Name a registry file is (or should be) stored under, or None if stale."""
+    if zstd_level:
+        return name + ZSTD_SUFFIX if manifest.is_fresh(name + ZSTD_SUFFIX) else None
+    for stored in (name, name + ZSTD_SUFFIX):
+        if manifest.is_fresh(stored):
+            return stored
+    return None
+
+
+def _place_compressed(src, name, data_folder, manifest, zstd_level):
+    """Store one registry file zstd-compressed, replacing any plain copy."""
+    stored = name + ZSTD_SUFFIX
+    compress_file(src, data_folder / stored, level=zstd_level)
+    manifest.record(stored)
+    
+    (data_folder / name).unlink(missing_ok=True)
+    manifest.forget(name)
+    
+    ratio = src.stat().st_size / max((data_folder / stored).stat().st_size, 1)
+    return f"   Placed: {stored} (zstd -{zstd_level}, {ratio:.1f}x smaller)"
+
+
+def _place_file(cache_path, name, data_folder, manifest, zstd_level=None):
+    """Materialize one registry file from the cache; returns a status line."""
+    src = _find_cached_file(cache_path, name)
+    if src is None:
+        return f"   ⚠️ Not in download: {name}"
+    
+    if zstd_level:
+        return _place_compressed(src, name, data_folder, manifest, zstd_level)
+    
+    dest = data_folder / name
+    if _same_file(src, dest):
+        # Linked to the cache: an edit here also changed the cached copy
+        digest = file_digest(dest)
+        entry = manifest.entries.get(name)
+        if entry and entry["hash"] != digest:
+            return f"   ⚠️ Cached copy modified: {name} (re-run with force_download=True)"
+        manifest.record(name, digest=digest)
+        return f"   Up to date: {name}"
+    
+    method = materialize_file(src, dest)
+    manifest.record(name, method=method)
+    return f"   Placed: {name} ({method})"
+
+
+def ensure_datasets(dataset_keys, force_download=False, max_workers=4, downloader=None,
+                    zstd_level=None):
+    """
+    Ensure several datasets are available, downloading each archive once.
+    
+    Keys that share a `kaggle_id` (e.g. "tsdata", "us_covid", "avocado")
+    are grouped so the archive is fetched a single time. Distinct
+    archives download concurrently, and files are materialized in
+    parallel as each download finishes.
+    
+    Freshness is checked against the folder's manifest, so only missing,
+    truncated or modified files are re-materialized.
+    
+    With a zstd level, files are stored as `<name>.zst` instead of being
+    linked; `open_raw` and the loaders decompress them transparently.
+    Without one, files already stored in either form are accepted.
+    
+    Args:
+        dataset_keys (list): Keys from DATASETS registry
+        force_download (bool): Re-download even if files exist
+        max_workers (int): Thread pool size for downloads and file placement
+        downloader (callable): (kaggle_id, force_download) -> cache path
+            (default: kaggle_download)
+        zstd_level (int): Store files zstd-compressed at this level
+            (default: RAW_ZSTD_LEVEL, i.e. $DATA_ZSTD_LEVEL or uncompressed)
+        
+    Returns:
+        Path: Path to the data folder
+        
+    Example:
+        >>> data_folder = ensure_datasets(["us_covid", "pjm_hourly", "who_cases"])
+    """
+    unknown = [key for key in dataset_keys if key not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s) {unknown}. Available: {list(DATASETS.keys())}")
+    
+    _await_prefetch(dataset_keys=dataset_keys)
+    downloader = downloader or kaggle_download
+    zstd_level = zstd_level if zstd_level is not None else RAW_ZSTD_LEVEL
+    data_folder = get_data_folder()
+    data_folder.mkdir(parents=True, exist_ok=True)
+    
+    manifest = Manifest.shared(data_folder)
+    
+    # Group outstanding files by archive
+    needed = {}
+    for key in dict.fromkeys(dataset_keys):
+        dataset_info = DATASETS[key]
+        files = dataset_info["files"]
+        if not force_download:
+            files = [f for f in files if _stored_name(manifest, f, zstd_level) is None]
+        if not files:
+            print(f"✅ Dataset '{key}' already available")
+            continue
+        archive = needed.setdefault(dataset_info["kaggle_id"], {"keys": [], "files": {}})
+        archive["keys"].append(key)
+        archive["files"].update(dict.fromkeys(files))
+    
+    if not needed:
+        return data_folder
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        downloads = {}
+        for kaggle_id, archive in needed.items():
+            print(f"📥 Downloading '{kaggle_id}' from Kaggle (for {', '.join(archive['keys'])})...")
+            downloads[executor.submit(downloader, kaggle_id, force_download)] = kaggle_id
+        
+        placements = []
+        for future in as_completed(downloads):
+            kaggle_id = downloads[future]
+            cache_path = Path(future.result())
+            for name in needed[kaggle_id]["files"]:
+                placements.append(executor.submit(_place_file, cache_path, name, data_folder,
+                                                  manifest, zstd_level))
+        
+        for future in as_completed(placements):
+            print(future.result())
+    
+    print(f"✅ Dataset ready at: {data_folder}")
+    return data_folder
+
+
+def ensure_dataset(dataset_key, force_download=False, downloader=None):
     """
     Ensure dataset is available, download if needed.
     
     Args:
         dataset_key (str): Key from DATASETS registry
         force_download (bool): Re-download even if files exist
+        downloader (callable): (kaggle_id, force_download) -> cache path
+            (default: kaggle_download)
         
     Returns:
         Path: Path to the data folder
@@ -147,30 +554,1064 @@ def ensure_dataset(dataset_key, force_download=False):
     if dataset_key not in DATASETS:
         raise ValueError(f"Unknown dataset '{dataset_key}'. Available: {list(DATASETS.keys())}")
     
-    dataset_info = DATASETS[dataset_key]
+    return ensure_datasets([dataset_key], force_download=force_download, downloader=downloader)
+
+
+# Background prefetches started by `prefetch`, and a per-thread flag so
+# the prefetch workers themselves never wait on their own jobs
+_PREFETCHES = []
+_prefetch_local = threading.local()
+
+
+class Prefetch:
+    """
+    Progress and completion of a background `prefetch`.
+    
+    Each dataset moves through "queued" -> "downloading" -> "converting"
+    -> "ready" (or "failed"). The object renders as a progress summary in
+    notebooks, and `wait()` blocks until everything has finished.
+    """
+    
+    def __init__(self, dataset_keys, convert):
+        self.keys = list(dict.fromkeys(dataset_keys))
+        self.state = {key: "queued" for key in self.keys}
+        self.errors = {}
+        self.files = {
+            key: [f for f in DATASETS[key]["files"] if Path(f).suffix.lower() in RAW_READERS]
+            if convert else []
+            for key in self.keys
+        }
+        self.converted = {key: 0 for key in self.keys}
+        self._downloaded = {key: threading.Event() for key in self.keys}
+        self._conversions = {f: threading.Event() for files in self.files.values() for f in files}
+        self._claimed = set()
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+    
+    def done(self):
+        """True once every dataset is ready or has failed."""
+        return self._finished.is_set()
+    
+    def wait(self, timeout=None):
+        """Block until the prefetch finishes; returns `done()`."""
+        return self._finished.wait(timeout)
+    
+    def _convert(self, key, file):
+        # Aliases share files (e.g. "tsdata" and "us_covid"); convert each once
+        with self._lock:
+            claimed = file in self._claimed
+            self._claimed.add(file)
+        try:
+            if claimed:
+                self._conversions[file].wait()
+            else:
+                _ensure_parquet(key, file)
+        except Exception as e:
+            self.errors[key] = e
+            self.state[key] = "failed"
+        finally:
+            if not claimed:
+                self._conversions[file].set()
+            with self._lock:
+                self.converted[key] += 1
+                if self.converted[key] == len(self.files[key]) and self.state[key] != "failed":
+                    self.state[key] = "ready"
+    
+    def __repr__(self):
+        ready = sum(state == "ready" for state in self.state.values())
+        lines = [f"Prefetch: {ready}/{len(self.keys)} datasets ready "
+                 f"({time.monotonic() - self.started:.0f}s)"]
+        for key in self.keys:
+            state = self.state[key]
+            if state == "converting":
+                state += f" ({self.converted[key]}/{len(self.files[key])} files)"
+            if state == "failed":
+                state += f": {self.errors.get(key)}"
+            lines.append(f"  • {key}: {state}")
+        return "\n".join(lines)
+
+
+def _run_prefetch(job, max_workers, downloader):
+    """Prefetch worker: download archives concurrently, then convert each file."""
+    _prefetch_local.active = True
+    
+    by_archive = {}
+    for key in job.keys:
+        by_archive.setdefault(DATASETS[key]["kaggle_id"], []).append(key)
+    
+    def fetch(keys):
+        _prefetch_local.active = True
+        for key in keys:
+            job.state[key] = "downloading"
+        try:
+            ensure_datasets(keys, max_workers=max_workers, downloader=downloader)
+        except Exception as e:
+            for key in keys:
+                job.state[key] = "failed"
+                job.errors[key] = e
+        finally:
+            for key in keys:
+                job._downloaded[key].set()
+        return keys
+    
+    def convert(key, file):
+        _prefetch_local.active = True
+        job._convert(key, file)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetches = [executor.submit(fetch, keys) for keys in by_archive.values()]
+            conversions = []
+            for future in as_completed(fetches):
+                for key in future.result():
+                    if job.state[key] == "failed":
+                        for file in job.files[key]:
+                            job._conversions[file].set()
+                        continue
+                    job.state[key] = "converting" if job.files[key] else "ready"
+                    for file in job.files[key]:
+                        conversions.append(executor.submit(convert, key, file))
+            for future in conversions:
+                future.result()
+    finally:
+        for event in list(job._downloaded.values()) + list(job._conversions.values()):
+            event.set()
+        job._finished.set()
+
+
+def prefetch(dataset_keys, convert=True, max_workers=4, downloader=None):
+    """
+    Download, materialize and convert datasets in a background thread.
+    
+    Call it from the setup cell so downloads overlap with the rest of
+    notebook setup. A later `ensure_dataset`, `load_dataset` (or any
+    loader) call waits only for the part of its own dataset or file that
+    is still outstanding, then continues as usual.
+    
+    Args:
+        dataset_keys (list): Keys from DATASETS registry
+        convert (bool): Also build the processed Parquet copies
+        max_workers (int): Concurrent downloads/conversions
+        downloader (callable): (kaggle_id, force_download) -> cache path
+            (default: kaggle_download)
+        
+    Returns:
+        Prefetch: Progress handle; display it, or call `.wait()`
+        
+    Example:
+        >>> datasets = prefetch(["pjm_energy", "who_cases"])
+        >>> datasets          # shows per-dataset progress
+        >>> df = load_dataset("pjm_energy", "PJME_hourly.csv")  # waits if needed
+    """
+    unknown = [key for key in dataset_keys if key not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s) {unknown}. Available: {list(DATASETS.keys())}")
+    
+    job = Prefetch(dataset_keys, convert)
+    _PREFETCHES.append(job)
+    thread = threading.Thread(target=_run_prefetch, args=(job, max_workers, downloader),
+                              name="data-prefetch", daemon=True)
+    thread.start()
+    return job
+
+
+def _await_prefetch(dataset_keys=(), files=()):
+    """
+    Wait for any outstanding prefetch work on these datasets or files.
+    
+    Downloads are matched by archive and by the files they place, not by
+    dataset name, so a prefetch of one alias (e.g. "tsdata") also covers
+    a later sync of another key sharing its Kaggle id ("us_covid").
+    """
+    if getattr(_prefetch_local, "active", False):
+        return
+    archives = {DATASETS[key]["kaggle_id"] for key in dataset_keys if key in DATASETS}
+    wanted = set(files).union(*(DATASETS[key]["files"] for key in dataset_keys if key in DATASETS))
+    for job in list(_PREFETCHES):
+        for key, downloaded in job._downloaded.items():
+            info = DATASETS[key]
+            if info["kaggle_id"] in archives or wanted.intersection(info["files"]):
+                downloaded.wait()
+        for file in files:
+            if file in job._conversions:
+                job._conversions[file].wait()
+        if job.done():
+            try:
+                _PREFETCHES.remove(job)
+            except ValueError:
+                pass  # already removed by another thread
+
+
+# Readers for raw files by suffix (the PJM archive ships "est_hourly.paruqet")
+RAW_READERS = {
+    ".csv": "read_csv",
+    ".xls": "read_excel",
+    ".xlsx": "read_excel",
+    ".parquet": "read_parquet",
+    ".paruqet": "read_parquet",
+}
+
+# Bytes of raw CSV parsed at a time when streaming the first Parquet conversion
+CSV_BLOCK_SIZE = 16 << 20
+
+
+def _read_raw(path):
+    """Read a raw dataset file (optionally zstd-compressed) into a DataFrame."""
+    import io
+    import pandas as pd
+    
+    compressed = path.suffix == ZSTD_SUFFIX
+    name = path.stem if compressed else path.name
+    reader = RAW_READERS.get(Path(name).suffix.lower())
+    if reader is None:
+        raise ValueError(f"Can't load '{name}' as a table. Supported: {sorted(RAW_READERS)}")
+    if not compressed:
+        return getattr(pd, reader)(path)
+    
+    with _open_zstd(path) as stream:
+        if reader == "read_csv":
+            return pd.read_csv(stream)
+        # Excel and Parquet readers need to seek
+        return getattr(pd, reader)(io.BytesIO(stream.read()))
+
+
+def _open_zstd(path):
+    """Binary stream that decompresses a .zst file as it is read."""
+    import zstandard
+    
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def open_raw(dataset_key, file):
+    """
+    Open a registry file as a binary stream, decompressing if it is stored as .zst.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        
+    Returns:
+        file object: Readable binary stream (use as a context manager)
+        
+    Example:
+        >>> import polars as pl
+        >>> with open_raw("us_covid", "us_covid.csv") as f:
+        ...     df = pl.read_csv(f)
+    """
+    path, _ = _source_digest(dataset_key, file)
+    return _open_zstd(path) if path.suffix == ZSTD_SUFFIX else open(path, "rb")
+
+
+# Numeric dates with an optional time, e.g. "2020-03-01", "01/03/2020",
+# "2002-12-31 01:00:00" or "2020-03-01T00:00:00Z". Month or weekday names
+# ("March", "Mon") are left as text even though pandas would parse them.
+DATE_PATTERN = (r"(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})"
+                r"([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?\s*([AaPp][Mm])?\s*(Z|[+-]\d{2}:?\d{2})?)?")
+
+
+def _parse_datetime_columns(df, sample_size=100):
+    """Convert text columns whose values all look like numeric dates to datetime64."""
+    import pandas as pd
+    
+    for column in df.columns:
+        series = df[column]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        sample = series.dropna().head(sample_size).astype(str).str.strip()
+        if sample.empty or not sample.str.fullmatch(DATE_PATTERN).all():
+            continue
+        try:
+            pd.to_datetime(sample, format="mixed")
+        except (ValueError, TypeError, OverflowError):
+            continue
+        df[column] = pd.to_datetime(series, format="mixed", errors="coerce")
+    return df
+
+
+def get_schema(dataset_key, file):
+    """
+    Registry schema declared for a file, or None.
+    
+    Aliases share files with their full archive (e.g. "pjm_hourly" and
+    "pjm_energy"), so a schema declared on any entry with the same
+    Kaggle id applies.
+    """
+    kaggle_id = DATASETS[dataset_key]["kaggle_id"]
+    for key in [dataset_key] + list(DATASETS):
+        info = DATASETS[key]
+        if info["kaggle_id"] == kaggle_id and file in info.get("schemas", {}):
+            return info["schemas"][file]
+    return None
+
+
+def apply_schema(df, schema):
+    """Cast DataFrame columns to a registry schema (index is left to the caller)."""
+    import pandas as pd
+    
+    declared = list(schema.get("datetime", [])) + list(schema.get("categorical", [])) \
+        + list(schema.get("dtypes", {}))
+    missing = [column for column in declared if column not in df.columns]
+    if missing:
+        raise ValueError(f"Schema columns {missing} not found. Columns: {list(df.columns)}")
+    
+    for column in schema.get("datetime", []):
+        df[column] = pd.to_datetime(df[column], format="mixed")
+    for column in schema.get("categorical", []):
+        df[column] = df[column].astype("category")
+    return df.astype(schema.get("dtypes", {}))
+
+
+def _narrowest_numeric(series):
+    """Narrowest dtype that holds a numeric column without loss, or None."""
+    import numpy as np
+    import pandas as pd
+    
+    values = series.dropna()
+    if values.empty:
+        return None
+    if len(values) == len(series) and (values == np.round(values)).all():
+        kind = "unsigned" if (values >= 0).all() else "integer"
+        return str(pd.to_numeric(values, downcast=kind).dtype)
+    if series.dtype == np.float64:
+        # float32 keeps ~7 significant digits; only propose it when that is enough
+        narrowed = values.astype(np.float32).astype(np.float64)
+        if np.allclose(narrowed, values, rtol=1e-6, atol=0):
+            return "float32"
+    return None
+
+
+def infer_schema(df, max_category_ratio=0.5):
+    """
+    Propose the narrowest safe schema for a DataFrame.
+    
+    Integral columns without missing values get the smallest (unsigned)
+    integer type that holds them, floats become float32 when that keeps
+    their precision, date-like text becomes datetime and low-cardinality
+    text becomes categorical. A unique, sorted datetime column is
+    proposed as the index.
+    
+    Args:
+        df (pd.DataFrame): Raw data, e.g. from `pd.read_csv`
+        max_category_ratio (float): Largest distinct/rows ratio for text
+            columns to be proposed as categorical
+    
+    Returns:
+        dict: Schema in the registry's "schemas" format
+    
+    Example:
+        >>> df = pd.read_csv(ensure_dataset("pjm_energy") / "AEP_hourly.csv")
+        >>> schema = infer_schema(df)   # paste into DATASETS[...]["schemas"]
+        >>> apply_schema(df, schema).memory_usage(deep=True).sum()
+    """
+    import pandas as pd
+    
+    parsed = _parse_datetime_columns(df.copy())
+    schema = {"datetime": [], "categorical": [], "dtypes": {}}
+    
+    for column in df.columns:
+        series = parsed[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            if not pd.api.types.is_datetime64_any_dtype(df[column]):
+                schema["datetime"].append(column)
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_numeric_dtype(series):
+            dtype = _narrowest_numeric(series)
+            if dtype is not None and dtype != str(series.dtype):
+                schema["dtypes"][column] = dtype
+        elif series.nunique() <= max_category_ratio * len(series):
+            schema["categorical"].append(column)
+    
+    for column in schema["datetime"]:
+        times = parsed[column]
+        if times.notna().all() and times.is_unique and times.is_monotonic_increasing:
+            schema["index"] = column
+            break
+    
+    return {name: value for name, value in schema.items() if value}
+
+
+def _write_parquet(df, path):
+    """Write a DataFrame to Parquet atomically, coercing mixed-type columns to strings."""
+    import pandas as pd
+    
+    for column in df.columns:
+        if pd.api.types.is_object_dtype(df[column]) and \
+                pd.api.types.infer_dtype(df[column], skipna=True).startswith("mixed"):
+            df[column] = df[column].astype("string")
+    
+    tmp = _temp_path(path)
+    df.to_parquet(tmp, engine="pyarrow", index=False)
+    os.replace(tmp, path)
+
+
+def _source_digest(dataset_key, file):
+    """Ensure a registry file is materialized and return its content hash."""
+    if dataset_key not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset_key}'. Available: {list(DATASETS.keys())}")
+    if file not in DATASETS[dataset_key]["files"]:
+        raise ValueError(f"'{file}' is not part of '{dataset_key}'. Files: {DATASETS[dataset_key]['files']}")
+    
+    # A fresh manifest entry is enough; only a missing or stale file goes
+    # through (and reports) a sync
+    _await_prefetch(dataset_keys=[dataset_key])
     data_folder = get_data_folder()
-    data_folder.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest.shared(data_folder)
+    stored = _stored_name(manifest, file)
+    if stored is None:
+        data_folder = ensure_dataset(dataset_key)
+        manifest = Manifest.shared(data_folder)
+        stored = _stored_name(manifest, file)
+    if stored is None:
+        raise FileNotFoundError(f"'{file}' was not found in the '{dataset_key}' download")
+    return data_folder / stored, manifest.entries[stored]["hash"]
+
+
+def processed_path(file, digest, suffix=".parquet"):
+    """
+    Path of the processed copy of a raw file, keyed by its content hash.
     
-    # Check if files already exist
-    files_exist = all((data_folder / f).exists() for f in dataset_info["files"])
+    Named after the full file name, so `x.csv` and `x.xlsx` get separate
+    copies.
+    """
+    return get_processed_folder() / f"{Path(file).name}.{digest[:16]}{suffix}"
+
+
+def _drop_stale_versions(file, keep):
+    """Remove processed copies of a file built from older content."""
+    name = Path(file).name
+    suffix = keep.name[len(name) + 17:]  # after "<file>.<16 hex>", e.g. ".sorted.parquet"
+    pattern = re.compile(rf"{re.escape(name)}\.[0-9a-f]{{16}}{re.escape(suffix)}")
+    for old in keep.parent.iterdir():
+        if old != keep and pattern.fullmatch(old.name):
+            old.unlink(missing_ok=True)
+
+
+def load_dataset(dataset_key, file):
+    """
+    Load a registry file as a DataFrame via a cached Parquet copy.
     
-    if files_exist and not force_download:
-        print(f"✅ Dataset '{dataset_key}' already available")
-        return data_folder
+    The first load parses the raw CSV/Excel file, converts date columns
+    to datetime64 and writes `datasets/processed/<file>.<hash>.parquet`.
+    Later loads read that Parquet with pyarrow; a change to the raw
+    file's content produces a new hash and a fresh conversion.
     
-    # Download from Kaggle
-    print(f"📥 Downloading dataset '{dataset_key}' from Kaggle...")
-    cache_path = kagglehub.dataset_download(dataset_info["kaggle_id"])
+    Files with a registry schema are cast to its dtypes instead of having
+    their types guessed, and get its index column.
     
-    # Copy files to data folder
-    for file in Path(cache_path).glob("*"):
-        if file.is_file():
-            dest = data_folder / file.name
-            shutil.copy2(file, dest)
-            print(f"   Copied: {file.name}")
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        
+    Returns:
+        pd.DataFrame: The dataset
+        
+    Example:
+        >>> df = load_dataset("pjm_hourly", "pjm_hourly_est.csv")
+    """
+    import pandas as pd
     
-    print(f"✅ Dataset ready at: {data_folder}")
-    return data_folder
+    path, _ = _ensure_parquet(dataset_key, file)
+    return _set_schema_index(pd.read_parquet(path, engine="pyarrow"), dataset_key, file)
+
+
+def _set_schema_index(df, dataset_key, file):
+    """Set the index column declared in the file's registry schema, if any."""
+    schema = get_schema(dataset_key, file)
+    if schema is not None and "index" in schema:
+        df = df.set_index(schema["index"])
+    return df
+
+
+def _ensure_parquet(dataset_key, file):
+    """Convert a registry file to its processed Parquet copy if needed; returns (path, digest)."""
+    _await_prefetch(files=[file])
+    raw_path, digest = _source_digest(dataset_key, file)
+    schema = get_schema(dataset_key, file)
+    if schema is not None:
+        # A schema change must rebuild the processed copy too
+        declared = json.dumps(schema, sort_keys=True)
+        digest = hashlib.blake2b(f"{digest}:{declared}".encode(), digest_size=16).hexdigest()
+    path = processed_path(file, digest)
+    
+    if not path.exists():
+        print(f"⚙️ Converting {file} to Parquet (first load)...")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Schema-less CSVs stream block by block; the rest go through pandas
+        if schema is not None or not _is_csv(raw_path) or not _stream_csv_to_parquet(raw_path, path):
+            df = _read_raw(raw_path)
+            df = apply_schema(df, schema) if schema is not None else _parse_datetime_columns(df)
+            _write_parquet(df, path)
+        _drop_stale_versions(file, path)
+    return path, digest
+
+
+def _is_csv(path):
+    """Whether a raw file is a CSV, optionally zstd-compressed."""
+    name = path.stem if path.suffix == ZSTD_SUFFIX else path.name
+    return Path(name).suffix.lower() == ".csv"
+
+
+def _stream_csv_to_parquet(raw_path, path):
+    """
+    Convert a CSV to Parquet one block at a time, in bounded memory.
+    
+    Column types are inferred from the first block. Date columns are found
+    there the way `_parse_datetime_columns` finds them and parsed in every
+    block. Returns False, writing nothing, when a later block doesn't fit
+    the first block's types, so the caller can fall back to a full read.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+    
+    compressed = raw_path.suffix == ZSTD_SUFFIX
+    tmp = _temp_path(path)
+    writer = None
+    try:
+        with (_open_zstd(raw_path) if compressed else open(raw_path, "rb")) as stream:
+            reader = pv.open_csv(stream, read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE))
+            dates = None
+            for batch in reader:
+                table = pa.Table.from_batches([batch])
+                if dates is None:
+                    sample = _parse_datetime_columns(table.slice(0, 100).to_pandas())
+                    dates = [name for name in table.column_names
+                             if pa.types.is_temporal(table.schema.field(name).type)
+                             or pd.api.types.is_datetime64_any_dtype(sample[name])]
+                for name in dates:
+                    parsed = pd.to_datetime(table.column(name).to_pandas(), format="mixed", errors="coerce")
+                    table = table.set_column(table.schema.get_field_index(name), name, pa.array(parsed))
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            if writer is None:
+                pq.write_table(reader.schema.empty_table(), tmp)
+    except pa.ArrowException:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        return False
+    if writer is not None:
+        writer.close()
+    os.replace(tmp, path)
+    return True
+
+
+def load_table(dataset_key, file, columns=None):
+    """
+    Open a registry file as a memory-mapped Arrow table (zero-copy).
+    
+    The data is stored once as an uncompressed Arrow IPC (Feather v2)
+    file in `datasets/processed/` and mapped rather than read, so only
+    the columns actually touched are paged in, and every notebook or
+    kernel opening the same file shares the OS page cache. Intended for
+    the large hourly files, e.g. the `pjm_energy` series.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        columns (list): Optional subset of columns to expose
+        
+    Returns:
+        pyarrow.Table: Table backed by the mapped file
+        
+    Example:
+        >>> table = load_table("pjm_energy", "PJME_hourly.csv")
+        >>> mw = table.column("PJME_MW")             # paged in on access
+        >>> df = table.select(["Datetime", "PJME_MW"]).to_pandas()
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+    
+    parquet_path, digest = _ensure_parquet(dataset_key, file)
+    path = processed_path(file, digest, suffix=".feather")
+    
+    if not path.exists():
+        import pyarrow.parquet as pq
+        
+        tmp = _temp_path(path)
+        feather.write_feather(pq.read_table(parquet_path), tmp, compression="uncompressed")
+        os.replace(tmp, path)
+        _drop_stale_versions(file, path)
+    
+    # Read the IPC file directly: feather.read_table copies projected columns
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+# Rows per row group in time-sorted copies (about a year of hourly data);
+# smaller groups make window reads finer at a small metadata cost
+TIME_ROW_GROUP_SIZE = 8_760
+
+
+def _time_column(dataset_key, file, schema):
+    """Name of the time column: the registry index, else the first timestamp column."""
+    import pyarrow as pa
+    
+    declared = get_schema(dataset_key, file) or {}
+    if declared.get("index") in schema.names:
+        return declared["index"]
+    for field in schema:
+        if pa.types.is_timestamp(field.type):
+            return field.name
+    raise ValueError(f"'{file}' has no datetime column to index by. Columns: {schema.names}")
+
+
+def _ensure_time_sorted(dataset_key, file):
+    """Write a copy of the processed Parquet sorted by time; returns (path, time column)."""
+    import pyarrow.parquet as pq
+    
+    parquet_path, digest = _ensure_parquet(dataset_key, file)
+    path = processed_path(file, digest, suffix=".sorted.parquet")
+    
+    if path.exists():
+        return path, _time_column(dataset_key, file, pq.read_schema(path))
+    
+    table = pq.read_table(parquet_path)
+    column = _time_column(dataset_key, file, table.schema)
+    table = table.sort_by(column)
+    
+    tmp = _temp_path(path)
+    pq.write_table(table, tmp, row_group_size=TIME_ROW_GROUP_SIZE, write_statistics=[column])
+    os.replace(tmp, path)
+    _drop_stale_versions(file, path)
+    return path, column
+
+
+def _overlapping_row_groups(parquet_file, column, start=None, end=None):
+    """Row groups whose [min, max] statistics for `column` overlap [start, end)."""
+    import pandas as pd
+    
+    index = parquet_file.schema_arrow.get_field_index(column)
+    groups = []
+    for i in range(parquet_file.metadata.num_row_groups):
+        stats = parquet_file.metadata.row_group(i).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            groups.append(i)
+            continue
+        if start is not None and pd.Timestamp(stats.max) < start:
+            continue
+        if end is not None and pd.Timestamp(stats.min) >= end:
+            continue
+        groups.append(i)
+    return groups
+
+
+def load_range(dataset_key, file, start=None, end=None, columns=None):
+    """
+    Load the rows of a time-series file inside a time window.
+    
+    The first call writes a time-sorted copy of the processed Parquet
+    (`<file>.<hash>.sorted.parquet`) with min/max statistics per row
+    group. Window reads consult only those statistics and decode just
+    the row groups that overlap, so a month of multi-year hourly data
+    costs a couple of row groups rather than a full-file read.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        start: Inclusive lower bound (anything pd.Timestamp accepts), or None
+        end: Exclusive upper bound, or None
+        columns (list): Optional subset of non-time columns
+        
+    Returns:
+        pd.DataFrame: Rows with start <= time < end, indexed by time
+        
+    Example:
+        >>> jan = load_range("pjm_energy", "PJME_hourly.csv", "2018-01-01", "2018-02-01")
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    
+    path, column = _ensure_time_sorted(dataset_key, file)
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    
+    parquet_file = pq.ParquetFile(path)
+    groups = _overlapping_row_groups(parquet_file, column, start, end)
+    read_columns = None if columns is None else [column] + [c for c in columns if c != column]
+    table = parquet_file.read_row_groups(groups, columns=read_columns)
+    
+    # Trim the partial row groups at either edge of the window
+    times = table.column(column)
+    mask = None
+    if start is not None:
+        mask = pc.greater_equal(times, pa.scalar(start, type=times.type))
+    if end is not None:
+        below = pc.less(times, pa.scalar(end, type=times.type))
+        mask = below if mask is None else pc.and_(mask, below)
+    if mask is not None:
+        table = table.filter(mask)
+    
+    return table.to_pandas().set_index(column)
+
+
+SCAN_BACKENDS = ("polars", "pyarrow")
+
+
+def scan_dataset(dataset_key, file, backend="polars"):
+    """
+    Open a registry file as a lazy query over its processed Parquet copy.
+    
+    Nothing is read until the query is collected; column selections and
+    row filters are pushed down into the Parquet reader, so only the
+    needed columns and row groups are decoded. A CSV without a registry
+    schema is converted to that copy block by block on first use, so
+    even the first scan never holds the whole raw file in memory.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        backend (str): "polars" for a LazyFrame, "pyarrow" for a Dataset
+        
+    Returns:
+        polars.LazyFrame or pyarrow.dataset.Dataset: Lazy view of the file
+        
+    Example:
+        >>> import polars as pl
+        >>> ny = (scan_dataset("us_covid", "us_covid.csv")
+        ...       .filter(pl.col("state") == "New York")
+        ...       .select("date", "cases")
+        ...       .collect())
+    """
+    if backend not in SCAN_BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Available: {list(SCAN_BACKENDS)}")
+    
+    path, _ = _ensure_parquet(dataset_key, file)
+    if backend == "polars":
+        import polars as pl
+        return pl.scan_parquet(path)
+    
+    import pyarrow.dataset as ds
+    return ds.dataset(path, format="parquet")
+
+
+def iter_batches(dataset_key, file, columns=None, filter=None, batch_size=65_536):
+    """
+    Stream a registry file in Arrow record batches with bounded memory.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        columns (list): Optional subset of columns to read
+        filter (pyarrow.compute.Expression): Optional row filter, pushed
+            down to skip non-matching row groups
+        batch_size (int): Maximum rows per batch
+        
+    Yields:
+        pyarrow.RecordBatch: Successive batches of matching rows
+        
+    Example:
+        >>> import pyarrow.compute as pc
+        >>> total = 0
+        >>> for batch in iter_batches("tsdata", "rossman_sales.csv",
+        ...                           columns=["Store", "Sales"],
+        ...                           filter=pc.field("Store") == 1):
+        ...     total += pc.sum(batch.column("Sales")).as_py() or 0
+    """
+    dataset = scan_dataset(dataset_key, file, backend="pyarrow")
+    for batch in dataset.to_batches(columns=columns, filter=filter, batch_size=batch_size):
+        if batch.num_rows:
+            yield batch
+
+
+def _sample_size(rows, n, frac):
+    """Number of rows to sample given exactly one of n or frac."""
+    if (n is None) == (frac is None):
+        raise ValueError("Pass exactly one of n or frac")
+    if frac is not None and not 0 < frac <= 1:
+        raise ValueError(f"frac must be in (0, 1], got {frac}")
+    return min(rows, n if n is not None else round(frac * rows))
+
+
+def _reservoir_sample(dataset_key, file, n, frac, seed, stratify, batch_size):
+    """
+    Bottom-k reservoir sample in one pass over the processed Parquet.
+    
+    Each row gets a seeded uniform key and the sample keeps the rows with
+    the smallest keys (per stratum when stratifying), which is a uniform
+    sample without replacement that can be merged batch by batch.
+    """
+    import numpy as np
+    import pandas as pd
+    import pyarrow.parquet as pq
+    
+    path, _ = _ensure_parquet(dataset_key, file)
+    rows = pq.ParquetFile(path).metadata.num_rows
+    total = _sample_size(rows, n, frac)
+    
+    quota = None
+    if stratify is not None:
+        # Per-stratum quotas need stratum sizes; reading one column is cheap
+        counts = pd.read_parquet(path, columns=[stratify])[stratify].value_counts(dropna=False)
+        quota = (counts * total / rows).round().astype(int)
+    
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    offset = 0
+    for batch in iter_batches(dataset_key, file, batch_size=batch_size):
+        chunk = batch.to_pandas()
+        chunk["_row"] = np.arange(offset, offset + len(chunk))
+        chunk["_key"] = rng.random(len(chunk))
+        offset += len(chunk)
+        
+        merged = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+        merged = merged.sort_values("_key", kind="stable")
+        if quota is None:
+            reservoir = merged.head(total)
+        else:
+            rank = merged.groupby(stratify, dropna=False, sort=False, observed=True).cumcount()
+            limit = merged[stratify].map(quota).fillna(0).to_numpy()
+            reservoir = merged[rank.to_numpy() < limit]
+    
+    if reservoir is None:
+        return pd.read_parquet(path).head(0)
+    # Back to file order so time series stay ordered
+    return reservoir.sort_values("_row").drop(columns=["_row", "_key"]).reset_index(drop=True)
+
+
+def _contiguous_sample(dataset_key, file, n, frac, seed):
+    """A seeded random block of consecutive rows from the time-sorted copy."""
+    import numpy as np
+    import pyarrow.parquet as pq
+    
+    path, _ = _ensure_time_sorted(dataset_key, file)
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    total = _sample_size(metadata.num_rows, n, frac)
+    start = int(np.random.default_rng(seed).integers(0, metadata.num_rows - total + 1))
+    
+    # Read only the row groups spanning [start, start + total)
+    groups, first_row, position = [], None, 0
+    for i in range(metadata.num_row_groups):
+        size = metadata.row_group(i).num_rows
+        if position + size > start and position < start + total:
+            groups.append(i)
+            first_row = position if first_row is None else first_row
+        position += size
+    
+    table = parquet_file.read_row_groups(groups)
+    offset = start - (first_row or 0)
+    return table.slice(offset, total).to_pandas()
+
+
+def load_sample(dataset_key, file, n=None, frac=None, seed=0, stratify=None,
+                contiguous=False, batch_size=65_536):
+    """
+    Load a reproducible sample of a registry file, cached in `datasets/processed/`.
+    
+    Random samples are drawn in a single reservoir-sampling pass over the
+    file's Parquet batches; with `stratify`, each value of that column
+    keeps its share of the rows. With `contiguous=True` the sample is a
+    random window of consecutive rows in time order instead, which keeps
+    time-series structure (lags, seasonality) intact. The same arguments
+    and source content always give the same rows, and repeat calls read
+    the cached sample.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        n (int): Number of rows (pass this or frac)
+        frac (float): Fraction of rows, in (0, 1]
+        seed (int): Random seed
+        stratify (str): Column whose value proportions the sample preserves
+        contiguous (bool): Take a time-contiguous window instead
+        batch_size (int): Rows per streamed batch
+        
+    Returns:
+        pd.DataFrame: The sample, in file (or time) order
+        
+    Example:
+        >>> df = load_sample("pjm_hourly", "pjm_hourly_est.csv", frac=0.05, seed=42)
+        >>> week = load_sample("pjm_energy", "AEP_hourly.csv", n=24 * 7, contiguous=True)
+    """
+    import pandas as pd
+    
+    if contiguous and stratify is not None:
+        raise ValueError("A contiguous sample can't also be stratified")
+    
+    _, digest = _ensure_parquet(dataset_key, file)
+    params = json.dumps({"n": n, "frac": frac, "seed": seed, "stratify": stratify,
+                         "contiguous": contiguous}, sort_keys=True)
+    tag = hashlib.blake2b(params.encode(), digest_size=6).hexdigest()
+    path = processed_path(file, digest, suffix=f".sample-{tag}.parquet")
+    
+    if path.exists():
+        df = pd.read_parquet(path, engine="pyarrow")
+    else:
+        if contiguous:
+            df = _contiguous_sample(dataset_key, file, n, frac, seed)
+        else:
+            df = _reservoir_sample(dataset_key, file, n, frac, seed, stratify, batch_size)
+        tmp = _temp_path(path)
+        df.to_parquet(tmp, engine="pyarrow", index=False)
+        os.replace(tmp, path)
+        _drop_stale_versions(file, path)
+    
+    return _set_schema_index(df, dataset_key, file)
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch over 64-bit hashes (about 1.6% error at p=12).
+    
+    Registers are a NumPy array updated a whole batch of hashes at a
+    time, so sketching a column costs one hash pass plus a scatter-max.
+    """
+    
+    def __init__(self, p=12):
+        import numpy as np
+        
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+    
+    def add_hashes(self, hashes):
+        """Fold an array of uint64 hashes into the sketch."""
+        import numpy as np
+        
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        # Rank = leading zeros of the remaining bits + 1; the guard bit caps it
+        rest = (hashes << np.uint64(self.p)) | np.uint64(1 << (self.p - 1))
+        rank = (64 - np.floor(np.log2(rest.astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+    
+    def estimate(self):
+        """Estimated number of distinct hashes added."""
+        import numpy as np
+        
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))  # linear counting for small sets
+        return int(round(raw))
+
+
+# Cached dataset profiles, next to the processed copies they describe
+CATALOG_NAME = "catalog.json"
+
+
+def _json_value(value):
+    """Arrow scalar as a JSON-friendly value (timestamps as ISO strings)."""
+    value = value.as_py()
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def profile_file(dataset_key, file, batch_size=65_536):
+    """
+    Profile a registry file in one streaming pass over its processed Parquet.
+    
+    Args:
+        dataset_key (str): Key from DATASETS registry
+        file (str): File name within the dataset
+        batch_size (int): Rows per streamed batch
+        
+    Returns:
+        dict: Row count, per-column type/nulls/min/max/distinct estimate,
+            time coverage and the source hash the profile was built from
+    """
+    import pandas as pd
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    
+    path, digest = _ensure_parquet(dataset_key, file)
+    schema = pq.read_schema(path)
+    rows = 0
+    columns = {
+        field.name: {"type": str(field.type), "nulls": 0, "min": None, "max": None}
+        for field in schema
+    }
+    sketches = {name: HyperLogLog() for name in columns}
+    
+    for batch in iter_batches(dataset_key, file, batch_size=batch_size):
+        rows += batch.num_rows
+        for name, stats in columns.items():
+            array = batch.column(name)
+            stats["nulls"] += array.null_count
+            valid = array.drop_null()
+            if len(valid) == 0:
+                continue
+            sketches[name].add_hashes(pd.util.hash_array(valid.to_numpy(zero_copy_only=False)))
+            try:
+                low, high = pc.min_max(valid).values()
+            except NotImplementedError:
+                continue  # e.g. nested types have no ordering
+            low, high = _json_value(low), _json_value(high)
+            stats["min"] = low if stats["min"] is None else min(stats["min"], low)
+            stats["max"] = high if stats["max"] is None else max(stats["max"], high)
+    
+    for name, stats in columns.items():
+        stats["null_rate"] = stats["nulls"] / rows if rows else 0.0
+        stats["distinct"] = min(sketches[name].estimate(), rows - stats["nulls"])
+    
+    profile = {"dataset": dataset_key, "hash": digest, "rows": rows, "columns": columns}
+    try:
+        time_column = _time_column(dataset_key, file, schema)
+    except ValueError:
+        pass
+    else:
+        profile["time"] = {
+            "column": time_column,
+            "start": columns[time_column]["min"],
+            "end": columns[time_column]["max"],
+        }
+    return profile
+
+
+def load_catalog():
+    """Read the cached catalog (empty when it has not been built)."""
+    path = get_processed_folder() / CATALOG_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def build_catalog(dataset_keys=None, force=False):
+    """
+    Profile registry files into `datasets/processed/catalog.json`.
+    
+    Files whose source hash matches their catalog entry are skipped, so
+    rebuilding only profiles new or changed files. Non-tabular files
+    (e.g. images) are left out.
+    
+    Args:
+        dataset_keys (list): Dataset keys to profile (default: all)
+        force (bool): Re-profile files even if their entry is current
+        
+    Returns:
+        dict: The catalog, keyed by file name
+        
+    Example:
+        >>> build_catalog(["pjm_energy"])
+        >>> list_datasets(detailed=True)
+    """
+    catalog = load_catalog()
+    
+    for key in dataset_keys or list(DATASETS):
+        for file in DATASETS[key]["files"]:
+            if Path(file).suffix.lower() not in RAW_READERS:
+                continue
+            _, digest = _source_digest(key, file)
+            if not force and catalog.get(file, {}).get("hash") == digest:
+                continue
+            print(f"📊 Profiling {file}...")
+            catalog[file] = profile_file(key, file)
+    
+    path = get_processed_folder() / CATALOG_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_path(path)
+    tmp.write_text(json.dumps(catalog, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+    return catalog
 
 
 def get_custom_folder():
@@ -218,16 +1659,80 @@ def load_custom_dataset(filename):
     return file_path
 
 
-def list_datasets():
-    """List all registered datasets"""
+def list_datasets(detailed=False):
+    """
+    List all registered datasets.
+    
+    Args:
+        detailed (bool): Also show rows, columns and time coverage from
+            the cached catalog (see `build_catalog`); nothing is loaded
+    """
+    catalog = load_catalog() if detailed else {}
     print("Available datasets:")
     for key, info in DATASETS.items():
         print(f"  • {key}")
         print(f"    Kaggle: {info['kaggle_id']}")
-        print(f"    Files: {', '.join(info['files'])}")
+        if not detailed:
+            print(f"    Files: {', '.join(info['files'])}")
+            print()
+            continue
+        
+        for file in info["files"]:
+            profile = catalog.get(file)
+            if profile is None:
+                print(f"    {file}: not profiled")
+                continue
+            line = f"    {file}: {profile['rows']:,} rows × {len(profile['columns'])} columns"
+            if "time" in profile:
+                line += f", {profile['time']['start']} → {profile['time']['end']}"
+            print(line)
+            for name, stats in profile["columns"].items():
+                print(f"      - {name} ({stats['type']}): {stats['null_rate']:.1%} null, "
+                      f"~{stats['distinct']:,} distinct, {stats['min']} … {stats['max']}")
         print()
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Manage registry datasets")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    listing = subparsers.add_parser("list", help="List registered datasets (default)")
+    listing.add_argument("--detailed", action="store_true", help="Show cached catalog statistics")
+    
+    sync = subparsers.add_parser("sync", help="Download and materialize datasets")
+    sync.add_argument("keys", nargs="*", help="Dataset keys (default: all)")
+    sync.add_argument("--force", action="store_true", help="Re-download even if files exist")
+    sync.add_argument("--workers", type=int, default=4, help="Concurrent downloads/placements (default: 4)")
+    sync.add_argument("--zstd", type=int, metavar="LEVEL", default=None,
+                      help="Store raw files zstd-compressed at this level (1-22)")
+    
+    catalog = subparsers.add_parser("catalog", help="Profile datasets into the cached catalog")
+    catalog.add_argument("keys", nargs="*", help="Dataset keys (default: all)")
+    catalog.add_argument("--force", action="store_true", help="Re-profile unchanged files")
+    
+    schema = subparsers.add_parser("schema", help="Propose a registry schema for a file")
+    schema.add_argument("key", help="Dataset key")
+    schema.add_argument("file", help="File name within the dataset")
+    
+    args = parser.parse_args()
+    
+    if args.command == "sync":
+        ensure_datasets(args.keys or list(DATASETS), force_download=args.force,
+                        max_workers=args.workers, zstd_level=args.zstd)
+    elif args.command == "catalog":
+        build_catalog(args.keys or None, force=args.force)
+        list_datasets(detailed=True)
+    elif args.command == "schema":
+        raw_path, _ = _source_digest(args.key, args.file)
+        df = _read_raw(raw_path)
+        proposed = infer_schema(df)
+        before = df.memory_usage(deep=True).sum()
+        after = apply_schema(df, proposed).memory_usage(deep=True).sum()
+        print(json.dumps({args.file: proposed}, indent=4))
+        print(f"Memory: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({before / after:.1f}x smaller)")
+    else:
+        list_datasets(detailed=getattr(args, "detailed", False))
+
+
 if __name__ == "__main__":
-    # Test/example usage
-    list_datasets()
+    main()
@@ -4,15 +4,49 @@ Functional Testing Suite for AI Domain Finder
 Tests all core functionality with known test cases
 """
 
+import os
 import sys
+import json
 import time
+import tempfile
+import itertools
+import subprocess
+from pathlib import Path
 from datetime import datetime
+from domain_pricing import PricingEngine
+import ai_domain_finder
 from ai_domain_finder import (
     SyllableCounter, 
     DomainChecker, 
+    DomainRanker,
+    CandidatePlanner,
+    BudgetOptimizer,
     AIWordDomainFinder
 )
 
+# Startup budget for `ai_domain_finder.py --help`, interpreter start included
+STARTUP_BUDGET_SECONDS = 0.5
+
+# Libraries that must not be imported until a run actually needs them
+HEAVY_MODULES = ['numpy', 'pandas', 'requests', 'nltk', 'syllables',
+                 'wordfreq', 'whois', 'matplotlib']
+
+
+def run_with_importtime(args, cwd):
+    """Run python with -X importtime; return (imported top-level modules, seconds)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=cwd, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return modules, elapsed
+
 
 class FunctionalTester:
     """Comprehensive functional testing."""
@@ -332,9 +366,246 @@ class FunctionalTester:
                 self.assert_test(f".ai domain for '{word}' correct", actual_ai == expected_ai)
                 self.assert_test(f".com domain for '{word}' correct", actual_com == expected_com)
     
+    def test_domain_ranker(self):
+        """Test streaming top-K ranking of domain pairs."""
+        self.print_section("TEST 10: Streaming Top-K Ranking")
+        
+        frequencies = {'spark': 4.0, 'glow': 3.5, 'data': 5.5, 'vision': 4.5, 'zephyr': 1.0}
+        ranker = DomainRanker(k=3, max_price=100.0, word_frequency=frequencies)
+        
+        def make_pair(word, total_price):
+            return {'word': word, 'both_available': True, 'total_price': total_price}
+        
+        stream = [
+            make_pair('zephyr', 180.0),
+            make_pair('spark', 102.98),
+            make_pair('vision', 102.98),
+            make_pair('glow', 102.98),
+            make_pair('data', 52.98),
+        ]
+        
+        entered = [ranker.push(pair) for pair in stream]
+        top = ranker.top()
+        top_words = [r['word'] for r in top]
+        print(f"Top 3: {', '.join(top_words)}\n")
+        
+        self.assert_test("Heap bounded at K entries", len(ranker) == 3, len(ranker), 3)
+        self.assert_test("All pushes counted", ranker.seen == 5, ranker.seen, 5)
+        self.assert_test("Weak pair dropped from top K", 'zephyr' not in top_words)
+        self.assert_test("First pushes fill the heap", entered[:3] == [True, True, True])
+        self.assert_test("Best pair ranked first", top_words[0] == 'data', top_words[0], 'data')
+        self.assert_test(
+            "Results sorted best first",
+            all(a['score'] >= b['score'] for a, b in zip(top, top[1:], strict=False))
+        )
+    
+    def test_candidate_planner(self):
+        """Test multi-TLD, multi-affix candidate planning."""
+        self.print_section("TEST 11: Candidate Planner")
+        
+        planner = CandidatePlanner(
+            patterns=['{word}ai', 'ai{word}', 'get{word}', '{word}hq'],
+            tlds=['ai', 'com', 'net', 'io'],
+            batch_size=4
+        )
+        
+        # 'aim' + '{word}ai' and 'mai' + 'ai{word}' both produce 'aimai'
+        words = ['spark', 'aim', 'mai', 'spark']
+        candidates = list(planner.iter_candidates(words))
+        domains = [c.domain for c in candidates]
+        print(f"Planned {len(candidates)} candidates, e.g. {', '.join(domains[:4])}\n")
+        
+        self.assert_test("No duplicate domains", len(domains) == len(set(domains)))
+        self.assert_test("Repeated word expanded once", domains.count('sparkai.ai') == 1)
+        self.assert_test("Prefix pattern expanded", 'aispark.com' in domains)
+        self.assert_test("All TLDs covered", {c.tld for c in candidates} == {'ai', 'com', 'net', 'io'})
+        self.assert_test("Cross-pattern collision removed", domains.count('aimai.com') == 1)
+        self.assert_test(
+            "Candidate count after dedupe",
+            len(candidates) == 3 * 4 * 4 - 4,
+            len(candidates),
+            44
+        )
+        
+        batches = list(planner.iter_batches(words))
+        self.assert_test(
+            "Batches are single-server",
+            all(len({planner.server_for(c.tld) for c in batch}) == 1 for _, batch in batches)
+        )
+        self.assert_test(
+            ".com and .net share a batch server",
+            planner.server_for('com') == planner.server_for('net')
+        )
+        self.assert_test(
+            "Batches respect batch size",
+            all(len(batch) <= 4 for _, batch in batches)
+        )
+        self.assert_test(
+            "Batches cover every candidate",
+            sum(len(batch) for _, batch in batches) == len(candidates)
+        )
+    
+    def test_pricing_engine(self):
+        """Test batch pricing across registrar tables."""
+        self.print_section("TEST 12: Pricing Engine")
+        
+        engine = PricingEngine()
+        domains = ['sparkai.ai', 'sparkai.com', 'sparkai.io', 'sparkai.xyz', 'SparkAI.AI']
+        priced = engine.price_batch(domains, max_price=80.0)
+        print(priced.to_string(index=False))
+        print()
+        
+        ai_row = priced.iloc[0]
+        self.assert_test("Cheapest .ai registrar chosen", ai_row['registrar'] == 'onlydomains',
+                         ai_row['registrar'], 'onlydomains')
+        self.assert_test("2-year .ai term priced per year", abs(ai_row['annual_price'] - 77.99) < 1e-9,
+                         ai_row['annual_price'], 77.99)
+        self.assert_test("2-year .ai upfront cost kept", ai_row['upfront_price'] == 155.98)
+        self.assert_test("Unlisted TLD falls back to estimate", priced.iloc[3]['registrar'] == 'estimate')
+        self.assert_test("TLD matching is case-insensitive", priced.iloc[4]['registrar'] == 'onlydomains')
+        self.assert_test(
+            "Budget mask applied",
+            priced['within_budget'].tolist() == [True, True, True, True, True]
+        )
+        
+        upfront = PricingEngine(basis='upfront').price_batch(['sparkai.ai'], max_price=100.0)
+        self.assert_test("Upfront basis picks cheapest term", upfront.iloc[0]['registrar'] == 'typical_registrar')
+        self.assert_test("Upfront basis enforces budget on term cost", bool(upfront.iloc[0]['within_budget']))
+        
+        single_price, registrar = engine.price('sparkai.ai')
+        self.assert_test("Single lookup matches batch", single_price == ai_row['annual_price'])
+    
+    def test_budget_optimizer(self):
+        """Test budget-constrained portfolio selection."""
+        self.print_section("TEST 13: Budget Optimizer")
+        
+        frequencies = {'spark': 4.0, 'glow': 3.5, 'data': 5.5, 'vision': 4.5, 'zephyr': 1.0, 'art': 5.0}
+        optimizer = BudgetOptimizer(
+            budget=120.0,
+            ranker=DomainRanker(word_frequency=frequencies)
+        )
+        
+        results = [
+            {'word': word, 'domain': f"{word}ai.{tld}", 'price': 0.0}
+            for word, tld in [('spark', 'ai'), ('glow', 'com'), ('data', 'io'),
+                              ('vision', 'com'), ('zephyr', 'net'), ('art', 'ai')]
+        ]
+        costs = optimizer.costs(results)
+        values = optimizer.values(results)
+        
+        # Exhaustive search over all subsets as the reference
+        best_value = 0.0
+        for size in range(len(results) + 1):
+            for subset in itertools.combinations(range(len(results)), size):
+                if costs[list(subset)].sum() <= 120.0:
+                    best_value = max(best_value, values[list(subset)].sum())
+        
+        portfolio = optimizer.optimize(results)
+        total_cost = sum(r['cost'] for r in portfolio)
+        total_value = sum(r['value'] for r in portfolio)
+        print(f"Selected: {', '.join(r['domain'] for r in portfolio)} "
+              f"(${total_cost:.2f}, value {total_value:.3f}, optimum {best_value:.3f})\n")
+        
+        self.assert_test("Exact solver used for small inputs", optimizer.method == 'dp')
+        self.assert_test("Portfolio within budget", total_cost <= 120.0, total_cost, "<= 120.00")
+        self.assert_test("Portfolio is optimal", abs(total_value - best_value) < 1e-3,
+                         round(total_value, 4), round(best_value, 4))
+        self.assert_test("Upper bound holds", optimizer.upper_bound >= best_value - 1e-6)
+        
+        greedy = BudgetOptimizer(budget=120.0, ranker=DomainRanker(word_frequency=frequencies),
+                                 max_cells=1)
+        greedy_portfolio = greedy.optimize(results)
+        greedy_cost = sum(r['cost'] for r in greedy_portfolio)
+        greedy_value = sum(r['value'] for r in greedy_portfolio)
+        self.assert_test("Greedy fallback used for large inputs", greedy.method == 'greedy')
+        self.assert_test("Greedy portfolio within budget", greedy_cost <= 120.0)
+        self.assert_test("Greedy within half of optimum", greedy_value >= best_value / 2)
+    
+    def test_budget_with_top(self):
+        """Test that --budget chooses from every available pair, not only the --top K."""
+        self.print_section("TEST 14: Budget Portfolio With --top")
+        
+        words = ['spark', 'glow', 'data', 'vision', 'zephyr', 'art']
+        pairs = [
+            {
+                'word': word,
+                'ai_domain': {'domain': f"{word}ai.ai", 'price': 89.99},
+                'com_domain': {'domain': f"{word}ai.com", 'price': 12.99},
+                'both_available': True,
+                'total_price': 102.98,
+            }
+            for word in words
+        ]
+        
+        offered = []
+        optimize = BudgetOptimizer.optimize
+        
+        def recording_optimize(optimizer, results):
+            offered.extend(results)
+            return optimize(optimizer, results)
+        
+        iter_checked_pairs = AIWordDomainFinder.iter_checked_pairs
+        argv = sys.argv
+        with tempfile.TemporaryDirectory() as tmp:
+            output = str(Path(tmp) / 'results.json')
+            AIWordDomainFinder.iter_checked_pairs = lambda finder, limit=None: iter(pairs)
+            BudgetOptimizer.optimize = recording_optimize
+            sys.argv = ['ai_domain_finder.py', '--top', '2', '--budget', '10000', '--output', output]
+            try:
+                ai_domain_finder.main()
+            finally:
+                AIWordDomainFinder.iter_checked_pairs = iter_checked_pairs
+                BudgetOptimizer.optimize = optimize
+                sys.argv = argv
+            
+            with open(output) as f:
+                saved = json.load(f)['domains']
+            with open(output.replace('.json', '_portfolio.json')) as f:
+                portfolio = json.load(f)['domains']
+        
+        self.assert_test("--top keeps only K pairs in the results file", len(saved) == 2, len(saved), 2)
+        self.assert_test("Optimizer sees every available pair", len(offered) == len(words),
+                         len(offered), len(words))
+        self.assert_test("Budget covering everything buys every pair", len(portfolio) == len(words),
+                         len(portfolio), len(words))
+    
+    def test_startup_time(self):
+        """Test that startup stays within budget without heavy imports."""
+        self.print_section("TEST 15: Startup Import Budget")
+        
+        here = Path(__file__).resolve().parent
+        
+        modules, elapsed = run_with_importtime(['ai_domain_finder.py', '--help'], cwd=here)
+        loaded = sorted(m for m in HEAVY_MODULES if m in modules)
+        print(f"ai_domain_finder.py --help: {elapsed:.3f}s, heavy modules: {loaded or 'none'}")
+        self.assert_test("--help loads no heavy backends", not loaded, loaded, [])
+        self.assert_test(
+            f"--help within {STARTUP_BUDGET_SECONDS}s budget",
+            elapsed <= STARTUP_BUDGET_SECONDS,
+            f"{elapsed:.3f}s",
+            f"<= {STARTUP_BUDGET_SECONDS}s"
+        )
+        
+        modules, elapsed = run_with_importtime(['-c', 'import utils'], cwd=here.parent)
+        print(f"import utils: {elapsed:.3f}s")
+        self.assert_test("import utils does not load matplotlib", 'matplotlib' not in modules)
+        
+        # python-whois is deferred too; a broken install must still read as missing
+        with tempfile.TemporaryDirectory() as fake:
+            Path(fake, 'whois.py').write_text("raise ImportError('broken install')\n")
+            proc = subprocess.run(
+                [sys.executable, '-c',
+                 "import ai_domain_finder as f; print(f.DomainChecker().check_availability_whois('x.ai'))"],
+                cwd=here, capture_output=True, text=True,
+                env={**os.environ, 'PYTHONPATH': fake}
+            )
+        expected = "(None, 'python-whois not installed')"
+        self.assert_test("Broken python-whois falls back to None",
+                         proc.stdout.strip() == expected, proc.stdout.strip() or proc.stderr[-200:], expected)
+    
     def test_live_domain_search(self):
         """Perform a small live domain search."""
-        self.print_section("TEST 10: Live Domain Search (3 words)")
+        self.print_section("TEST 16: Live Domain Search (3 words)")
         
         finder = AIWordDomainFinder(max_syllables=1, max_price=100.0, max_workers=1)
         
@@ -414,6 +685,12 @@ def main():
     tester.test_word_loading()
     tester.test_syllable_filtering()
     tester.test_domain_generation()
+    tester.test_domain_ranker()
+    tester.test_candidate_planner()
+    tester.test_pricing_engine()
+    tester.test_budget_optimizer()
+    tester.test_budget_with_top()
+    tester.test_startup_time()
     
     # Ask before live search
     print("\n" + "=" * 80)
@@ -0,0 +1,291 @@
+"""
+Compiled evaluation of symbolic-regression hall-of-fame equations.
+
+The ship-engine symbolic regression runs (PySR) leave
+`notebooks/outputs/<run>/hall_of_fame.csv.bak` files listing one equation
+per complexity, e.g. `log(sqrt(x0) + x1) + 72.70638`, where `x0, x1, ...`
+are the model's input columns in order.
+
+Equations are parsed with `ast` against a whitelist of operators and
+functions (never `eval`) into small expression trees, and the trees of a
+whole hall of fame are compiled together into one straight-line NumPy
+program: subexpressions shared between equations (`sqrt(x0)`,
+`log(x1)`, ...) are computed once and constant subtrees are folded.
+Evaluating the program runs each step over whole sensor columns, giving
+every equation's prediction in a single pass.
+
+Example:
+    from hall_of_fame import compile_hall_of_fame, residual_features
+    
+    equations, program = compile_hall_of_fame("notebooks/outputs/20251224_130914_wmnqWn")
+    predictions = program(sensors[["engine_rpm", "oil_pressure", "coolant_temp"]])
+    residuals = residual_features(sensors, "oil_temp", ["engine_rpm", "oil_pressure"], equations)
+"""
+
+import ast
+from pathlib import Path
+
+import numpy as np
+
+
+OUTPUTS_DIR = Path(__file__).resolve().parent / "notebooks" / "outputs"
+HALL_OF_FAME_NAMES = ("hall_of_fame.csv", "hall_of_fame.csv.bak")
+
+# Binary and unary operators allowed in equations
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+UNARY_OPERATORS = {
+    ast.USub: np.negative,
+    ast.UAdd: np.positive,
+}
+
+# Function names PySR writes for its common unary operators
+FUNCTIONS = {
+    "log": np.log,
+    "log2": np.log2,
+    "log10": np.log10,
+    "log1p": np.log1p,
+    "exp": np.exp,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "square": np.square,
+    "cube": lambda x: x * x * x,
+    "inv": np.reciprocal,
+    "neg": np.negative,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+}
+
+
+def parse_equation(text):
+    """
+    Parse an equation string into an expression tree.
+    
+    Trees are nested tuples, so identical subexpressions compare and hash
+    equal: `("const", value)`, `("var", index)` for `x<index>`,
+    `("call", name, child)` and `("binop", operator, left, right)`.
+    
+    Args:
+        text (str): Equation such as "sqrt(x2 * 2.36383) + 64.867874"
+    
+    Returns:
+        tuple: Expression tree
+    
+    Raises:
+        ValueError: On syntax errors or anything outside the whitelist
+            (attributes, unknown names or functions, keywords, ...)
+    """
+    # PySR writes powers Julia-style; `^` binds like Python's `**`, which a
+    # mapping of ast.BitXor would not (x0^2 + 1 would parse as x0^(2 + 1))
+    source = str(text).strip().replace("^", "**")
+    try:
+        body = ast.parse(source, mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Cannot parse equation {text!r}: {e.msg}") from None
+    
+    def build(node):
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return ("const", float(node.value))
+        if isinstance(node, ast.Name) and node.id[:1] == "x" and node.id[1:].isdigit():
+            return ("var", int(node.id[1:]))
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            return ("binop", type(node.op).__name__, build(node.left), build(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            child = build(node.operand)
+            if child[0] == "const":
+                return ("const", float(UNARY_OPERATORS[type(node.op)](child[1])))
+            return ("call", type(node.op).__name__, child)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords):
+            return ("call", node.func.id, build(node.args[0]))
+        raise ValueError(f"Unsupported element {ast.dump(node)!r} in equation {text!r}")
+    
+    return build(body)
+
+
+def _function(kind, name):
+    if kind == "binop":
+        return BINARY_OPERATORS[getattr(ast, name)]
+    if name in FUNCTIONS:
+        return FUNCTIONS[name]
+    return UNARY_OPERATORS[getattr(ast, name)]
+
+
+class CompiledEquations:
+    """
+    Several equations compiled into one NumPy program with shared steps.
+    
+    Attributes:
+        equations (list): Source strings, in output column order
+        n_variables (int): Input columns required (highest `x<i>` + 1)
+        steps (list): (slot, function, argument slots) in evaluation order,
+            one per distinct non-constant subexpression
+    """
+    
+    def __init__(self, equations):
+        """
+        Args:
+            equations (list): Equation strings (see `parse_equation`)
+        """
+        self.equations = [str(e) for e in equations]
+        self.n_variables = 0
+        self.constants = {}   # slot -> value
+        self.variables = {}   # slot -> input column
+        self.steps = []       # (slot, function, argument slots)
+        self._slots = {}
+        
+        self.outputs = [self._compile(parse_equation(e)) for e in self.equations]
+        self.n_slots = len(self._slots)
+    
+    def _compile(self, tree):
+        """Slot holding `tree`'s value, adding steps for unseen subtrees."""
+        if tree in self._slots:
+            return self._slots[tree]
+        
+        kind = tree[0]
+        if kind == "const":
+            slot = self._new_slot(tree)
+            self.constants[slot] = tree[1]
+            return slot
+        if kind == "var":
+            slot = self._new_slot(tree)
+            self.variables[slot] = tree[1]
+            self.n_variables = max(self.n_variables, tree[1] + 1)
+            return slot
+        
+        function = _function(kind, tree[1])
+        arguments = [self._compile(child) for child in tree[2:]]
+        if all(a in self.constants for a in arguments):
+            # Fold constant subtrees at compile time
+            with np.errstate(all="ignore"):
+                value = float(function(*[np.float64(self.constants[a]) for a in arguments]))
+            return self._compile(("const", value))
+        slot = self._new_slot(tree)
+        self.steps.append((slot, function, arguments))
+        return slot
+    
+    def _new_slot(self, tree):
+        slot = len(self._slots)
+        self._slots[tree] = slot
+        return slot
+    
+    def __len__(self):
+        return len(self.equations)
+    
+    def __call__(self, X):
+        """
+        Evaluate every equation over whole columns.
+        
+        Invalid domains (log of a negative, division by zero) give NaN or
+        inf for those rows, as in PySR, without warnings.
+        
+        Args:
+            X (np.ndarray | pd.DataFrame): (n × n_variables) inputs; column
+                i is `x<i>` (extra columns are ignored)
+        
+        Returns:
+            np.ndarray: (n × len(equations)) float64 predictions
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[:, None]
+        if X.shape[1] < self.n_variables:
+            raise ValueError(f"Equations use {self.n_variables} variables; X has {X.shape[1]} columns")
+        
+        values = [None] * self.n_slots
+        for slot, value in self.constants.items():
+            values[slot] = value
+        for slot, column in self.variables.items():
+            values[slot] = X[:, column]
+        with np.errstate(all="ignore"):
+            for slot, function, arguments in self.steps:
+                values[slot] = function(*[values[a] for a in arguments])
+        
+        out = np.empty((X.shape[0], len(self.outputs)))
+        for j, slot in enumerate(self.outputs):
+            out[:, j] = values[slot]   # broadcasts constant-only equations
+        return out
+
+
+def find_hall_of_fame(path):
+    """
+    Hall-of-fame file for a run folder (or the file itself).
+    
+    Prefers `hall_of_fame.csv` over the `.bak` copy PySR keeps beside it.
+    """
+    path = Path(path)
+    if path.is_file():
+        return path
+    for name in HALL_OF_FAME_NAMES:
+        if (path / name).exists():
+            return path / name
+    raise FileNotFoundError(f"No {' or '.join(HALL_OF_FAME_NAMES)} in {path}")
+
+
+def list_runs(outputs_dir=OUTPUTS_DIR):
+    """Run folders under `outputs_dir` that hold a hall of fame, oldest first."""
+    return sorted(p for p in Path(outputs_dir).iterdir()
+                  if p.is_dir() and any((p / name).exists() for name in HALL_OF_FAME_NAMES))
+
+
+def load_hall_of_fame(path):
+    """
+    Read a hall of fame as a DataFrame indexed by Complexity.
+    
+    Args:
+        path (str | Path): Run folder or hall-of-fame CSV
+    
+    Returns:
+        pd.DataFrame: Columns `Loss` and `Equation`, sorted by Complexity
+    """
+    import pandas as pd
+    
+    frame = pd.read_csv(find_hall_of_fame(path), dtype={"Equation": "string"})
+    return frame.set_index("Complexity").sort_index()
+
+
+def compile_hall_of_fame(path):
+    """
+    Load and compile a run's hall of fame.
+    
+    Returns:
+        tuple: (hall-of-fame DataFrame, CompiledEquations in the same row order)
+    """
+    frame = load_hall_of_fame(path)
+    return frame, CompiledEquations(frame["Equation"].tolist())
+
+
+def residual_features(data, target, inputs, hall_of_fame, prefix="residual"):
+    """
+    Residuals of every hall-of-fame equation for use as anomaly features.
+    
+    Args:
+        data (pd.DataFrame): Sensor readings
+        target (str): Column the equations predict
+        inputs (list): Columns bound to x0, x1, ... (the regression's inputs)
+        hall_of_fame (pd.DataFrame | str | Path): Output of `load_hall_of_fame`,
+            or a run folder / CSV to load
+        prefix (str): Feature name prefix
+    
+    Returns:
+        pd.DataFrame: `<prefix>_c<complexity>` = target - prediction,
+            aligned with `data.index`
+    """
+    import pandas as pd
+    
+    if not isinstance(hall_of_fame, pd.DataFrame):
+        hall_of_fame = load_hall_of_fame(hall_of_fame)
+    program = CompiledEquations(hall_of_fame["Equation"].tolist())
+    predictions = program(data[list(inputs)])
+    residuals = data[target].to_numpy(dtype=np.float64)[:, None] - predictions
+    return pd.DataFrame(residuals, index=data.index,
+                        columns=[f"{prefix}_c{c}" for c in hall_of_fame.index])
@@ -0,0 +1,39 @@
+"""
+Deferred imports for optional and heavy backends.
+
+Modules returned by `lazy_import` are only executed on first attribute
+access, so CLI startup (e.g. `--help`) never pays for backends a run
+does not use.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Return a module that is loaded on first attribute access.
+    
+    Args:
+        name (str): Top-level module name (e.g. "numpy")
+    
+    Returns:
+        module or None: Lazy module, or None when it is not installed
+    
+    Example:
+        >>> np = lazy_import("numpy")   # nothing imported yet
+        >>> np.zeros(3)                 # numpy loads here
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
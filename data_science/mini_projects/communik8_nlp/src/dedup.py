@@ -0,0 +1,226 @@
+"""
+Near-duplicate detection for customer feedback with MinHash and LSH.
+
+Templated and copy-pasted complaints inflate category counts and make the
+classifier score the same message many times. Each message is reduced to
+a MinHash signature over its character shingles (whose agreement rate
+estimates Jaccard similarity), and signatures are split into LSH bands:
+messages that share any whole band become candidate pairs. Candidates are
+found by sorting band keys into buckets, not by comparing all pairs, and the verified
+pairs are joined into clusters with a connected-components pass, so the
+whole stage is roughly linear in the number of messages.
+
+Example:
+    from dedup import drop_near_duplicates
+    
+    distinct = drop_near_duplicates(feedback, threshold=0.8)
+    l1, l2 = clf.predict(distinct["customer_feedback"])   # each message once
+    # distinct["n_duplicates"] says how many rows each one stands for
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from text_pipeline import normalize
+
+
+# splitmix64 finalizer constants
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+# Cap on (shingles × hash functions) values held at once while signing
+_BLOCK_ELEMENTS = 1 << 22
+
+# LSH buckets up to this size verify every pair; larger ones (templated
+# messages) verify each member against the bucket's first row only
+_ALL_PAIRS_BUCKET = 32
+
+
+def _mix64(x):
+    """Bijective 64-bit mixing (splitmix64 finalizer), elementwise."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def char_shingles(texts, k=5):
+    """
+    Hashes of every k-character shingle of each normalized text.
+    
+    Texts shorter than `k` (including empty ones) are padded, so every
+    text has at least one shingle.
+    
+    Args:
+        texts (pd.Series | list): Feedback strings
+        k (int): Shingle length in characters
+    
+    Returns:
+        tuple: (doc positions, uint64 shingle hashes) as parallel arrays,
+            in document order
+    """
+    encoded = normalize(texts).str.pad(k, side="right").str.encode("utf-8")
+    lengths = encoded.str.len().to_numpy(dtype=np.int64)
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    
+    # Polynomial hash of every k-byte window, then keep windows inside one text
+    window = np.zeros(len(data) - k + 1, dtype=np.uint64)
+    for i in range(k):
+        window = window * np.uint64(257) + data[i:len(data) - k + 1 + i]
+    ends = np.cumsum(lengths)
+    docs = np.repeat(np.arange(len(lengths)), lengths)[:len(window)]
+    inside = np.arange(len(window)) + k <= ends[docs]
+    return docs[inside], _mix64(window[inside])
+
+
+def minhash_signatures(texts, num_perm=128, k=5, seed=0, batch_size=10_000):
+    """
+    MinHash signature of each text's shingle set.
+    
+    Hash function i is multiply-shift hashing of the 32-bit shingle hash,
+    `(a_i * x + b_i) >> 32` with random 64-bit odd `a_i` and `b_i`: two
+    vector operations per shingle and function. The signature keeps the
+    minimum over the text's shingles for each i. The share of equal
+    entries between two signatures estimates their Jaccard similarity.
+    
+    Args:
+        texts (pd.Series | list): Feedback strings
+        num_perm (int): Hash functions (signature length)
+        k (int): Shingle length in characters
+        seed (int): Seed for the hash functions
+        batch_size (int): Texts shingled at a time
+    
+    Returns:
+        np.ndarray: (len(texts) × num_perm) uint32
+    """
+    texts = pd.Series(texts, dtype="string").reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2 ** 64, size=num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+    offsets = rng.integers(0, 2 ** 64, size=num_perm, dtype=np.uint64, endpoint=False)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    
+    for offset in range(0, len(texts), batch_size):
+        docs, hashes = char_shingles(texts[offset:offset + batch_size], k)
+        hashes >>= np.uint64(32)
+        starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        block = max(1, _BLOCK_ELEMENTS // max(len(hashes), 1))
+        for lo in range(0, num_perm, block):
+            # (functions × shingles), so each per-text minimum runs over contiguous memory
+            mixed = np.multiply.outer(multipliers[lo:lo + block], hashes)
+            mixed += offsets[lo:lo + block, None]
+            minima = np.minimum.reduceat(mixed, starts, axis=1)
+            signatures[offset + docs[starts], lo:lo + block] = (minima >> np.uint64(32)).T
+    return signatures
+
+
+def lsh_bands(threshold, num_perm=128):
+    """
+    (bands, rows) whose LSH S-curve midpoint (1/bands)^(1/rows) is closest
+    to `threshold`, with bands × rows = num_perm.
+    """
+    rows = [r for r in range(1, num_perm + 1) if num_perm % r == 0]
+    best = min(rows, key=lambda r: abs((r / num_perm) ** (1 / r) - threshold))
+    return num_perm // best, best
+
+
+def _bucket_pairs(keys):
+    """
+    Candidate (a, b) row pairs among rows with equal keys.
+    
+    Buckets of up to `_ALL_PAIRS_BUCKET` rows give all their pairs,
+    generated per bucket size as a (buckets × size) block; larger buckets
+    pair every member with their first row.
+    """
+    order = np.argsort(keys, kind="stable")
+    starts = np.flatnonzero(np.r_[True, keys[order][1:] != keys[order][:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    
+    sources, targets = [], []
+    for size in np.unique(sizes[(sizes > 1) & (sizes <= _ALL_PAIRS_BUCKET)]):
+        members = order[starts[sizes == size, None] + np.arange(size)]
+        i, j = np.triu_indices(size, k=1)
+        sources.append(members[:, i].ravel())
+        targets.append(members[:, j].ravel())
+    
+    large = sizes > _ALL_PAIRS_BUCKET
+    heads = np.repeat(order[starts[large]], sizes[large] - 1)
+    rest = np.ones(len(keys), dtype=bool)
+    rest[starts] = False
+    rest &= np.repeat(large, sizes)
+    sources.append(heads)
+    targets.append(order[rest])
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def duplicate_clusters(signatures, threshold=0.8, bands=None):
+    """
+    Cluster texts whose estimated Jaccard similarity reaches `threshold`.
+    
+    For each band the rows' band keys are sorted and rows with equal keys
+    form a bucket. Every pair in a small bucket is a candidate; in a large
+    one, each member is paired with the bucket's first row. A candidate
+    pair is kept if the full signatures agree on at least `threshold` of
+    entries. Clusters are the connected components of the kept pairs.
+    
+    Args:
+        signatures (np.ndarray): Output of `minhash_signatures`
+        threshold (float): Minimum estimated Jaccard similarity
+        bands (int): LSH bands (default: chosen from `threshold`)
+    
+    Returns:
+        np.ndarray: Cluster label per row: the position of the cluster's
+            first row, so rows with `labels == arange(n)` are representatives
+    """
+    n, num_perm = signatures.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    if bands is None:
+        bands, _ = lsh_bands(threshold, num_perm)
+    if num_perm % bands:
+        raise ValueError(f"bands={bands} must divide the signature length {num_perm}")
+    rows = num_perm // bands
+    
+    sources, targets = [], []
+    for band in range(bands):
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            keys = _mix64(keys ^ column.astype(np.uint64))
+        a, b = _bucket_pairs(keys)
+        agree = (signatures[a] == signatures[b]).mean(axis=1) >= threshold
+        sources.append(a[agree])
+        targets.append(b[agree])
+    
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    graph = sparse.coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+    n_components, components = connected_components(graph, directed=False)
+    
+    # Relabel each component by its first row
+    order = np.argsort(components, kind="stable")
+    starts = np.flatnonzero(np.r_[True, components[order][1:] != components[order][:-1]])
+    first = np.empty(n_components, dtype=np.int64)
+    first[components[order[starts]]] = order[starts]
+    return first[components]
+
+
+def drop_near_duplicates(frame, text_column="customer_feedback", threshold=0.8, num_perm=128, k=5, seed=0):
+    """
+    Keep one row per near-duplicate cluster.
+    
+    Args:
+        frame (pd.DataFrame): Feedback rows
+        text_column (str): Column holding the feedback text
+        threshold (float): Minimum estimated Jaccard similarity
+        num_perm, k, seed: See `minhash_signatures`
+    
+    Returns:
+        pd.DataFrame: The first row of each cluster, in original order,
+            with `n_duplicates` (cluster size) added
+    """
+    signatures = minhash_signatures(frame[text_column], num_perm=num_perm, k=k, seed=seed)
+    labels = duplicate_clusters(signatures, threshold)
+    representatives = np.flatnonzero(labels == np.arange(len(labels)))
+    sizes = np.bincount(labels, minlength=len(labels))
+    return frame.iloc[representatives].assign(n_duplicates=sizes[representatives])
@@ -0,0 +1,239 @@
+"""
+Evaluation of taxonomy predictions against the manual labels.
+
+Gold labels (`data/manual_labels.csv`, one row per id and category) and
+predictions are both encoded as sparse multi-hot matrices, one row per
+feedback id and one column per taxonomy category (L1 columns first, as
+in `TaxonomyClassifier`). Every metric is then a column sum or a sparse
+product over those matrices, with no joins or per-row loops.
+
+`threshold_sweep` sorts the scores once per category, so scoring each
+extra threshold is a binary search and a lookup.
+
+Example:
+    import numpy as np
+    from evaluation import encode_labels, evaluate, load_labels
+    from taxonomy_classifier import TaxonomyClassifier
+    
+    clf = TaxonomyClassifier.from_taxonomy()
+    categories = clf.l1_categories + clf.l2_categories
+    gold = encode_labels(load_labels(), feedback["id"], categories)
+    pred = np.hstack(clf.predict(feedback["customer_feedback"]))
+    report = evaluate(gold, pred, categories, clf.hierarchy)
+    report["per_category"]
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from taxonomy_classifier import PROJECT_ROOT
+
+
+LABELS_PATH = PROJECT_ROOT / "data" / "manual_labels.csv"
+
+
+def load_labels(path=LABELS_PATH):
+    """Manual labels as a long (id, category) frame."""
+    return pd.read_csv(path, dtype={"category": "string"})
+
+
+def _as_csr(labels):
+    """Multi-hot CSR (int8) from a sparse or dense 0/1 matrix."""
+    return sparse.csr_matrix(labels, dtype=np.int8)
+
+
+def _divide(numerator, denominator):
+    """Elementwise ratio that is 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _f1(precision, recall):
+    return _divide(2 * precision * recall, precision + recall)
+
+
+def encode_labels(labels, ids, categories):
+    """
+    Encode long (id, category) labels as a multi-hot matrix.
+    
+    Args:
+        labels (pd.DataFrame): Columns `id` and `category`
+        ids (array-like): Row order (e.g. the feedback ids being evaluated);
+            labels for other ids are dropped, ids without labels get empty rows
+        categories (list): Column order
+    
+    Returns:
+        scipy.sparse.csr_matrix: (len(ids) × len(categories)) int8 0/1
+    """
+    cols = pd.Index(categories).get_indexer(labels["category"])
+    unknown = pd.unique(labels["category"][cols < 0])
+    if len(unknown):
+        raise ValueError(f"Unknown categories {list(unknown)}. Available: {list(categories)}")
+    
+    rows = pd.Index(ids).get_indexer(labels["id"])
+    keep = rows >= 0
+    encoded = sparse.csr_matrix((np.ones(keep.sum(), dtype=np.int8), (rows[keep], cols[keep])),
+                                shape=(len(ids), len(categories)))
+    encoded.sum_duplicates()
+    encoded.data[:] = 1
+    return encoded
+
+
+def per_category(gold, pred, categories):
+    """
+    Precision, recall and F1 for every category.
+    
+    Args:
+        gold, pred: Multi-hot matrices (sparse or dense), same shape
+        categories (list): Column names
+    
+    Returns:
+        pd.DataFrame: support, predicted, tp, precision, recall, f1 per category
+    """
+    gold, pred = _as_csr(gold), _as_csr(pred)
+    tp = np.asarray(gold.multiply(pred).sum(axis=0)).ravel()
+    support = np.asarray(gold.sum(axis=0)).ravel()
+    predicted = np.asarray(pred.sum(axis=0)).ravel()
+    precision, recall = _divide(tp, predicted), _divide(tp, support)
+    return pd.DataFrame({
+        "support": support, "predicted": predicted, "tp": tp,
+        "precision": precision, "recall": recall, "f1": _f1(precision, recall),
+    }, index=pd.Index(categories, name="category"))
+
+
+def summary(gold, pred):
+    """
+    Micro/macro scores and exact-match rate over all columns.
+    
+    Returns:
+        dict: micro_precision, micro_recall, micro_f1, macro_f1 (over
+            categories with support or predictions), exact_match
+    """
+    gold, pred = _as_csr(gold), _as_csr(pred)
+    table = per_category(gold, pred, range(gold.shape[1]))
+    tp, predicted, support = table["tp"].sum(), table["predicted"].sum(), table["support"].sum()
+    precision, recall = _divide(tp, predicted), _divide(tp, support)
+    active = (table["support"] > 0) | (table["predicted"] > 0)
+    errors = np.diff((gold != pred).tocsr().indptr)
+    return {
+        "micro_precision": float(precision),
+        "micro_recall": float(recall),
+        "micro_f1": float(_f1(precision, recall)),
+        "macro_f1": float(table["f1"][active].mean()) if active.any() else 0.0,
+        "exact_match": float(np.mean(errors == 0)) if gold.shape[0] else 0.0,
+    }
+
+
+def confusion(gold, pred, categories):
+    """
+    Gold × predicted co-occurrence counts.
+    
+    Entry (i, j) counts rows labelled i that were predicted j, so the
+    diagonal is the true positives and off-diagonal mass shows which
+    categories get mistaken for which.
+    
+    Returns:
+        pd.DataFrame: Rows gold category, columns predicted category
+    """
+    counts = (_as_csr(gold).T.astype(np.int64) @ _as_csr(pred).astype(np.int64)).toarray()
+    return pd.DataFrame(counts, index=pd.Index(categories, name="gold"),
+                        columns=pd.Index(categories, name="predicted"))
+
+
+def hierarchy_consistency(labels, hierarchy):
+    """
+    How well L2 columns agree with the L2 parents implied by L1 columns.
+    
+    Args:
+        labels: Multi-hot matrix with L1 columns first, then L2 columns
+        hierarchy (np.ndarray): Bool (L1 × L2) ancestor matrix
+            (`TaxonomyClassifier.hierarchy`)
+    
+    Returns:
+        dict:
+            consistent_rate: share of rows with no missing or orphan L2
+            missing: per-L2 count of rows where an L1 implies it but it is absent
+            orphan: per-L2 count of rows where it is present without any implying L1
+    """
+    labels = _as_csr(labels)
+    n_l1, n_l2 = hierarchy.shape
+    l1, l2 = labels[:, :n_l1], labels[:, n_l1:n_l1 + n_l2].toarray() > 0
+    implied = (l1.astype(np.int32) @ sparse.csr_matrix(hierarchy, dtype=np.int32)).toarray() > 0
+    missing, orphan = implied & ~l2, l2 & ~implied
+    consistent = ~(missing | orphan).any(axis=1)
+    return {
+        "consistent_rate": float(consistent.mean()) if len(consistent) else 0.0,
+        "missing": missing.sum(axis=0),
+        "orphan": orphan.sum(axis=0),
+    }
+
+
+def evaluate(gold, pred, categories, hierarchy=None):
+    """
+    Full report: per-category table, summary, confusion and (given the
+    hierarchy) L1→L2 consistency of the predictions and of the gold labels.
+    
+    Returns:
+        dict: per_category, summary, confusion, and optionally
+            consistency / gold_consistency
+    """
+    gold, pred = _as_csr(gold), _as_csr(pred)
+    if gold.shape != pred.shape:
+        raise ValueError(f"Shape mismatch: gold {gold.shape} vs pred {pred.shape}")
+    report = {
+        "per_category": per_category(gold, pred, categories),
+        "summary": summary(gold, pred),
+        "confusion": confusion(gold, pred, categories),
+    }
+    if hierarchy is not None:
+        report["consistency"] = hierarchy_consistency(pred, hierarchy)
+        report["gold_consistency"] = hierarchy_consistency(gold, hierarchy)
+    return report
+
+
+def threshold_sweep(scores, gold, thresholds):
+    """
+    Precision/recall/F1 at many thresholds (label = score >= threshold).
+    
+    Each category's scores are sorted once alongside cumulative true
+    positives; a threshold is then a binary search into that order, so a
+    sweep over thousands of thresholds costs about as much as one sort.
+    (No top-1 fallback is applied, unlike `TaxonomyClassifier.predict`.)
+    
+    Args:
+        scores (np.ndarray): (n × k) scores, e.g. `TaxonomyClassifier.scores`
+        gold: (n × k) multi-hot gold labels for the same columns
+        thresholds (array-like): Thresholds to evaluate
+    
+    Returns:
+        dict: `thresholds`, (t × k) `precision`/`recall`/`f1` arrays and
+            (t,) `micro_f1`
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    gold = _as_csr(gold).toarray().astype(np.int64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    k = scores.shape[1]
+    
+    order = np.argsort(-scores, axis=0, kind="stable")
+    descending = np.take_along_axis(scores, order, axis=0)
+    cum_tp = np.vstack([np.zeros((1, k), dtype=np.int64),
+                        np.cumsum(np.take_along_axis(gold, order, axis=0), axis=0)])
+    
+    # Number of scores >= threshold in each column
+    predicted = np.column_stack([np.searchsorted(-descending[:, j], -thresholds, side="right")
+                                 for j in range(k)])
+    tp = cum_tp[predicted, np.arange(k)]
+    support = gold.sum(axis=0)
+    
+    precision, recall = _divide(tp, predicted), _divide(tp, np.broadcast_to(support, tp.shape))
+    micro_p = _divide(tp.sum(axis=1), predicted.sum(axis=1))
+    micro_r = _divide(tp.sum(axis=1), np.full(len(thresholds), support.sum()))
+    return {
+        "thresholds": thresholds,
+        "precision": precision,
+        "recall": recall,
+        "f1": _f1(precision, recall),
+        "micro_f1": _f1(micro_p, micro_r),
+    }
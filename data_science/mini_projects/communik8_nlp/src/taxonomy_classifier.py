@@ -0,0 +1,248 @@
+"""
+Prototype-index classifier for the Communik8 complaint taxonomy.
+
+`config/taxonomy.json` gives each category example `prototypes`,
+`include` phrases and `exclude` phrases. They are compiled once into a
+sparse, L2-normalized matrix (one row per phrase) and cached in
+`artifacts/`; the cache is rebuilt whenever the taxonomy file or the
+vectorizer settings change.
+
+Classifying a batch is one sparse matrix multiply against that index,
+a per-category max over phrase similarities, and a threshold. L1
+categories (customer-visible symptoms) are predicted; their L2
+mechanisms follow from the taxonomy's parent links.
+
+Example:
+    from taxonomy_classifier import TaxonomyClassifier
+    
+    clf = TaxonomyClassifier.from_taxonomy()
+    l1, l2 = clf.predict(feedback["customer_feedback"])   # multi-hot bool matrices
+    clf.to_labels(feedback["id"], l1, l2)                 # long (id, category) frame
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from text_pipeline import HashingTfidf
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TAXONOMY_PATH = PROJECT_ROOT / "config" / "taxonomy.json"
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+INDEX_NAME = "prototype_index.npz"
+
+# Phrase kinds compiled per L1 category; exclude phrases count against it
+POSITIVE_FIELDS = ("prototypes", "include")
+
+
+def l2_ancestors(categories):
+    """
+    L2 mechanisms reachable from each category through `parents`.
+    
+    Parents may themselves be L1 (e.g. store_experience -> customer_service),
+    so links are followed until L2 categories are reached.
+    """
+    ancestors = {}
+    
+    def resolve(name, seen=()):
+        if name in ancestors:
+            return ancestors[name]
+        found = set()
+        for parent in categories[name].get("parents", []):
+            if parent in seen:
+                continue
+            if categories[parent]["level"] == "L2":
+                found.add(parent)
+            found |= resolve(parent, seen + (name,))
+        ancestors[name] = found
+        return found
+    
+    for name in categories:
+        resolve(name)
+    return ancestors
+
+
+class TaxonomyClassifier:
+    """
+    Multi-label L1/L2 classifier over a compiled prototype index.
+    
+    Attributes:
+        l1_categories (list): Column order of L1 predictions
+        l2_categories (list): Column order of L2 predictions
+        index (csr_matrix): Normalized phrase vectors (phrases × features)
+        phrase_category (np.ndarray): L1 column of each phrase
+        phrase_sign (np.ndarray): +1 for prototypes/include, -1 for exclude
+        hierarchy (np.ndarray): Bool (L1 × L2) ancestor matrix
+    """
+    
+    def __init__(self, taxonomy, n_features=2 ** 18, ngram_range=(1, 2),
+                 exclude_weight=0.5, threshold=0.25):
+        """
+        Build the index from a parsed taxonomy (use `from_taxonomy` for caching).
+        
+        Args:
+            taxonomy (dict): Parsed taxonomy.json
+            n_features (int): Hashed feature width
+            ngram_range (tuple): Token n-grams used for phrase vectors
+            exclude_weight (float): How much an exclude-phrase match
+                subtracts from a category's score
+            threshold (float): Default score needed to assign a category
+        """
+        categories = taxonomy["categories"]
+        self.exclude_weight = exclude_weight
+        self.threshold = threshold
+        self.l1_categories = [c for c, info in categories.items() if info["level"] == "L1"]
+        self.l2_categories = [c for c, info in categories.items() if info["level"] == "L2"]
+        
+        ancestors = l2_ancestors(categories)
+        l2_column = {c: j for j, c in enumerate(self.l2_categories)}
+        self.hierarchy = np.zeros((len(self.l1_categories), len(self.l2_categories)), dtype=bool)
+        for i, name in enumerate(self.l1_categories):
+            self.hierarchy[i, [l2_column[p] for p in ancestors[name]]] = True
+        
+        phrases, owners, signs = [], [], []
+        for i, name in enumerate(self.l1_categories):
+            info = categories[name]
+            for field in POSITIVE_FIELDS:
+                phrases += info.get(field, [])
+                owners += [i] * len(info.get(field, []))
+                signs += [1] * len(info.get(field, []))
+            phrases += info.get("exclude", [])
+            owners += [i] * len(info.get("exclude", []))
+            signs += [-1] * len(info.get("exclude", []))
+        
+        # IDF from every phrase in the taxonomy, so words that name a
+        # category outweigh words shared by all complaints
+        corpus = []
+        for info in categories.values():
+            corpus.append(info.get("definition", ""))
+            for field in POSITIVE_FIELDS + ("exclude",):
+                corpus += info.get(field, [])
+        self.vectorizer = HashingTfidf(n_features=n_features, ngram_range=ngram_range).partial_fit(corpus)
+        
+        # Group rows by (sign, category) so per-category maxima are contiguous slices
+        order = np.lexsort((np.array(owners), -np.array(signs)))
+        self.index = self.vectorizer.transform([phrases[k] for k in order])
+        self.phrase_category = np.array(owners)[order]
+        self.phrase_sign = np.array(signs)[order]
+    
+    @classmethod
+    def from_taxonomy(cls, path=TAXONOMY_PATH, artifacts_dir=ARTIFACTS_DIR, **kwargs):
+        """
+        Load the compiled index from `artifacts/`, rebuilding it if the
+        taxonomy or settings changed.
+        
+        Args:
+            path (Path): taxonomy.json
+            artifacts_dir (Path): Where the compiled index is cached
+            **kwargs: Constructor settings (n_features, ngram_range, ...)
+        
+        Returns:
+            TaxonomyClassifier
+        """
+        raw = Path(path).read_bytes()
+        settings = json.dumps(kwargs, sort_keys=True, default=list)
+        key = hashlib.blake2b(raw + settings.encode(), digest_size=16).hexdigest()
+        cache = Path(artifacts_dir) / INDEX_NAME
+        
+        if cache.exists():
+            state = np.load(cache, allow_pickle=False)
+            if str(state["key"]) == key:
+                return cls._from_state(state)
+        
+        clf = cls(json.loads(raw), **kwargs)
+        clf._save(cache, key)
+        return clf
+    
+    def _save(self, path, key):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp.npz")
+        np.savez_compressed(
+            tmp, key=key,
+            data=self.index.data, indices=self.index.indices, indptr=self.index.indptr,
+            shape=np.array(self.index.shape),
+            phrase_category=self.phrase_category, phrase_sign=self.phrase_sign,
+            hierarchy=self.hierarchy,
+            l1=np.array(self.l1_categories), l2=np.array(self.l2_categories),
+            doc_freq=self.vectorizer.doc_freq, n_docs=self.vectorizer.n_docs,
+            ngram_range=np.array(self.vectorizer.ngram_range),
+            exclude_weight=self.exclude_weight, threshold=self.threshold,
+        )
+        os.replace(tmp, path)
+    
+    @classmethod
+    def _from_state(cls, state):
+        clf = cls.__new__(cls)
+        clf.index = sparse.csr_matrix((state["data"], state["indices"], state["indptr"]),
+                                      shape=tuple(state["shape"]))
+        clf.phrase_category = state["phrase_category"]
+        clf.phrase_sign = state["phrase_sign"]
+        clf.hierarchy = state["hierarchy"]
+        clf.l1_categories = state["l1"].tolist()
+        clf.l2_categories = state["l2"].tolist()
+        clf.exclude_weight = float(state["exclude_weight"])
+        clf.threshold = float(state["threshold"])
+        clf.vectorizer = HashingTfidf(n_features=len(state["doc_freq"]),
+                                      ngram_range=tuple(int(n) for n in state["ngram_range"]))
+        clf.vectorizer.doc_freq = state["doc_freq"]
+        clf.vectorizer.n_docs = int(state["n_docs"])
+        return clf
+    
+    def scores(self, texts):
+        """
+        L1 category scores for a batch: best prototype/include similarity
+        minus `exclude_weight` × best exclude similarity.
+        
+        Returns:
+            np.ndarray: (len(texts) × len(l1_categories)) float scores
+        """
+        X = self.vectorizer.transform(texts)
+        similarity = (X @ self.index.T).toarray()   # the one multiply per batch
+        
+        n = len(self.l1_categories)
+        scores = np.zeros((similarity.shape[0], n))
+        for sign, weight in ((1, 1.0), (-1, -self.exclude_weight)):
+            rows = np.flatnonzero(self.phrase_sign == sign)
+            if rows.size == 0:
+                continue
+            owners = self.phrase_category[rows]
+            starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+            best = np.maximum.reduceat(similarity[:, rows], starts, axis=1)
+            scores[:, owners[starts]] += weight * best
+        return scores
+    
+    def predict(self, texts, threshold=None, top_k_fallback=True):
+        """
+        Multi-hot L1 and L2 labels for a batch.
+        
+        Args:
+            texts (list | pd.Series): Feedback strings
+            threshold (float): Score needed for an L1 label (default: self.threshold)
+            top_k_fallback (bool): Give every non-empty text its best L1
+                category when none clears the threshold
+        
+        Returns:
+            tuple: (L1 bool matrix, L2 bool matrix), columns in
+                `l1_categories` / `l2_categories` order
+        """
+        threshold = self.threshold if threshold is None else threshold
+        scores = self.scores(texts)
+        l1 = scores >= threshold
+        if top_k_fallback:
+            empty = ~l1.any(axis=1) & (scores.max(axis=1) > 0)
+            l1[empty, scores[empty].argmax(axis=1)] = True
+        l2 = (l1.astype(np.int32) @ self.hierarchy.astype(np.int32)) > 0
+        return l1, l2
+    
+    def to_labels(self, ids, l1, l2):
+        """Long (id, category) frame in the manual_labels.csv layout."""
+        ids = np.asarray(ids)
+        names = np.array(self.l1_categories + self.l2_categories)
+        rows, columns = np.nonzero(np.hstack([l1, l2]))
+        return pd.DataFrame({"id": ids[rows], "category": names[columns]})
@@ -0,0 +1,69 @@
+"""
+Tests for MinHash/LSH near-duplicate detection.
+
+Run from communik8_nlp/src/:
+    python -m pytest -q
+"""
+
+import numpy as np
+import pandas as pd
+
+from dedup import char_shingles, drop_near_duplicates, duplicate_clusters, lsh_bands, minhash_signatures
+from text_pipeline import normalize
+
+
+TEMPLATE = "I was charged twice in one month and got a debt collector's letter when I refused to pay the bill."
+OTHER = "Coverage in my area is rubbish. I can't make or receive calls and mobile internet is patchy."
+
+
+def _jaccard(a, b, k=5):
+    a, b = normalize([a, b])
+    a = {a[i:i + k] for i in range(len(a) - k + 1)}
+    b = {b[i:i + k] for i in range(len(b) - k + 1)}
+    return len(a & b) / len(a | b)
+
+
+def test_shingles_stay_inside_each_text():
+    docs, hashes = char_shingles(["abcdefg", "", "abcdefg"], k=5)
+    assert docs.tolist() == [0, 0, 0, 1, 2, 2, 2]
+    assert np.array_equal(hashes[:3], hashes[4:])
+
+
+def test_signature_agreement_estimates_jaccard():
+    edited = TEMPLATE.replace("twice", "three times")
+    signatures = minhash_signatures([TEMPLATE, edited, OTHER], num_perm=512)
+    assert abs((signatures[0] == signatures[1]).mean() - _jaccard(TEMPLATE, edited)) < 0.08
+    assert (signatures[0] == signatures[2]).mean() < 0.1
+
+
+def test_clusters_templated_messages():
+    texts = [TEMPLATE, OTHER, TEMPLATE + " Ref 1041.", TEMPLATE.upper(), OTHER + "!!", "Avoid at all costs!"]
+    labels = duplicate_clusters(minhash_signatures(texts), threshold=0.8)
+    assert labels.tolist() == [0, 1, 0, 0, 1, 5]
+    
+    bands, rows = lsh_bands(0.8)
+    assert bands * rows == 128
+    
+    frame = pd.DataFrame({"id": range(len(texts)), "customer_feedback": texts})
+    distinct = drop_near_duplicates(frame)
+    assert distinct["id"].tolist() == [0, 1, 5]
+    assert distinct["n_duplicates"].tolist() == [3, 2, 1]
+
+
+def test_bucket_members_are_verified_beyond_sort_neighbours():
+    # Band 0 is shared by all three rows; only A and B agree elsewhere,
+    # so A and B are duplicates and X sits between them in sort order
+    a = np.arange(16, dtype=np.uint32)
+    b = np.r_[a[:12], 100, 101, 102, 103].astype(np.uint32)
+    x = np.r_[a[:8], 200 + np.arange(8)].astype(np.uint32)
+    
+    assert duplicate_clusters(np.vstack([a, x, b]), threshold=0.7, bands=2).tolist() == [0, 1, 0]
+    # The bucket's first row is not a duplicate itself
+    assert duplicate_clusters(np.vstack([x, a, b]), threshold=0.7, bands=2).tolist() == [0, 1, 1]
+
+
+def test_large_buckets_pair_members_with_their_first_row():
+    import dedup
+    
+    signatures = np.tile(np.arange(16, dtype=np.uint32), (dedup._ALL_PAIRS_BUCKET + 8, 1))
+    assert (duplicate_clusters(signatures, threshold=0.9, bands=2) == 0).all()
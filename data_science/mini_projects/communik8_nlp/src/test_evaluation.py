@@ -0,0 +1,93 @@
+"""
+Tests for the multi-hot evaluation helpers.
+
+Run from communik8_nlp/src/:
+    python -m pytest -q
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from evaluation import (confusion, encode_labels, evaluate, hierarchy_consistency,
+                        load_labels, per_category, summary, threshold_sweep)
+
+
+CATEGORIES = ["billing", "delivery", "policy_terms"]
+HIERARCHY = np.array([[True], [False]])   # billing -> policy_terms
+
+
+def test_encode_labels_aligns_ids_and_categories():
+    labels = pd.DataFrame({"id": [2, 1, 1, 1, 9],
+                           "category": ["delivery", "billing", "policy_terms", "billing", "delivery"]})
+    encoded = encode_labels(labels, [1, 2, 3], CATEGORIES).toarray()
+    assert encoded.tolist() == [[1, 0, 1], [0, 1, 0], [0, 0, 0]]
+    
+    with pytest.raises(ValueError, match="Unknown categories"):
+        encode_labels(pd.DataFrame({"id": [1], "category": ["roaming"]}), [1], CATEGORIES)
+
+
+def test_manual_labels_cover_known_ids():
+    labels = load_labels()
+    assert {"id", "category"} <= set(labels.columns)
+    encoded = encode_labels(labels, sorted(labels["id"].unique()), sorted(labels["category"].unique()))
+    assert encoded.sum() == len(labels.drop_duplicates())
+
+
+def test_metrics_and_consistency():
+    gold = np.array([[1, 0, 1], [0, 1, 0], [1, 0, 0]])
+    pred = np.array([[1, 0, 1], [1, 1, 0], [0, 0, 1]])
+    
+    table = per_category(gold, pred, CATEGORIES)
+    assert table.loc["billing", ["tp", "predicted", "support"]].tolist() == [1, 2, 2]
+    assert table.loc["delivery", "f1"] == 1.0
+    
+    scores = summary(gold, pred)
+    assert scores["micro_precision"] == pytest.approx(3 / 5)
+    assert scores["micro_recall"] == pytest.approx(3 / 4)
+    assert scores["exact_match"] == pytest.approx(1 / 3)
+    
+    matrix = confusion(gold, pred, CATEGORIES)
+    assert matrix.loc["delivery", "billing"] == 1
+    assert np.array_equal(np.diag(matrix), table["tp"])
+    
+    # pred row 1 has billing without policy_terms; row 2 has an orphan policy_terms
+    consistency = hierarchy_consistency(pred, HIERARCHY)
+    assert consistency["missing"].tolist() == [1]
+    assert consistency["orphan"].tolist() == [1]
+    assert consistency["consistent_rate"] == pytest.approx(1 / 3)
+    assert set(evaluate(gold, pred, CATEGORIES, HIERARCHY)) >= {"per_category", "consistency"}
+
+
+def test_threshold_sweep_matches_direct_evaluation():
+    rng = np.random.default_rng(0)
+    scores = rng.random((500, 4))
+    gold = rng.random((500, 4)) < scores
+    thresholds = np.linspace(0, 1, 11)
+    
+    sweep = threshold_sweep(scores, gold, thresholds)
+    assert sweep["f1"].shape == (11, 4)
+    for i, threshold in enumerate(thresholds):
+        pred = scores >= threshold
+        assert np.allclose(sweep["f1"][i], per_category(gold, pred, range(4))["f1"])
+        assert sweep["micro_f1"][i] == pytest.approx(summary(gold, pred)["micro_f1"])
+
+
+def test_readme_sweep_on_manual_labels(tmp_path):
+    from dedup import drop_near_duplicates
+    from taxonomy_classifier import TaxonomyClassifier
+    
+    # Shared copy of the feedback the manual labels were written against
+    feedback_path = Path(__file__).resolve().parents[3] / "datasets" / "custom" / "customer_feedback.csv"
+    feedback = drop_near_duplicates(pd.read_csv(feedback_path), threshold=0.8)
+    clf = TaxonomyClassifier.from_taxonomy(artifacts_dir=tmp_path)
+    
+    gold = encode_labels(load_labels(), feedback["id"], clf.l1_categories + clf.l2_categories)
+    gold_l1 = gold[:, :len(clf.l1_categories)]
+    sweep = threshold_sweep(clf.scores(feedback["customer_feedback"]), gold_l1, np.linspace(0, 1, 11))
+    
+    assert sweep["f1"].shape == (11, len(clf.l1_categories))
+    assert gold_l1.sum() > 0
+    assert 0 < sweep["micro_f1"].max() <= 1
@@ -0,0 +1,62 @@
+"""
+Tests for the prototype-index taxonomy classifier.
+
+Run from communik8_nlp/src/:
+    python -m pytest -q
+"""
+
+import json
+
+import numpy as np
+
+from taxonomy_classifier import INDEX_NAME, TAXONOMY_PATH, TaxonomyClassifier, l2_ancestors
+
+
+TAXONOMY = json.loads(TAXONOMY_PATH.read_text())
+
+FEEDBACK = [
+    "I waited 45 minutes for my call to be answered and the customer service was useless",
+    "Coverage in my area is rubbish, no signal and the mobile internet is patchy",
+    "I was charged twice in one month on my bill",
+]
+
+
+def test_l2_parents_are_resolved_through_l1_parents():
+    ancestors = l2_ancestors(TAXONOMY["categories"])
+    # store_experience -> customer_service -> communication_failures
+    assert "communication_failures" in ancestors["store_experience"]
+    assert all(TAXONOMY["categories"][p]["level"] == "L2"
+               for parents in ancestors.values() for p in parents)
+
+
+def test_predicts_l1_with_parent_l2():
+    clf = TaxonomyClassifier(TAXONOMY)
+    l1, l2 = clf.predict(FEEDBACK)
+    assert l1.shape == (3, len(clf.l1_categories))
+    assert l2.shape == (3, len(clf.l2_categories))
+    
+    labels = clf.to_labels([10, 11, 12], l1, l2)
+    by_id = labels.groupby("id")["category"].apply(set)
+    assert {"customer_service", "communication_failures"} <= by_id[10]
+    assert {"coverage", "network_infrastructure"} <= by_id[11]
+    assert "billing" in by_id[12]
+    # Every predicted L1 brings its L2 mechanisms along
+    assert np.array_equal(l2, (l1.astype(int) @ clf.hierarchy.astype(int)) > 0)
+
+
+def test_index_is_cached_and_rebuilt_on_change(tmp_path):
+    taxonomy_path = tmp_path / "taxonomy.json"
+    taxonomy_path.write_text(json.dumps(TAXONOMY))
+    artifacts = tmp_path / "artifacts"
+    
+    built = TaxonomyClassifier.from_taxonomy(taxonomy_path, artifacts)
+    cached = TaxonomyClassifier.from_taxonomy(taxonomy_path, artifacts)
+    assert (artifacts / INDEX_NAME).exists()
+    assert np.allclose(built.scores(FEEDBACK), cached.scores(FEEDBACK))
+    assert cached.l1_categories == built.l1_categories
+    
+    changed = json.loads(json.dumps(TAXONOMY))
+    changed["categories"]["billing"]["prototypes"].append("overcharged on roaming fees")
+    taxonomy_path.write_text(json.dumps(changed))
+    rebuilt = TaxonomyClassifier.from_taxonomy(taxonomy_path, artifacts)
+    assert rebuilt.index.shape[0] == built.index.shape[0] + 1
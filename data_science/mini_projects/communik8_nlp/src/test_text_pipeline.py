@@ -0,0 +1,58 @@
+"""
+Tests for the streaming text pipeline.
+
+Run from communik8_nlp/src/:
+    python -m pytest -q
+"""
+
+import numpy as np
+import pandas as pd
+
+from text_pipeline import HashingTfidf, normalize, tokenize
+
+
+FEEDBACK = [
+    "Communik8 is the worst – I waited 45 minutes and customer service was useless!",
+    "My handset took two weeks to arrive, not the promised 48 hours.",
+    "I can’t make calls; coverage is rubbish.",
+    None,
+]
+
+
+def test_normalize_and_tokenize_batch():
+    texts = normalize(FEEDBACK)
+    assert texts[2] == "i can't make calls coverage is rubbish"
+    assert texts[3] == ""
+    
+    tokens = tokenize(texts, stopwords={"i", "is"})
+    assert tokens["doc"].is_monotonic_increasing
+    assert tokens[tokens["doc"] == 2]["token"].tolist() == ["can't", "make", "calls", "coverage", "rubbish"]
+    assert 3 not in set(tokens["doc"])
+
+
+def test_streamed_fit_matches_single_batch(tmp_path):
+    path = tmp_path / "feedback.csv"
+    pd.DataFrame({"id": range(40), "customer_feedback": FEEDBACK * 10}).to_csv(path, index=False)
+    
+    streamed = HashingTfidf(n_features=2 ** 12, ngram_range=(1, 2))
+    chunks = [X for _, X in streamed.fit_transform_stream(path, chunksize=7)]
+    whole = HashingTfidf(n_features=2 ** 12, ngram_range=(1, 2)).partial_fit(FEEDBACK * 10)
+    
+    assert streamed.n_docs == 40
+    assert np.array_equal(streamed.doc_freq, whole.doc_freq)
+    assert [X.shape[0] for X in chunks] == [7, 7, 7, 7, 7, 5]
+    
+    X = whole.transform(FEEDBACK)
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    assert np.allclose(norms, [1, 1, 1, 0])
+    # Identical texts get identical rows
+    assert (whole.transform(FEEDBACK[:1]) != X[:1]).nnz == 0
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model = HashingTfidf(n_features=2 ** 10).partial_fit(FEEDBACK)
+    model.save(tmp_path / "tfidf.npz")
+    restored = HashingTfidf.load(tmp_path / "tfidf.npz")
+    
+    assert restored.n_docs == 4
+    assert (restored.transform(FEEDBACK) != model.transform(FEEDBACK)).nnz == 0
@@ -0,0 +1,221 @@
+"""
+Streaming text pipeline for Communik8 customer feedback.
+
+Feedback is read in fixed-size chunks and each chunk is processed as a
+batch: normalization and tokenization run as Arrow-backed pandas string
+operations, and tokens are hashed straight into a fixed number of sparse
+feature columns (the "hashing trick"), so there is no vocabulary dict and
+memory stays flat however many rows stream through. Document frequencies
+for TF-IDF are a fixed-size count array updated batch by batch.
+
+Example:
+    from text_pipeline import HashingTfidf, iter_feedback
+    
+    tfidf = HashingTfidf()
+    for chunk in iter_feedback("../data/feedback.csv"):
+        tfidf.partial_fit(chunk["customer_feedback"])
+    for chunk in iter_feedback("../data/feedback.csv"):
+        X = tfidf.transform(chunk["customer_feedback"])   # scipy CSR, one row per doc
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# Typographic characters seen in feedback exports, mapped to ASCII
+_TRANSLATE = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2013": " ", "\u2014": " ", "\u00a0": " ",
+})
+
+# Multiplier mixing two token hashes into one bigram hash (64-bit golden ratio)
+_BIGRAM_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def iter_feedback(path, text_column="customer_feedback", chunksize=100_000, **read_csv_kwargs):
+    """
+    Read a feedback CSV in chunks of at most `chunksize` rows.
+    
+    Args:
+        path (str | Path): CSV file (e.g. datasets/custom/customer_feedback.csv)
+        text_column (str): Column holding the feedback text
+        chunksize (int): Rows per chunk
+        **read_csv_kwargs: Passed to `pd.read_csv`
+    
+    Yields:
+        pd.DataFrame: Successive chunks with `text_column` as strings
+    """
+    reader = pd.read_csv(path, chunksize=chunksize, dtype={text_column: "string"}, **read_csv_kwargs)
+    with reader:
+        yield from reader
+
+
+def normalize(texts):
+    """
+    Lower-case, ASCII-fold common punctuation and keep only letters, digits
+    and apostrophes, for a whole batch at once.
+    
+    Args:
+        texts (pd.Series | list): Raw feedback strings (missing -> "")
+    
+    Returns:
+        pd.Series: Normalized strings, one per input
+    """
+    texts = pd.Series(texts, dtype="string").fillna("")
+    return (texts.str.translate(_TRANSLATE)
+                 .str.lower()
+                 .str.replace(r"https?://\S+", " ", regex=True)
+                 .str.replace(r"[^a-z0-9']+", " ", regex=True)
+                 .str.replace(r"(?:^|\s)'+|'+(?:\s|$)", " ", regex=True)
+                 .str.strip())
+
+
+def tokenize(texts, stopwords=None):
+    """
+    Split normalized texts into a flat token table.
+    
+    Returns a long-format frame instead of per-document lists, so later
+    steps (hashing, n-grams, counting) stay vectorized.
+    
+    Args:
+        texts (pd.Series): Normalized strings (see `normalize`)
+        stopwords (set): Tokens to drop
+    
+    Returns:
+        pd.DataFrame: Columns `doc` (row position in the batch) and `token`,
+            in document then token order
+    """
+    tokens = texts.reset_index(drop=True).str.split().explode()
+    tokens = tokens[tokens.notna() & (tokens != "")]
+    frame = pd.DataFrame({"doc": tokens.index.to_numpy(), "token": tokens.to_numpy(dtype=object)})
+    if stopwords:
+        frame = frame[~frame["token"].isin(stopwords)]
+    return frame.reset_index(drop=True)
+
+
+def hash_tokens(tokens, ngram_range=(1, 1)):
+    """
+    64-bit hashes of each document's unigrams and (optionally) bigrams.
+    
+    Args:
+        tokens (pd.DataFrame): Output of `tokenize`
+        ngram_range (tuple): (1, 1) for unigrams, (1, 2) to add bigrams
+    
+    Returns:
+        tuple: (doc ids, uint64 hashes) as parallel arrays
+    """
+    docs = tokens["doc"].to_numpy()
+    hashes = pd.util.hash_array(tokens["token"].to_numpy(dtype=object))
+    if ngram_range[1] < 2:
+        return docs, hashes
+    
+    # Bigram = consecutive tokens within the same document
+    same_doc = docs[1:] == docs[:-1]
+    bigrams = (hashes[:-1] * _BIGRAM_MIX) ^ hashes[1:]
+    parts_docs, parts_hashes = [docs[:-1][same_doc]], [bigrams[same_doc]]
+    if ngram_range[0] <= 1:
+        parts_docs.insert(0, docs)
+        parts_hashes.insert(0, hashes)
+    return np.concatenate(parts_docs), np.concatenate(parts_hashes)
+
+
+class HashingTfidf:
+    """
+    TF-IDF over hashed features, fitted incrementally.
+    
+    Each token hash maps to one of `n_features` columns and a +/- sign (so
+    collisions tend to cancel rather than pile up). Document frequencies
+    live in a fixed `n_features` array, so `partial_fit` can run over any
+    number of chunks in constant memory.
+    """
+    
+    def __init__(self, n_features=2 ** 20, ngram_range=(1, 1), stopwords=None,
+                 sublinear_tf=True, norm="l2"):
+        """
+        Args:
+            n_features (int): Number of hashed columns
+            ngram_range (tuple): (1, 1) unigrams, (1, 2) adds bigrams
+            stopwords (set): Tokens to drop before hashing
+            sublinear_tf (bool): Use 1 + log(tf) instead of raw counts
+            norm (str): 'l2' to unit-normalize rows, or None
+        """
+        if norm not in ("l2", None):
+            raise ValueError(f"Unknown norm '{norm}'. Available: ['l2', None]")
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.stopwords = set(stopwords or ())
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+    
+    def _counts(self, texts):
+        """Signed hashed term counts for a batch, as CSR (docs × n_features)."""
+        texts = normalize(texts)
+        docs, hashes = hash_tokens(tokenize(texts, self.stopwords), self.ngram_range)
+        columns = (hashes % np.uint64(self.n_features)).astype(np.int64)
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+        counts = sparse.csr_matrix((signs, (docs, columns)), shape=(len(texts), self.n_features))
+        counts.sum_duplicates()
+        return counts
+    
+    def partial_fit(self, texts):
+        """Update document frequencies with one batch; returns self."""
+        counts = self._counts(texts)
+        counts.data[:] = 1
+        counts.eliminate_zeros()
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+        return self
+    
+    @property
+    def idf_(self):
+        """Smoothed inverse document frequency per hashed column."""
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+    
+    def transform(self, texts):
+        """
+        TF-IDF features for a batch with the frequencies fitted so far.
+        
+        Returns:
+            scipy.sparse.csr_matrix: (len(texts) × n_features)
+        """
+        counts = self._counts(texts)
+        values = np.abs(counts.data)
+        if self.sublinear_tf:
+            values = 1 + np.log(values, where=values > 0, out=np.zeros_like(values))
+        counts.data = np.sign(counts.data) * values * self.idf_[counts.indices]
+        
+        if self.norm == "l2":
+            norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            counts = sparse.diags(1 / norms) @ counts
+        return counts.tocsr()
+    
+    def fit_transform_stream(self, path, text_column="customer_feedback", chunksize=100_000):
+        """
+        Two streaming passes over a CSV: fit frequencies, then yield features.
+        
+        Yields:
+            tuple: (chunk DataFrame, CSR features for that chunk)
+        """
+        for chunk in iter_feedback(path, text_column, chunksize):
+            self.partial_fit(chunk[text_column])
+        for chunk in iter_feedback(path, text_column, chunksize):
+            yield chunk, self.transform(chunk[text_column])
+    
+    def save(self, path):
+        """Persist fitted frequencies (e.g. to artifacts/tfidf_state.npz)."""
+        np.savez_compressed(path, doc_freq=self.doc_freq, n_docs=self.n_docs,
+                            ngram_range=np.array(self.ngram_range))
+    
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Restore a fitted instance saved with `save`."""
+        state = np.load(path)
+        model = cls(n_features=len(state["doc_freq"]),
+                    ngram_range=tuple(int(n) for n in state["ngram_range"]), **kwargs)
+        model.doc_freq = state["doc_freq"]
+        model.n_docs = int(state["n_docs"])
+        return model
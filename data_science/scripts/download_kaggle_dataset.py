@@ -1,42 +1,304 @@
 #!/usr/bin/env python3
 """
-Download Kaggle datasets to the raw data folder
+Download Kaggle datasets from the DATASETS registry to the raw data folder
+
+Files are fetched over HTTP in streamed chunks. An interrupted transfer
+leaves a `.part` file that the next run resumes with a Range request, so
+only the missing bytes are downloaded. Completed files are checked
+against the server's MD5 (or size when no hash is sent) before they are
+kept, files already in the cache or raw folder are skipped, and several
+datasets sync concurrently.
+
+Usage:
+    python download_kaggle_dataset.py                  # every registry dataset
+    python download_kaggle_dataset.py who_cases pjm_energy --workers 4
+    python download_kaggle_dataset.py --list
 """
-import kagglehub
-import shutil
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_utils import DATASETS, Manifest, ensure_datasets, list_datasets
+
+KAGGLE_API = "https://www.kaggle.com/api/v1"
+
+# Cache of fully downloaded, verified files (per dataset), outside the repo
+DEFAULT_CACHE_DIR = Path(os.environ.get("KAGGLE_FILE_CACHE", Path.home() / ".cache" / "kaggle-files"))
+
+
+def kaggle_credentials():
+    """(username, key) from $KAGGLE_USERNAME/$KAGGLE_KEY or ~/.kaggle/kaggle.json."""
+    if os.environ.get("KAGGLE_USERNAME") and os.environ.get("KAGGLE_KEY"):
+        return os.environ["KAGGLE_USERNAME"], os.environ["KAGGLE_KEY"]
+    
+    config = Path(os.environ.get("KAGGLE_CONFIG_DIR", Path.home() / ".kaggle")) / "kaggle.json"
+    try:
+        token = json.loads(config.read_text())
+    except (OSError, ValueError):
+        raise RuntimeError(
+            f"No Kaggle credentials: set KAGGLE_USERNAME/KAGGLE_KEY or create {config}"
+        ) from None
+    return token["username"], token["key"]
+
+
+class Progress:
+    """Aggregate bytes/throughput line shared by concurrent transfers."""
+    
+    def __init__(self, interval=0.5, stream=sys.stdout):
+        self.interval = interval
+        self.stream = stream
+        self.total = 0
+        self.done = 0
+        self.resumed = 0
+        self.active = {}
+        self.started = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+    
+    def start(self, name, size, offset=0):
+        with self._lock:
+            self.active[name] = True
+            self.total += size
+            self.done += offset
+            self.resumed += offset
+    
+    def update(self, nbytes):
+        with self._lock:
+            self.done += nbytes
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self._render(now)
+    
+    def finish(self, name):
+        with self._lock:
+            self.active.pop(name, None)
+            self._render(time.monotonic())
+            if not self.active:
+                self.stream.write("\n")
+    
+    def _render(self, now):
+        elapsed = max(now - self.started, 1e-6)
+        rate = (self.done - self.resumed) / elapsed
+        line = (f"\r   ⬇️  {self.done / 1e6:,.1f}/{self.total / 1e6:,.1f} MB "
+                f"@ {rate / 1e6:,.1f} MB/s, {len(self.active)} active")
+        self.stream.write(line.ljust(60))
+        self.stream.flush()
+
+
+def _expected_md5(response):
+    """MD5 digest from a `x-goog-hash: crc32c=...,md5=...` header, if present."""
+    for part in response.headers.get("x-goog-hash", "").split(","):
+        algorithm, _, value = part.strip().partition("=")
+        if algorithm == "md5":
+            return base64.b64decode(value).hex()
+    return None
+
+
+def _file_md5(path, chunk_size=1 << 20):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_zip(path):
+    """True when a file starts with the zip local-header magic."""
+    with open(path, "rb") as f:
+        return f.read(4) == b"PK\x03\x04"
+
+
+def _read_transfer(path):
+    """Transfer details saved beside a partial file, or {} if none."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+class ResumableDownloader:
+    """
+    Downloader for `ensure_datasets` that fetches registry files over HTTP.
+    
+    Each file is streamed in chunks to `<cache>/<file>.part`; a later run
+    continues from the partial size with a Range request. What the first
+    response said about the file (size, MD5, zipped) is kept beside it in
+    `<file>.part.json`, so a resumed or already-complete transfer is
+    verified and unpacked like an uninterrupted one. A finished file
+    is verified (MD5 from the server, else size) and recorded in the cache
+    folder's manifest, so it is never downloaded again unless forced.
+    """
+    
+    def __init__(self, files, cache_dir=DEFAULT_CACHE_DIR, chunk_size=1 << 20, workers=4,
+                 progress=None, session=None, base_url=KAGGLE_API, auth=None):
+        """
+        Args:
+            files (dict): kaggle_id -> registry file names to fetch
+            cache_dir (Path): Where verified files are kept
+            chunk_size (int): Bytes per streamed chunk
+            workers (int): Files transferred concurrently per dataset
+            progress (Progress): Shared progress display
+            session: requests-compatible session (default: new Session)
+            base_url (str): Kaggle API root
+            auth (tuple): (username, key) (default: kaggle_credentials())
+        """
+        import requests
+        
+        self.files = files
+        self.cache_dir = Path(cache_dir)
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.progress = progress or Progress()
+        self.session = session or requests.Session()
+        self.base_url = base_url.rstrip("/")
+        self.auth = auth
+    
+    def __call__(self, kaggle_id, force_download=False):
+        folder = self.cache_dir / kaggle_id.replace("/", "__")
+        folder.mkdir(parents=True, exist_ok=True)
+        manifest = Manifest.shared(folder)
+        if self.auth is None:
+            self.auth = kaggle_credentials()
+        
+        def fetch(name):
+            if force_download:
+                (folder / f"{name}.part").unlink(missing_ok=True)
+                (folder / f"{name}.part.json").unlink(missing_ok=True)
+            self.fetch(kaggle_id, name, folder)
+            manifest.record(name)
+        
+        outstanding = [name for name in self.files.get(kaggle_id, [])
+                       if force_download or not manifest.is_fresh(name)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for future in [executor.submit(fetch, name) for name in outstanding]:
+                future.result()
+        return str(folder)
+    
+    def url(self, kaggle_id, name):
+        return f"{self.base_url}/datasets/download/{kaggle_id}/{quote(name)}"
+    
+    def fetch(self, kaggle_id, name, folder):
+        """Download one file, resuming a partial transfer; returns its path."""
+        part = folder / f"{name}.part"
+        transfer_path = folder / f"{name}.part.json"
+        offset = part.stat().st_size if part.exists() else 0
+        transfer = _read_transfer(transfer_path) if offset else {}
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        
+        with self.session.get(self.url(kaggle_id, name), headers=headers, auth=self.auth,
+                              stream=True, timeout=60) as response:
+            if response.status_code == 416:
+                # Nothing left to fetch: the partial file is already complete.
+                # Without saved details, the zip magic tells whether to unpack.
+                size = transfer.get("size") or offset
+                expected_md5 = transfer.get("md5")
+                zipped = transfer["zipped"] if "zipped" in transfer \
+                    else _is_zip(part) and not name.endswith(".zip")
+            else:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    offset, transfer = 0, {}  # server ignored the Range; start over
+                length = int(response.headers.get("Content-Length", 0))
+                size = offset + length if length else transfer.get("size")
+                expected_md5 = _expected_md5(response) or transfer.get("md5")
+                disposition = response.headers.get("Content-Disposition", "").rstrip('"')
+                zipped = transfer.get("zipped", False) or \
+                    (disposition.endswith(".zip") and not name.endswith(".zip"))
+                transfer_path.write_text(json.dumps({"size": size, "md5": expected_md5, "zipped": zipped}))
+                
+                self.progress.start(name, size or 0, offset)
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+                        self.progress.update(len(chunk))
+                self.progress.finish(name)
+        
+        actual = part.stat().st_size
+        if size is not None and actual != size:
+            raise IOError(f"{name}: got {actual:,} of {size:,} bytes; re-run to resume")
+        if expected_md5 is not None and _file_md5(part) != expected_md5:
+            part.unlink()
+            transfer_path.unlink(missing_ok=True)
+            raise IOError(f"{name}: checksum mismatch, partial data discarded; re-run to retry")
+        
+        dest = folder / name
+        if zipped:
+            # Kaggle zips large single-file downloads
+            with zipfile.ZipFile(part) as archive:
+                member = next(m for m in archive.namelist() if Path(m).name == name)
+                tmp = folder / f".{name}.tmp"
+                with archive.open(member) as src, open(tmp, "wb") as out:
+                    while chunk := src.read(self.chunk_size):
+                        out.write(chunk)
+            os.replace(tmp, dest)
+            part.unlink()
+        else:
+            os.replace(part, dest)
+        transfer_path.unlink(missing_ok=True)
+        return dest
+
+
+def registry_files(dataset_keys):
+    """kaggle_id -> registry files needed for these keys (deduplicated)."""
+    files = {}
+    for key in dataset_keys:
+        info = DATASETS[key]
+        files.setdefault(info["kaggle_id"], {}).update(dict.fromkeys(info["files"]))
+    return {kaggle_id: list(names) for kaggle_id, names in files.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Download registry datasets with resumable, verified transfers"
+    )
+    parser.add_argument("keys", nargs="*", help="Dataset keys (default: all)")
+    parser.add_argument("--list", action="store_true", help="List registered datasets and exit")
+    parser.add_argument("--force", action="store_true", help="Re-download even if files match")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Datasets/files transferred concurrently (default: 4)")
+    parser.add_argument("--chunk-mb", type=float, default=1.0,
+                        help="Transfer chunk size in MB (default: 1)")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f"Verified download cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--zstd", type=int, metavar="LEVEL", default=None,
+                        help="Store raw files zstd-compressed at this level")
+    args = parser.parse_args()
+    
+    if args.list:
+        list_datasets()
+        return
+    
+    keys = args.keys or list(DATASETS)
+    unknown = [key for key in keys if key not in DATASETS]
+    if unknown:
+        parser.error(f"unknown dataset(s) {unknown}; see --list")
+    
+    downloader = ResumableDownloader(registry_files(keys), cache_dir=args.cache_dir,
+                                     chunk_size=int(args.chunk_mb * (1 << 20)),
+                                     workers=args.workers)
+    started = time.monotonic()
+    data_folder = ensure_datasets(keys, force_download=args.force, max_workers=args.workers,
+                                  downloader=downloader, zstd_level=args.zstd)
+    
+    print(f"\nFiles in {data_folder} ({time.monotonic() - started:.1f}s):")
+    for file in sorted(data_folder.glob("*")):
+        if file.is_file() and not file.name.startswith("."):
+            size_mb = file.stat().st_size / (1024 * 1024)
+            print(f"  - {file.name} ({size_mb:.2f} MB)")
+
 
-# Dataset to download
-DATASET_NAME = "niclowe/who-cases-dataset-and-wdi-country-population"
-
-# Target directory
-RAW_DATA_DIR = Path(__file__).parent.parent / "datasets" / "raw"
-RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
-
-print(f"Downloading dataset: {DATASET_NAME}")
-print(f"Target directory: {RAW_DATA_DIR.absolute()}")
-
-# Download dataset (kagglehub caches it)
-path = kagglehub.dataset_download(DATASET_NAME)
-print(f"\nDataset downloaded to cache: {path}")
-
-# Copy files to raw folder
-source_path = Path(path)
-if source_path.is_dir():
-    for file in source_path.iterdir():
-        if file.is_file():
-            dest_file = RAW_DATA_DIR / file.name
-            print(f"Copying: {file.name} -> {dest_file}")
-            shutil.copy2(file, dest_file)
-else:
-    # Single file
-    dest_file = RAW_DATA_DIR / source_path.name
-    print(f"Copying: {source_path.name} -> {dest_file}")
-    shutil.copy2(source_path, dest_file)
-
-print(f"\n✅ Dataset files copied to: {RAW_DATA_DIR.absolute()}")
-print("\nFiles in raw folder:")
-for file in sorted(RAW_DATA_DIR.glob("*")):
-    if file.is_file():
-        size_mb = file.stat().st_size / (1024 * 1024)
-        print(f"  - {file.name} ({size_mb:.2f} MB)")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,672 @@
+#!/usr/bin/env python3
+"""
+Tests for data_utils: dataset syncing and the manifest, the Parquet and
+Arrow caches, lazy scans, time-range reads, sampling, the catalog,
+compressed storage, background prefetch and resumable downloads.
+Uses a local fake in place of kagglehub, so no network access is needed.
+
+Run from data_science/:
+    python -m pytest test_data_utils.py -q
+"""
+
+import os
+import threading
+
+import pytest
+
+import data_utils
+from data_utils import DATASETS, ensure_dataset, ensure_datasets
+
+
+class FakeKaggle:
+    """Stand-in for kagglehub: serves registry files from a local cache folder."""
+    
+    def __init__(self, root, contents=None):
+        self.root = root
+        self.contents = contents or {}
+        self.calls = []
+        self.lock = threading.Lock()
+    
+    def __call__(self, kaggle_id, force_download=False):
+        with self.lock:
+            self.calls.append(kaggle_id)
+        cache = self.root / kaggle_id.replace("/", "__")
+        cache.mkdir(parents=True, exist_ok=True)
+        for key, info in DATASETS.items():
+            if info["kaggle_id"] == kaggle_id:
+                for name in info["files"]:
+                    path = cache / name
+                    if force_download or not path.exists():
+                        # Fresh inode, like a real re-download
+                        path.unlink(missing_ok=True)
+                        path.write_text(self.contents.get(name, f"source,{name}\n1,2\n"))
+        return str(cache)
+
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    folder = tmp_path / "raw"
+    monkeypatch.setattr(data_utils, "get_data_folder", lambda: folder)
+    return folder
+
+
+COVID_CSV = "date,state,cases\n2020-03-01,NY,1\n2020-03-02,NY,3\n2020-03-03,CA,5\n"
+
+
+@pytest.fixture
+def fake_kaggle(tmp_path):
+    return FakeKaggle(tmp_path / "cache", contents={"us_covid.csv": COVID_CSV})
+
+
+@pytest.fixture
+def fake_datasets(data_folder, fake_kaggle, monkeypatch):
+    """Route the loaders' `ensure_dataset` calls through `fake_kaggle`."""
+    monkeypatch.setattr(data_utils, "ensure_dataset",
+                        lambda key: ensure_dataset(key, downloader=fake_kaggle))
+    return fake_kaggle
+
+
+def test_ensure_dataset_places_only_registry_files(data_folder, fake_kaggle):
+    ensure_dataset("us_covid", downloader=fake_kaggle)
+    
+    placed = sorted(p.name for p in data_folder.iterdir() if not p.name.startswith("."))
+    assert placed == ["us_covid.csv"]
+    assert fake_kaggle.calls == ["konradb/tsdata-1"]
+
+
+def test_ensure_datasets_fetches_each_archive_once(data_folder, fake_kaggle):
+    keys = ["us_covid", "avocado", "energy", "who_cases", "pjm_hourly"]
+    ensure_datasets(keys, downloader=fake_kaggle)
+    
+    assert sorted(fake_kaggle.calls) == sorted({DATASETS[k]["kaggle_id"] for k in keys})
+    for key in keys:
+        for name in DATASETS[key]["files"]:
+            assert (data_folder / name).is_file()
+
+
+def test_ensure_datasets_skips_available(data_folder, fake_kaggle):
+    ensure_datasets(["passengers"], downloader=fake_kaggle)
+    ensure_datasets(["passengers"], downloader=fake_kaggle)
+    
+    assert fake_kaggle.calls == ["konradb/tsdata-1"]
+
+
+def test_ensure_datasets_rejects_unknown_keys(data_folder, fake_kaggle):
+    with pytest.raises(ValueError):
+        ensure_datasets(["us_covid", "not_a_dataset"], downloader=fake_kaggle)
+    assert fake_kaggle.calls == []
+
+
+def test_manifest_rematerializes_only_stale_files(data_folder, fake_kaggle):
+    ensure_datasets(["passengers"], downloader=fake_kaggle)
+    manifest = data_utils.Manifest(data_folder)
+    assert all(manifest.is_fresh(name) for name in DATASETS["passengers"]["files"])
+    
+    # A deleted file is stale; the untouched ones are not re-placed
+    (data_folder / "passengers.csv").unlink()
+    untouched = data_folder / "passengers_test.csv"
+    inode = untouched.stat().st_ino
+    ensure_datasets(["passengers"], downloader=fake_kaggle)
+    
+    assert (data_folder / "passengers.csv").exists()
+    assert untouched.stat().st_ino == inode
+    assert len(fake_kaggle.calls) == 2
+
+
+def test_manifest_detects_content_changes(data_folder, fake_kaggle):
+    ensure_datasets(["avocado"], downloader=fake_kaggle)
+    path = data_folder / "avocado.csv"
+    manifest = data_utils.Manifest(data_folder)
+    
+    # Touched but identical content stays fresh
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert manifest.is_fresh("avocado.csv")
+    
+    # Truncation is caught (on a private copy, so the fake cache stays intact)
+    data_utils.materialize_file(path, path, methods=("copy",))
+    with open(path, "r+") as f:
+        f.truncate(3)
+    assert not manifest.is_fresh("avocado.csv")
+    
+    ensure_datasets(["avocado"], downloader=fake_kaggle)
+    assert path.read_text().startswith("source,")
+    assert data_utils.Manifest(data_folder).is_fresh("avocado.csv")
+
+
+def test_materialize_file_hardlinks_when_possible(tmp_path):
+    src = tmp_path / "src.csv"
+    src.write_text("a,b\n1,2\n")
+    
+    assert data_utils.materialize_file(src, tmp_path / "dest.csv") == "hardlink"
+    assert (tmp_path / "dest.csv").stat().st_ino == src.stat().st_ino
+
+
+def test_materialize_file_falls_back_on_oserror(tmp_path, monkeypatch):
+    src = tmp_path / "src.csv"
+    src.write_text("a,b\n1,2\n")
+    def refuse(*args, **kwargs):
+        raise OSError("not supported here")
+    monkeypatch.setattr(data_utils.os, "link", refuse)
+    monkeypatch.setattr(data_utils, "_reflink", refuse)
+    
+    assert data_utils.materialize_file(src, tmp_path / "linked.csv") == "symlink"
+    assert (tmp_path / "linked.csv").resolve() == src
+    
+    monkeypatch.setattr(data_utils.Path, "symlink_to", refuse)
+    assert data_utils.materialize_file(src, tmp_path / "copied.csv") == "copy"
+    copied = tmp_path / "copied.csv"
+    assert not copied.is_symlink() and copied.stat().st_ino != src.stat().st_ino
+    assert copied.read_text() == src.read_text()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["copied.csv", "linked.csv", "src.csv"]
+
+
+def test_manifest_records_the_method_used(data_folder, fake_kaggle, monkeypatch):
+    ensure_datasets(["avocado"], downloader=fake_kaggle)
+    manifest = data_utils.Manifest(data_folder)
+    assert manifest.entries["avocado.csv"]["method"] == "hardlink"
+    
+    def refuse(*args, **kwargs):
+        raise OSError("cross-device link")
+    monkeypatch.setattr(data_utils.os, "link", refuse)
+    monkeypatch.setattr(data_utils, "_reflink", refuse)
+    (data_folder / "avocado.csv").unlink()
+    ensure_datasets(["avocado"], downloader=fake_kaggle)
+    assert data_utils.Manifest(data_folder).entries["avocado.csv"]["method"] == "symlink"
+    
+    # A content-preserving refresh keeps the recorded method
+    path = data_folder / "avocado.csv"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    manifest = data_utils.Manifest(data_folder)
+    assert manifest.is_fresh("avocado.csv")
+    assert manifest.entries["avocado.csv"]["method"] == "symlink"
+
+
+def test_load_dataset_converts_once_to_parquet(fake_datasets, monkeypatch):
+    df = data_utils.load_dataset("us_covid", "us_covid.csv")
+    assert str(df["date"].dtype).startswith("datetime64")
+    assert df["cases"].tolist() == [1, 3, 5]
+    
+    processed = list(data_utils.get_processed_folder().glob("us_covid.csv.*.parquet"))
+    assert len(processed) == 1
+    
+    # Second load must come from Parquet, not the raw CSV
+    def fail(path):
+        raise AssertionError("raw file re-parsed")
+    monkeypatch.setattr(data_utils, "_read_raw", fail)
+    again = data_utils.load_dataset("us_covid", "us_covid.csv")
+    assert again.equals(df)
+
+
+def test_load_dataset_reconverts_when_source_changes(fake_datasets):
+    data_utils.load_dataset("us_covid", "us_covid.csv")
+    
+    fake_datasets.contents["us_covid.csv"] = COVID_CSV + "2020-03-04,CA,8\n"
+    ensure_dataset("us_covid", force_download=True, downloader=fake_datasets)
+    df = data_utils.load_dataset("us_covid", "us_covid.csv")
+    
+    assert len(df) == 4
+    assert len(list(data_utils.get_processed_folder().glob("us_covid.csv.*.parquet"))) == 1
+
+
+def test_processed_copies_are_keyed_by_full_file_name(fake_datasets, monkeypatch):
+    # Same stem, different formats; the Excel copy is CSV text read as CSV here
+    fake_datasets.contents["irish_electricity_daily.csv"] = "day,load\n1,10\n2,20\n"
+    fake_datasets.contents["irish_electricity_daily.xlsx"] = "day,load\n1,30\n"
+    monkeypatch.setitem(data_utils.RAW_READERS, ".xlsx", "read_csv")
+    
+    csv = data_utils.load_dataset("irish_electricity", "irish_electricity_daily.csv")
+    xlsx = data_utils.load_dataset("irish_electricity", "irish_electricity_daily.xlsx")
+    processed = sorted(p.name.split(".")[1] for p in data_utils.get_processed_folder().iterdir()
+                       if p.name.startswith("irish_electricity_daily."))
+    assert processed == ["csv", "xlsx"]
+    
+    # Loading one does not evict the other, so neither is converted again
+    def fail(path):
+        raise AssertionError("raw file re-parsed")
+    monkeypatch.setattr(data_utils, "_read_raw", fail)
+    assert data_utils.load_dataset("irish_electricity", "irish_electricity_daily.csv").equals(csv)
+    assert data_utils.load_dataset("irish_electricity", "irish_electricity_daily.xlsx").equals(xlsx)
+
+
+def test_load_table_is_memory_mapped(fake_datasets):
+    import pyarrow as pa
+    
+    hours = 20_000
+    rows = "".join(f"2002-01-01 00:00:00,{30000 + i % 5000}.0\n" for i in range(hours))
+    fake_datasets.contents["PJME_hourly.csv"] = "Datetime,PJME_MW\n" + rows
+    data_utils.load_table("pjm_energy", "PJME_hourly.csv")
+    
+    before = pa.total_allocated_bytes()
+    table = data_utils.load_table("pjm_energy", "PJME_hourly.csv", columns=["PJME_MW"])
+    allocated = pa.total_allocated_bytes() - before
+    
+    # Buffers point into the mapped file rather than freshly allocated memory
+    assert table.num_rows == hours
+    assert allocated < table.nbytes / 100
+    assert table.column("PJME_MW")[1].as_py() == 30001.0
+
+
+def test_scan_dataset_pushes_down_filters(fake_datasets):
+    import polars as pl
+    import pyarrow.compute as pc
+    
+    ny = (data_utils.scan_dataset("us_covid", "us_covid.csv")
+          .filter(pl.col("state") == "NY")
+          .select("cases")
+          .collect())
+    assert ny["cases"].to_list() == [1, 3]
+    
+    batches = list(data_utils.iter_batches("us_covid", "us_covid.csv", columns=["cases"],
+                                           filter=pc.field("cases") > 1, batch_size=1))
+    assert [batch.num_rows for batch in batches] == [1, 1]
+    assert [batch.column_names for batch in batches] == [["cases"], ["cases"]]
+    
+    with pytest.raises(ValueError):
+        data_utils.scan_dataset("us_covid", "us_covid.csv", backend="duckdb")
+
+
+def test_first_scan_streams_the_csv(fake_datasets, monkeypatch):
+    import polars as pl
+    
+    # Blocks of a few rows each, and no full read of the raw file
+    monkeypatch.setattr(data_utils, "CSV_BLOCK_SIZE", 64)
+    def fail(path):
+        raise AssertionError("raw file read whole")
+    monkeypatch.setattr(data_utils, "_read_raw", fail)
+    fake_datasets.contents["us_covid.csv"] = COVID_CSV + "".join(
+        f"2020-04-{day:02d},TX,{day}\n" for day in range(1, 21))
+    
+    df = data_utils.scan_dataset("us_covid", "us_covid.csv").collect()
+    assert df.height == 23
+    assert isinstance(df.schema["date"], pl.Datetime)
+    assert df["cases"].to_list()[:4] == [1, 3, 5, 1]
+    
+    # Loads share the copy the scan wrote
+    assert str(data_utils.load_dataset("us_covid", "us_covid.csv")["date"].dtype).startswith("datetime64")
+
+
+def test_first_conversion_falls_back_when_later_blocks_change_type(fake_datasets, monkeypatch):
+    monkeypatch.setattr(data_utils, "CSV_BLOCK_SIZE", 64)
+    fake_datasets.contents["us_covid.csv"] = COVID_CSV + "".join(
+        f"2020-04-{day:02d},TX,{day}\n" for day in range(1, 21)) + "2020-05-01,TX,unknown\n"
+    
+    df = data_utils.load_dataset("us_covid", "us_covid.csv")
+    assert len(df) == 24
+    assert df["cases"].iloc[-1] == "unknown"
+    assert not list(data_utils.get_processed_folder().glob(".*.tmp"))
+
+
+def test_load_dataset_applies_registry_schema(fake_datasets, monkeypatch):
+    schema = {"datetime": ["date"], "categorical": ["state"],
+              "dtypes": {"cases": "uint8"}, "index": "date"}
+    monkeypatch.setitem(DATASETS, "us_covid", dict(DATASETS["us_covid"], schemas={"us_covid.csv": schema}))
+    
+    df = data_utils.load_dataset("us_covid", "us_covid.csv")
+    assert str(df.index.dtype).startswith("datetime64")
+    assert df["state"].dtype == "category"
+    assert df["cases"].dtype == "uint8"
+    
+    # Aliases sharing the archive pick up the same schema
+    assert data_utils.get_schema("tsdata", "us_covid.csv") == schema
+
+
+def test_infer_schema_proposes_narrowest_types():
+    import pandas as pd
+    
+    df = pd.DataFrame({
+        "Datetime": pd.date_range("2020-01-01", periods=6, freq="h").astype(str),
+        "load": [30000.0, 30001.0, 29999.5, 31000.0, 30500.25, 30100.0],
+        "store": [1, 2, 3, 1, 2, 3],
+        "delta": [-1, 0, 300, 2, 5, 7],
+        "region": ["east", "west", "east", "east", "west", "east"],
+        "note": list("abcdef"),
+    })
+    schema = data_utils.infer_schema(df)
+    
+    assert schema == {
+        "datetime": ["Datetime"],
+        "categorical": ["region"],
+        "dtypes": {"load": "float32", "store": "uint8", "delta": "int16"},
+        "index": "Datetime",
+    }
+    narrowed = data_utils.apply_schema(df.copy(), schema)
+    assert narrowed["load"].tolist() == df["load"].tolist()
+    assert narrowed["delta"].tolist() == df["delta"].tolist()
+
+
+def test_only_numeric_dates_are_parsed():
+    import pandas as pd
+    
+    df = pd.DataFrame({
+        "day": ["2020-03-01", "2020-03-02"],
+        "stamp": ["01/03/2020 13:00", "02/03/2020 14:30"],
+        "month": ["March", "April"],
+        "weekday": ["Mon", "Tue"],
+        "code": ["1001", "1002"],
+    })
+    parsed = data_utils._parse_datetime_columns(df.copy())
+    
+    assert str(parsed["day"].dtype).startswith("datetime64")
+    assert str(parsed["stamp"].dtype).startswith("datetime64")
+    for column in ["month", "weekday", "code"]:
+        assert parsed[column].tolist() == df[column].tolist()
+
+
+def test_loading_a_fresh_file_does_not_resync(fake_datasets, capsys):
+    data_utils.load_dataset("us_covid", "us_covid.csv")
+    capsys.readouterr()
+    
+    data_utils.load_dataset("us_covid", "us_covid.csv")
+    assert capsys.readouterr().out == ""
+    assert fake_datasets.calls == ["konradb/tsdata-1"]
+
+
+def test_load_range_reads_only_overlapping_row_groups(fake_datasets, monkeypatch):
+    import pandas as pd
+    import pyarrow.parquet as pq
+    
+    # Hourly series written newest-first, as in the PJM archive
+    times = pd.date_range("2015-01-01", periods=5_000, freq="h")[::-1]
+    rows = "".join(f"{t},{i}.0\n" for i, t in enumerate(times))
+    fake_datasets.contents["PJME_hourly.csv"] = "Datetime,PJME_MW\n" + rows
+    monkeypatch.setattr(data_utils, "TIME_ROW_GROUP_SIZE", 500)
+    
+    df = data_utils.load_range("pjm_energy", "PJME_hourly.csv", "2015-02-01", "2015-02-03")
+    full = data_utils.load_dataset("pjm_energy", "PJME_hourly.csv").sort_index()
+    assert df.index.is_monotonic_increasing
+    assert df.equals(full.loc["2015-02-01":"2015-02-02 23:00"])
+    assert len(df) == 48
+    
+    path, column = data_utils._ensure_time_sorted("pjm_energy", "PJME_hourly.csv")
+    parquet_file = pq.ParquetFile(path)
+    groups = data_utils._overlapping_row_groups(parquet_file, column,
+                                                pd.Timestamp("2015-02-01"), pd.Timestamp("2015-02-03"))
+    assert parquet_file.metadata.num_row_groups == 10
+    assert groups == [1]
+
+
+def test_hyperloglog_estimates_distinct_counts():
+    import numpy as np
+    import pandas as pd
+    
+    values = np.random.default_rng(0).integers(0, 50_000, size=200_000)
+    sketch = data_utils.HyperLogLog()
+    for chunk in np.array_split(values, 7):
+        sketch.add_hashes(pd.util.hash_array(chunk))
+    
+    exact = len(np.unique(values))
+    assert abs(sketch.estimate() - exact) / exact < 0.05
+    
+    small = data_utils.HyperLogLog()
+    small.add_hashes(pd.util.hash_array(np.arange(10)))
+    assert small.estimate() == 10
+
+
+def test_build_catalog_profiles_once(fake_datasets, monkeypatch, capsys):
+    catalog = data_utils.build_catalog(["us_covid"])
+    profile = catalog["us_covid.csv"]
+    assert profile["rows"] == 3
+    assert profile["columns"]["cases"]["min"] == 1
+    assert profile["columns"]["cases"]["max"] == 5
+    assert profile["columns"]["state"]["distinct"] == 2
+    assert profile["time"] == {"column": "date", "start": "2020-03-01T00:00:00",
+                               "end": "2020-03-03T00:00:00"}
+    
+    # Unchanged files are not profiled again, and listing reads the cached file
+    def fail(*args, **kwargs):
+        raise AssertionError("file re-profiled")
+    monkeypatch.setattr(data_utils, "profile_file", fail)
+    assert data_utils.build_catalog(["us_covid"]) == catalog
+    
+    data_utils.list_datasets(detailed=True)
+    assert "us_covid.csv: 3 rows × 3 columns, 2020-03-01T00:00:00 → 2020-03-03T00:00:00" \
+        in capsys.readouterr().out
+
+
+def test_compressed_storage_is_read_transparently(data_folder, fake_datasets):
+    import pandas as pd
+    
+    ensure_datasets(["us_covid"], downloader=fake_datasets)
+    ensure_datasets(["us_covid"], downloader=fake_datasets, zstd_level=19)
+    
+    # The plain copy is replaced by the compressed one
+    assert not (data_folder / "us_covid.csv").exists()
+    assert (data_folder / "us_covid.csv.zst").read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+    
+    # Syncing without a level accepts the compressed copy as it is
+    ensure_datasets(["us_covid"], downloader=fake_datasets)
+    assert len(fake_datasets.calls) == 2
+    
+    with data_utils.open_raw("us_covid", "us_covid.csv") as f:
+        assert f.read().decode() == COVID_CSV
+    df = data_utils.load_dataset("us_covid", "us_covid.csv")
+    assert df["cases"].tolist() == [1, 3, 5]
+    assert isinstance(df["date"].iloc[0], pd.Timestamp)
+
+
+def test_load_sample_is_reproducible_and_stratified(fake_datasets, monkeypatch):
+    rows = "".join(f"{i},{'west' if i % 5 == 0 else 'east'}\n" for i in range(2_000))
+    fake_datasets.contents["avocado.csv"] = "id,region\n" + rows
+    
+    sample = data_utils.load_sample("avocado", "avocado.csv", n=100, seed=7,
+                                    stratify="region", batch_size=300)
+    assert sample["region"].value_counts().to_dict() == {"east": 80, "west": 20}
+    assert sample["id"].is_unique and sample["id"].is_monotonic_increasing
+    
+    other = data_utils.load_sample("avocado", "avocado.csv", frac=0.05, seed=8)
+    assert len(other) == 100
+    assert not other["id"].equals(sample["id"])
+    
+    # Same arguments come back from the cache with the same rows
+    def fail(*args, **kwargs):
+        raise AssertionError("sample re-drawn")
+    monkeypatch.setattr(data_utils, "_reservoir_sample", fail)
+    again = data_utils.load_sample("avocado", "avocado.csv", n=100, seed=7,
+                                   stratify="region", batch_size=300)
+    assert again.equals(sample)
+
+
+def test_load_sample_contiguous_window(fake_datasets, monkeypatch):
+    import pandas as pd
+    
+    times = pd.date_range("2015-01-01", periods=3_000, freq="h")[::-1]
+    rows = "".join(f"{t},{i}.0\n" for i, t in enumerate(times))
+    fake_datasets.contents["PJME_hourly.csv"] = "Datetime,PJME_MW\n" + rows
+    monkeypatch.setattr(data_utils, "TIME_ROW_GROUP_SIZE", 500)
+    
+    week = data_utils.load_sample("pjm_energy", "PJME_hourly.csv", n=24 * 7, seed=3, contiguous=True)
+    assert len(week) == 24 * 7
+    assert (week.index.to_series().diff().dropna() == pd.Timedelta("1h")).all()
+    
+    with pytest.raises(ValueError):
+        data_utils.load_sample("pjm_energy", "PJME_hourly.csv", n=10, frac=0.1)
+
+
+def test_prefetch_overlaps_and_later_loads_wait(fake_datasets, monkeypatch):
+    gate = threading.Event()
+    
+    def slow_download(kaggle_id, force_download=False):
+        gate.wait(5)
+        return fake_datasets(kaggle_id, force_download)
+    
+    reads = []
+    stream = data_utils._stream_csv_to_parquet
+    monkeypatch.setattr(data_utils, "_stream_csv_to_parquet",
+                        lambda raw, path: reads.append(raw) or stream(raw, path))
+    
+    job = data_utils.prefetch(["us_covid"], downloader=slow_download)
+    assert not job.done()
+    assert "us_covid: downloading" in repr(job) or "us_covid: queued" in repr(job)
+    
+    # The load blocks on the outstanding download instead of starting its own
+    threading.Timer(0.2, gate.set).start()
+    df = data_utils.load_dataset("us_covid", "us_covid.csv")
+    
+    assert df["cases"].tolist() == [1, 3, 5]
+    assert job.wait(5)
+    assert job.state == {"us_covid": "ready"}
+    assert fake_datasets.calls == ["konradb/tsdata-1"]
+    assert len(reads) == 1
+
+
+def test_concurrent_writers_of_one_target_use_separate_temp_files(tmp_path):
+    import pandas as pd
+    from concurrent.futures import ThreadPoolExecutor
+    
+    src = tmp_path / "src.csv"
+    src.write_text(COVID_CSV * 2_000)
+    df = pd.DataFrame({"x": range(50_000)})
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        copies = [executor.submit(data_utils.materialize_file, src, tmp_path / "dest.csv", ("copy",))
+                  for _ in range(16)]
+        writes = [executor.submit(data_utils._write_parquet, df.copy(), tmp_path / "out.parquet")
+                  for _ in range(16)]
+        for future in copies + writes:
+            future.result()
+    
+    assert (tmp_path / "dest.csv").read_text() == src.read_text()
+    assert pd.read_parquet(tmp_path / "out.parquet").equals(df)
+    assert not list(tmp_path.glob(".*"))
+
+
+def test_sync_of_an_alias_waits_for_the_prefetched_archive(data_folder, fake_kaggle):
+    gate = threading.Event()
+    
+    def slow_download(kaggle_id, force_download=False):
+        gate.wait(5)
+        return fake_kaggle(kaggle_id, force_download)
+    
+    # "tsdata" and "us_covid" are the same Kaggle archive
+    job = data_utils.prefetch(["tsdata"], convert=False, downloader=slow_download)
+    threading.Timer(0.2, gate.set).start()
+    ensure_dataset("us_covid", downloader=fake_kaggle)
+    
+    assert job.wait(5)
+    assert fake_kaggle.calls == ["konradb/tsdata-1"]
+
+
+def test_parallel_prefetch_records_every_file(data_folder, fake_kaggle):
+    # One key per archive, so every archive syncs in its own thread
+    keys = list({info["kaggle_id"]: key for key, info in DATASETS.items()}.values())
+    job = data_utils.prefetch(keys, convert=False, max_workers=8, downloader=fake_kaggle)
+    assert job.wait(30)
+    assert not job.errors
+    
+    manifest = data_utils.Manifest(data_folder)
+    files = {name for key in keys for name in DATASETS[key]["files"]}
+    assert [name for name in sorted(files) if not manifest.is_fresh(name)] == []
+    assert not list(data_folder.glob("*.tmp"))
+
+
+@pytest.fixture
+def download_script():
+    import importlib.util
+    from pathlib import Path
+    
+    spec = importlib.util.spec_from_file_location(
+        "download_kaggle_dataset", Path(__file__).parent / "scripts" / "download_kaggle_dataset.py")
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    return script
+
+
+def test_resumable_download_fetches_only_missing_bytes(data_folder, tmp_path, download_script):
+    import base64
+    import hashlib
+    import io
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    script = download_script
+    payload = COVID_CSV.encode() * 1_000
+    served = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = int(self.headers.get("Range", "bytes=0-")[6:].rstrip("-"))
+            body = payload[start:]
+            served.append(len(body))
+            self.send_response(206 if start else 200)
+            self.send_header("Content-Length", str(len(body)))
+            md5 = base64.b64encode(hashlib.md5(payload).digest()).decode()
+            self.send_header("x-goog-hash", f"crc32c=AAAAAA==,md5={md5}")
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # An earlier run was interrupted halfway through the file
+        cache = tmp_path / "cache" / "konradb__tsdata-1"
+        cache.mkdir(parents=True)
+        (cache / "us_covid.csv.part").write_bytes(payload[:len(payload) // 2])
+        
+        downloader = script.ResumableDownloader(
+            script.registry_files(["us_covid"]), cache_dir=tmp_path / "cache", chunk_size=4096,
+            progress=script.Progress(stream=io.StringIO()),
+            base_url=f"http://127.0.0.1:{server.server_port}", auth=("user", "key"))
+        ensure_datasets(["us_covid"], downloader=downloader)
+        ensure_datasets(["us_covid"], force_download=True, downloader=downloader)
+    finally:
+        server.shutdown()
+    
+    assert served == [len(payload) - len(payload) // 2, len(payload)]
+    assert (data_folder / "us_covid.csv").read_bytes() == payload
+    assert not (cache / "us_covid.csv.part").exists()
+
+
+def test_resuming_a_completed_zipped_download_unpacks_it(tmp_path, download_script):
+    import hashlib
+    import io
+    import json
+    import zipfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("us_covid.csv", COVID_CSV)
+    zipped = buffer.getvalue()
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # The .part already holds every byte
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    downloader = download_script.ResumableDownloader(
+        {}, cache_dir=tmp_path, progress=download_script.Progress(stream=io.StringIO()),
+        base_url=f"http://127.0.0.1:{server.server_port}", auth=("user", "key"))
+    
+    def resume(folder, transfer):
+        folder.mkdir()
+        (folder / "us_covid.csv.part").write_bytes(zipped)
+        if transfer is not None:
+            (folder / "us_covid.csv.part.json").write_text(json.dumps(transfer))
+        return downloader.fetch("konradb/tsdata-1", "us_covid.csv", folder)
+    
+    try:
+        # Details saved by the interrupted run: checked, then unpacked
+        md5 = hashlib.md5(zipped).hexdigest()
+        saved = resume(tmp_path / "saved", {"size": len(zipped), "md5": md5, "zipped": True})
+        # No saved details: the zip magic still marks it for unpacking
+        sniffed = resume(tmp_path / "sniffed", None)
+        with pytest.raises(IOError, match="checksum"):
+            resume(tmp_path / "corrupt", {"size": len(zipped), "md5": "0" * 32, "zipped": True})
+    finally:
+        server.shutdown()
+    
+    for path in (saved, sniffed):
+        assert path.read_text() == COVID_CSV
+        assert sorted(p.name for p in path.parent.iterdir()) == ["us_covid.csv"]
+    assert not (tmp_path / "corrupt" / "us_covid.csv.part").exists()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled hall-of-fame equations.
+
+Run from data_science/:
+    python -m pytest test_hall_of_fame.py -q
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hall_of_fame import (CompiledEquations, compile_hall_of_fame, list_runs, parse_equation,
+                          residual_features)
+
+
+EQUATIONS = [
+    "77.36541",
+    "log(x1) + 73.006454",
+    "log(sqrt(x0) + x1) + 72.70638",
+    "sqrt(((x1 - x2) * sqrt(sqrt(x0 * 0.17187935))) + 5728.5503)",
+    "sqrt(log(x0) / x1) - -2.9938095",
+    "(1.1278876 / (43.207115 - sqrt(x0 / 1.0034558))) + 6.3988624",
+]
+
+
+def _reference(equation, X):
+    x0, x1, x2 = X.T
+    with np.errstate(all="ignore"):
+        return eval(equation, {"__builtins__": {}}, {"log": np.log, "sqrt": np.sqrt,
+                                                     "x0": x0, "x1": x1, "x2": x2})
+
+
+def test_compiled_program_matches_direct_evaluation():
+    X = np.random.default_rng(0).uniform(-50, 5000, size=(1000, 3))
+    program = CompiledEquations(EQUATIONS)
+    predictions = program(X)
+    
+    assert predictions.shape == (1000, len(EQUATIONS))
+    for j, equation in enumerate(EQUATIONS):
+        assert np.allclose(predictions[:, j], _reference(equation, X), equal_nan=True)
+    # Domain errors become NaN rather than raising
+    assert np.isnan(predictions[X[:, 1] < 0, 1]).all()
+
+
+def test_shared_subexpressions_and_constants_are_computed_once():
+    program = CompiledEquations(["sqrt(x0) + 1", "sqrt(x0) * (2 * 3)", "-(4.0) + x0"])
+    functions = [function.__name__ for _, function, _ in program.steps]
+    assert functions.count("sqrt") == 1
+    assert "multiply" in functions and program.n_variables == 1
+    assert np.allclose(program(np.array([4.0, 9.0])), [[3, 12, 0], [4, 18, 5]])
+
+
+@pytest.mark.parametrize("text, python", [
+    ("x0^2", "x0**2"),
+    ("x0^2 + 1.5", "x0**2 + 1.5"),
+    ("-x0^2", "-x0**2"),
+    ("x1^x0^0.5", "x1**(x0**0.5)"),
+])
+def test_caret_is_pysr_power(text, python):
+    assert parse_equation(text) == parse_equation(python)
+    X = np.array([[2.0, 3.0, 0.0]])
+    assert np.allclose(CompiledEquations([text])(X)[:, 0], _reference(python, X))
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('ls')",
+    "x0.real",
+    "open(x0)",
+    "sqrt(x0, x1)",
+    "x0 if x1 else x2",
+    "y + 1",
+    "log(",
+])
+def test_rejects_anything_outside_the_whitelist(text):
+    with pytest.raises(ValueError):
+        parse_equation(text)
+
+
+def test_residual_features_from_saved_runs():
+    runs = list_runs()
+    assert runs, "expected notebooks/outputs/<run>/hall_of_fame.csv.bak files"
+    hall_of_fame, program = compile_hall_of_fame(runs[0])
+    assert hall_of_fame.index.name == "Complexity"
+    
+    sensors = pd.DataFrame(np.random.default_rng(1).uniform(1, 100, size=(50, 4)),
+                           columns=["engine_rpm", "oil_pressure", "fuel_pressure", "oil_temp"])
+    inputs = ["engine_rpm", "oil_pressure", "fuel_pressure"][:program.n_variables]
+    residuals = residual_features(sensors, "oil_temp", inputs, hall_of_fame)
+    
+    assert list(residuals.columns) == [f"residual_c{c}" for c in hall_of_fame.index]
+    expected = sensors["oil_temp"].to_numpy()[:, None] - program(sensors[inputs])
+    assert np.allclose(residuals.to_numpy(), expected, equal_nan=True)
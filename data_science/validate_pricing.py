@@ -7,28 +7,14 @@ Validates pricing accuracy against real registrar data
 import json
 from datetime import datetime
 
-# Current pricing data from research (November 2024-2025)
-REGISTRAR_PRICING = {
-    'onlydomains': {
-        '.ai': 77.99,  # 2-year registration required ($155.98/2 years)
-        '.com': 12.99,
-        'note': 'OnlyDomains offers competitive .ai pricing'
-    },
-    'namehero': {
-        '.ai': 160.00,  # Per 2-year registration (~$80/year)
-        '.com': 12.99,
-        'note': 'NameHero typical pricing'
-    },
-    'typical_registrar': {
-        '.ai': 89.99,  # Average across registrars for 1-year
-        '.com': 12.99,
-        'note': 'Industry average for standard registrars'
-    },
-    'premium_range': {
-        '.ai': {'min': 77.99, 'max': 100.00},
-        '.com': {'min': 9.99, 'max': 15.99},
-        'note': 'Typical range across major registrars'
-    }
+from domain_pricing import REGISTRAR_PRICING, PricingEngine
+
+# Typical retail range across major registrars. Not a registrar the engine
+# can price at, so it is kept here rather than in the registrar tables.
+PREMIUM_RANGE = {
+    '.ai': {'min': 77.99, 'max': 100.00},
+    '.com': {'min': 9.99, 'max': 15.99},
+    'note': 'Typical range across major registrars'
 }
 
 # Key findings from research
@@ -76,9 +62,10 @@ def validate_script_pricing():
     # Check script pricing
     print("## SCRIPT PRICING CONFIGURATION")
     print("-" * 80)
+    script_engine = PricingEngine(registrars=['typical_registrar'])
     script_pricing = {
-        'com': 12.99,
-        'ai': 89.99
+        'com': script_engine.price('example.com')[0],
+        'ai': script_engine.price('example.ai')[0]
     }
     
     print(f".com domains: ${script_pricing['com']:.2f}/year")
@@ -132,14 +119,19 @@ def validate_script_pricing():
     print(f"{'Registrar':<25} {'.ai Price':<15} {'.com Price':<15} {'Total':<15}")
     print("-" * 80)
     
-    for registrar, prices in REGISTRAR_PRICING.items():
-        if registrar == 'premium_range':
-            continue
-        ai_price = prices.get('.ai', 0)
-        com_price = prices.get('.com', 0)
+    # Annual prices, so 2-year minimum terms compare like-for-like
+    annual = PricingEngine().registrar_table().fillna(0)
+    for registrar in annual.columns:
+        ai_price = annual.loc['ai', registrar]
+        com_price = annual.loc['com', registrar]
         total = ai_price + com_price
         print(f"{registrar:<25} ${ai_price:<14.2f} ${com_price:<14.2f} ${total:<14.2f}")
     
+    ai_range, com_range = PREMIUM_RANGE['.ai'], PREMIUM_RANGE['.com']
+    print(f"{'premium_range':<25} ${ai_range['min']:.2f}-{ai_range['max']:<8.2f} "
+          f"${com_range['min']:.2f}-{com_range['max']:<8.2f}")
+    
+    total = script_pricing['ai'] + script_pricing['com']
     print(f"{'SCRIPT ESTIMATE':<25} ${script_pricing['ai']:<14.2f} ${script_pricing['com']:<14.2f} ${total:<14.2f}")
     print()
     
@@ -201,7 +193,7 @@ def validate_script_pricing():
             },
             'overall_accurate': overall_valid
         },
-        'registrar_pricing': REGISTRAR_PRICING,
+        'registrar_pricing': {**REGISTRAR_PRICING, 'premium_range': PREMIUM_RANGE},
         'pricing_facts': PRICING_FACTS
     }
     
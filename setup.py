@@ -13,5 +13,6 @@ setup(
     python_requires=">=3.11",
     install_requires=[
         "matplotlib",
+        "numpy",
     ],
 )
@@ -0,0 +1,218 @@
+"""
+Batch figure export with caching.
+
+Report figures are described as `FigureSpec`s and rendered together
+across a process pool on the Agg backend. Each output is keyed by a hash
+of its data, the source of the module defining its plot function (so
+helpers next to it count too) and of `plot_helpers`, its style preset,
+arguments and an optional `version` salt, so re-running a notebook only
+redraws figures whose inputs changed.
+
+Plot functions must be importable (defined in a module, not a notebook
+cell) so worker processes can load them.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from .plot_styles import STYLE_PRESETS
+
+
+# Shared output folder for report figures
+DEFAULT_REPORTS_DIR = Path(__file__).resolve().parent.parent / "data_science" / "reports"
+
+# Per-folder record of the hash each figure was rendered from
+INDEX_NAME = ".figures.json"
+
+# Downsampling helpers shared by plot functions; part of every figure's hash
+_HELPERS_SOURCE = (Path(__file__).resolve().parent / "plot_helpers.py").read_text()
+
+
+class FigureSpec(NamedTuple):
+    """
+    One report figure.
+    
+    `plot(ax, data, **kwargs)` draws onto a fresh Axes; `data` is either a
+    file path (CSV/Parquet/NPY, loaded in the worker) or an in-memory
+    object such as a DataFrame, array or Arrow table. Bump `version` to
+    force a redraw after changing code the hash cannot see (e.g. a helper
+    imported from another module).
+    """
+    name: str
+    plot: Callable
+    data: Any
+    preset: str = "clean"
+    kwargs: Optional[dict] = None
+    formats: Tuple[str, ...] = ("png",)
+    figsize: Optional[Tuple[float, float]] = None
+    version: str = ""
+
+
+def _file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _data_digest(data):
+    """Content hash of a data reference (file contents or in-memory object)."""
+    if isinstance(data, (str, Path)):
+        return _file_digest(data)
+    
+    digest = hashlib.blake2b(digest_size=16)
+    module = type(data).__module__.split(".")[0]
+    if module == "pandas":
+        import pandas as pd
+        
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        digest.update(repr(getattr(data, "columns", getattr(data, "name", None))).encode())
+    elif module == "numpy":
+        digest.update(str((data.dtype, data.shape)).encode())
+        digest.update(data.tobytes())
+    elif module == "pyarrow":
+        # Hash the (possibly memory-mapped) buffers without copying them out;
+        # table columns are chunked, record batch columns are plain arrays
+        digest.update(str(data.schema).encode())
+        for column in data.columns:
+            for chunk in getattr(column, "chunks", [column]):
+                digest.update(str((chunk.offset, len(chunk))).encode())
+                for buffer in chunk.buffers():
+                    if buffer is not None:
+                        digest.update(buffer)
+    else:
+        digest.update(pickle.dumps(data))
+    return digest.hexdigest()
+
+
+def spec_hash(spec):
+    """Hash of everything that determines a figure's pixels."""
+    if spec.preset not in STYLE_PRESETS:
+        raise ValueError(f"Unknown preset '{spec.preset}'. Available: {list(STYLE_PRESETS.keys())}")
+    
+    # The whole defining module, so edits to helpers beside the plot function count
+    code = inspect.getsource(inspect.getmodule(spec.plot))
+    key = json.dumps({
+        "data": _data_digest(spec.data),
+        "code": code,
+        "helpers": _HELPERS_SOURCE,
+        "plot": f"{spec.plot.__module__}.{spec.plot.__qualname__}",
+        "style": STYLE_PRESETS[spec.preset],
+        "kwargs": spec.kwargs or {},
+        "figsize": spec.figsize,
+        "version": spec.version,
+    }, sort_keys=True, default=repr)
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _load_data(data):
+    """Load a file data reference in the worker; objects pass through."""
+    if not isinstance(data, (str, Path)):
+        return data
+    
+    path = Path(data)
+    if path.suffix == ".npy":
+        import numpy as np
+        return np.load(path)
+    
+    import pandas as pd
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _render(spec, out_dir):
+    """Draw one figure with the Agg canvas and save every format; returns paths."""
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    with matplotlib.rc_context(STYLE_PRESETS[spec.preset]):
+        fig = Figure(figsize=spec.figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        spec.plot(ax, _load_data(spec.data), **(spec.kwargs or {}))
+        
+        paths = []
+        for fmt in spec.formats:
+            path = Path(out_dir) / f"{spec.name}.{fmt}"
+            tmp = path.with_name(f".{path.name}.tmp.{fmt}")
+            fig.savefig(tmp, bbox_inches="tight")
+            os.replace(tmp, path)
+            paths.append(str(path))
+    return paths
+
+
+def render_figures(specs, out_dir=None, workers=None, force=False):
+    """
+    Render report figures in parallel, skipping ones whose inputs are unchanged.
+    
+    Args:
+        specs (list): FigureSpec entries (names must be unique)
+        out_dir (Path): Output folder (default: data_science/reports)
+        workers (int): Worker processes (default: CPU count); 1 renders
+            in this process, still on the Agg canvas
+        force (bool): Re-render even if cached
+    
+    Returns:
+        dict: Figure name -> "cached" or "rendered"
+    
+    Usage:
+        from data_utils import load_table
+        from utils.figure_pipeline import FigureSpec, render_figures
+        from my_plots import plot_load, plot_seasonality
+        
+        pjme = load_table("pjm_energy", "PJME_hourly.csv")
+        render_figures([
+            FigureSpec("pjme_load", plot_load, pjme, preset="fast"),
+            FigureSpec("seasonality", plot_seasonality, daily_df, formats=("png", "pdf")),
+        ])
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Figure names must be unique: {names}")
+    
+    out_dir = Path(out_dir or DEFAULT_REPORTS_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / INDEX_NAME
+    try:
+        index = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        index = {}
+    
+    status, pending = {}, {}
+    for spec in specs:
+        digest = spec_hash(spec)
+        outputs_exist = all((out_dir / f"{spec.name}.{fmt}").exists() for fmt in spec.formats)
+        if not force and index.get(spec.name) == digest and outputs_exist:
+            status[spec.name] = "cached"
+        else:
+            pending[spec.name] = (spec, digest)
+    
+    def record(name):
+        index[name] = pending[name][1]
+        status[name] = "rendered"
+        tmp = index_path.with_name(f"{index_path.name}.tmp")
+        tmp.write_text(json.dumps(index, indent=2, sort_keys=True))
+        os.replace(tmp, index_path)
+    
+    if workers == 1 or len(pending) <= 1:
+        for name, (spec, _) in pending.items():
+            _render(spec, out_dir)
+            record(name)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_render, spec, out_dir): name
+                       for name, (spec, _) in pending.items()}
+            for future in as_completed(futures):
+                future.result()
+                record(futures[future])
+    
+    return {name: status[name] for name in names}
@@ -0,0 +1,157 @@
+"""
+Downsampling helpers for plotting long time series quickly.
+
+Drawing every point of a long series (e.g. ~145k hourly PJM readings per
+region) is slow to render and save, and a screen can't show more than a
+few thousand points across anyway. These helpers pick a small, visually
+faithful subset first:
+
+- `lttb_indices`: Largest-Triangle-Three-Buckets, keeps the shape of the line
+- `minmax_indices`: min and max per bucket, keeps every spike and dip
+
+Combine with `apply_style('fast')` for the renderer-side settings.
+"""
+
+import numpy as np
+
+
+def _as_float(x):
+    """x as float64 for geometry; datetimes become nanoseconds."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+    
+    The first and last points are kept; the rest are split into
+    `n_out - 2` buckets and each keeps the point forming the largest
+    triangle with the previously kept point and the next bucket's mean.
+    Bucket means and bounds are computed in one vectorized pass; the
+    per-bucket pick depends on the previous pick, so it walks the buckets
+    with an argmax over each bucket's slice.
+    
+    Args:
+        x (array-like): Sorted x values (numeric or datetime64)
+        y (array-like): y values
+        n_out (int): Number of points to keep (>= 3)
+    
+    Returns:
+        np.ndarray: Sorted indices into x/y
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # The bucket after the last one is the final point itself
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+    
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay, cx, cy = x[a], y[a], next_x[i], next_y[i]
+        # Twice the triangle area (A, B, C) for every candidate B in the bucket
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Indices of the minimum and maximum of each bucket, in order.
+    
+    Keeps every local extreme at bucket resolution, so spikes and
+    outages survive downsampling. Fully vectorized: y is padded into a
+    (buckets × width) array and reduced row-wise. NaNs are ignored.
+    
+    Args:
+        y (array-like): y values
+        n_out (int): Approximate number of points to keep
+    
+    Returns:
+        np.ndarray: Sorted, unique indices into y
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    
+    width = -(-n // (n_out // 2))
+    buckets = -(-n // width)
+    padded = np.full(buckets * width, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(buckets, width)
+    
+    low = np.where(np.isnan(rows), np.inf, rows).argmin(axis=1)
+    high = np.where(np.isnan(rows), -np.inf, rows).argmax(axis=1)
+    offsets = np.arange(buckets) * width
+    picks = np.sort(np.stack([low, high], axis=1), axis=1) + offsets[:, None]
+    return np.unique(picks[picks < n])
+
+
+def downsample(x, y, n_out=2000, method="lttb"):
+    """
+    Downsample a series for plotting.
+    
+    Args:
+        x (array-like): Sorted x values (numeric, datetime64 or a pandas index)
+        y (array-like): y values
+        n_out (int): Target number of points
+        method (str): 'lttb' (shape) or 'minmax' (extremes)
+    
+    Returns:
+        tuple: (x, y) arrays of the kept points
+    
+    Usage:
+        from utils.plot_helpers import downsample
+        xs, ys = downsample(df.index, df['PJME_MW'], n_out=3000)
+        plt.plot(xs, ys)
+    """
+    if method == "lttb":
+        index = lttb_indices(x, y, n_out)
+    elif method == "minmax":
+        index = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Unknown method '{method}'. Available: ['lttb', 'minmax']")
+    return np.asarray(x)[index], np.asarray(y)[index]
+
+
+def plot_series(ax, x, y, n_out=2000, method="lttb", rasterized=True, **kwargs):
+    """
+    Plot a long series on `ax` after downsampling it.
+    
+    Args:
+        ax: matplotlib Axes
+        x, y: Series data (see `downsample`)
+        n_out (int): Points to draw; shorter series are drawn as is
+        method (str): 'lttb' or 'minmax'
+        rasterized (bool): Rasterize the line in vector outputs (PDF/SVG)
+            so files stay small and fast to open
+        **kwargs: Passed to `ax.plot`
+    
+    Returns:
+        list: The Line2D artists from `ax.plot`
+    
+    Usage:
+        from utils.plot_styles import apply_style
+        from utils.plot_helpers import plot_series
+        apply_style('fast')
+        fig, ax = plt.subplots()
+        plot_series(ax, df.index, df['PJME_MW'], label='PJME')
+    """
+    xs, ys = downsample(x, y, n_out=n_out, method=method)
+    return ax.plot(xs, ys, rasterized=rasterized, **kwargs)
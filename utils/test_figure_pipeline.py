@@ -0,0 +1,88 @@
+"""
+Tests for cached batch figure export.
+
+Run from the repo root:
+    python -m pytest utils -q
+"""
+
+import importlib
+
+import numpy as np
+import pytest
+
+from utils.figure_pipeline import FigureSpec, render_figures, spec_hash
+
+
+def plot_line(ax, data, color="C0"):
+    ax.plot(data, color=color)
+
+
+@pytest.fixture
+def specs():
+    return [
+        FigureSpec("line", plot_line, np.arange(10.0)),
+        FigureSpec("squares", plot_line, np.arange(10.0) ** 2, preset="fast", formats=("png", "svg")),
+    ]
+
+
+def test_render_then_cached(tmp_path, specs):
+    # Two pending figures go through the process pool
+    assert render_figures(specs, out_dir=tmp_path, workers=2) == {"line": "rendered", "squares": "rendered"}
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith(".")) == \
+        ["line.png", "squares.png", "squares.svg"]
+    
+    assert render_figures(specs, out_dir=tmp_path, workers=1) == {"line": "cached", "squares": "cached"}
+    assert render_figures(specs, out_dir=tmp_path, workers=1, force=True) == \
+        {"line": "rendered", "squares": "rendered"}
+
+
+def test_only_the_edited_spec_rerenders(tmp_path, specs):
+    render_figures(specs, out_dir=tmp_path, workers=1)
+    
+    edited = [specs[0], specs[1]._replace(kwargs={"color": "C3"})]
+    assert render_figures(edited, out_dir=tmp_path, workers=1) == {"line": "cached", "squares": "rendered"}
+    
+    # A deleted output is redrawn even though the hash is unchanged
+    (tmp_path / "line.png").unlink()
+    assert render_figures(edited, out_dir=tmp_path, workers=1) == {"line": "rendered", "squares": "cached"}
+
+
+def test_hash_covers_data_version_and_helper_source(tmp_path, monkeypatch, specs):
+    spec = specs[0]
+    assert spec_hash(spec) == spec_hash(spec._replace(data=np.arange(10.0)))
+    assert spec_hash(spec) != spec_hash(spec._replace(data=np.arange(11.0)))
+    assert spec_hash(spec) != spec_hash(spec._replace(version="2"))
+    assert spec_hash(spec) != spec_hash(spec._replace(preset="fast"))
+    
+    # Editing a helper beside the plot function changes the hash too
+    module = tmp_path / "report_plots.py"
+    module.write_text("def color():\n    return 'C0'\n\n\n"
+                      "def plot(ax, data):\n    ax.plot(data, color=color())\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    plots = importlib.import_module("report_plots")
+    before = spec_hash(spec._replace(plot=plots.plot))
+    
+    module.write_text(module.read_text().replace("'C0'", "'C1'"))
+    plots = importlib.reload(plots)
+    assert spec_hash(spec._replace(plot=plots.plot)) != before
+
+
+def test_arrow_tables_are_hashed_by_content():
+    pa = pytest.importorskip("pyarrow")
+    
+    table = pa.table({"x": np.arange(1000.0)})
+    same = pa.table({"x": np.arange(1000.0)})
+    spec = FigureSpec("arrow", plot_line, table)
+    assert spec_hash(spec) == spec_hash(spec._replace(data=same))
+    assert spec_hash(spec) != spec_hash(spec._replace(data=table.slice(1)))
+    
+    batch = pa.record_batch({"x": np.arange(1000.0)})
+    assert spec_hash(spec._replace(data=batch)) == spec_hash(spec)
+    assert spec_hash(spec._replace(data=batch)) != spec_hash(spec._replace(data=batch.slice(1)))
+
+
+def test_duplicate_names_and_unknown_presets_are_rejected(tmp_path, specs):
+    with pytest.raises(ValueError):
+        render_figures([specs[0], specs[0]], out_dir=tmp_path)
+    with pytest.raises(ValueError):
+        render_figures([specs[0]._replace(preset="neon")], out_dir=tmp_path)
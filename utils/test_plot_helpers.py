@@ -0,0 +1,61 @@
+"""
+Tests for the plotting downsamplers.
+
+Run from the repo root:
+    python -m pytest utils -q
+"""
+
+import numpy as np
+import pytest
+
+from utils.plot_helpers import downsample, lttb_indices, minmax_indices
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000)
+    y = np.sin(x / 300) + rng.normal(0, 0.05, len(x))
+    y[1234], y[8765] = 5.0, -5.0   # a spike and an outage
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_exact_length(series):
+    x, y = series
+    for n_out in (3, 100, 2000):
+        idx = lttb_indices(x, y, n_out)
+        assert len(idx) == n_out
+        assert idx[0] == 0 and idx[-1] == len(y) - 1
+        assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_accepts_datetimes(series):
+    _, y = series
+    times = np.datetime64("2015-01-01T00") + np.arange(len(y)).astype("timedelta64[h]")
+    assert np.array_equal(lttb_indices(times, y, 500), lttb_indices(np.arange(len(y)), y, 500))
+
+
+def test_short_series_are_returned_whole(series):
+    x, y = series
+    assert np.array_equal(lttb_indices(x[:50], y[:50], 100), np.arange(50))
+    assert np.array_equal(minmax_indices(y[:50], 100), np.arange(50))
+
+
+def test_minmax_keeps_extrema_within_length(series):
+    _, y = series
+    y = y.copy()
+    y[4000] = np.nan
+    for n_out in (10, 200, 2000):
+        idx = minmax_indices(y, n_out)
+        assert len(idx) <= n_out
+        assert np.all(np.diff(idx) > 0)
+        assert {1234, 8765} <= set(idx.tolist())
+        assert 4000 not in idx
+
+
+def test_downsample_returns_matching_values(series):
+    x, y = series
+    xs, ys = downsample(x, y, n_out=500, method="minmax")
+    assert np.array_equal(ys, y[xs])
+    with pytest.raises(ValueError):
+        downsample(x, y, method="median")